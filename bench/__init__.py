@@ -0,0 +1 @@
+"""성능 측정용 스크립트 모음 (앱 실행에는 필요 없음)"""
@@ -0,0 +1,64 @@
+"""세트 조합 탐색 벤치마크: 메뉴 수가 늘어날 때 core.combo 지연 시간 측정
+
+    python -m bench.bench_combo
+    python -m bench.bench_combo --sizes 70 700 7000 --repeat 20
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from bench.synthetic import grow_catalog
+from core.combo import COMBO_SLOTS, ComboOptimizer
+from core.scoring import ScoringEngine
+
+WEIGHTS = {"칼로리": 0.3, "단백질": 0.4, "지방": 0.3, "나트륨": 0.2}
+CASES = [
+    ("제한 없음",            0,     {}),
+    ("예산 15000",           15000, {}),
+    ("예산 12000 + 1200kcal", 12000, {"칼로리(Kcal)": 1200}),
+    ("1000kcal + 나트륨 1500", 0,    {"칼로리(Kcal)": 1000, "나트륨": 1500}),
+]
+
+
+def brute_force(catalog, scores, budget, caps, n):
+    """검증용 전체 곱집합 탐색 (작은 카탈로그에서만)"""
+    best = []
+    for combo in itertools.product(*[catalog.category_rows[c] for _, c in COMBO_SLOTS]):
+        rows = list(combo)
+        if budget and catalog.price[rows].sum() > budget:
+            continue
+        if any(catalog.values(c)[rows].sum() > v for c, v in caps.items()):
+            continue
+        best.append(scores[rows].sum())
+    return sorted(best, reverse=True)[:n]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[70, 350, 1400, 7000, 28000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'메뉴 수':>8} {'곱집합 크기':>16} {'조건':<24} {'p50(ms)':>9} {'max(ms)':>9}  검증")
+    for size in args.sizes:
+        catalog = grow_catalog(size)
+        scores  = ScoringEngine(catalog).score(WEIGHTS)
+        opt     = ComboOptimizer(catalog)
+        space   = int(np.prod([len(catalog.category_rows[c]) for _, c in COMBO_SLOTS]))
+        for label, budget, caps in CASES:
+            times = []
+            for _ in range(args.repeat):
+                t = time.perf_counter()
+                combos = opt.top_combos(WEIGHTS, budget, caps, args.top, scores=scores)
+                times.append((time.perf_counter() - t) * 1e3)
+            check = "-"
+            if space <= 200_000:
+                check = "OK" if np.allclose([c.score for c in combos], brute_force(catalog, scores, budget, caps, args.top)) else "MISMATCH"
+            print(f"{size:>8} {space:>16,} {label:<24} {np.median(times):>9.2f} {max(times):>9.2f}  {check}")
+
+
+if __name__ == "__main__":
+    main()
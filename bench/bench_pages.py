@@ -0,0 +1,256 @@
+"""페이지별 헤드리스 벤치마크: Streamlit AppTest로 main.py를 사용자 흐름대로 실행하고
+rerun 지연 시간(p50/p95), 메모리 할당량, 최대 메모리를 흐름별로 측정
+
+외부 서비스는 모두 로컬 가짜로 바꿈 (지연 시간 조절 가능)
+- Google Sheets : bench.fakes.FakeWorksheet (pages.visual.get_gsheet 대체)
+- Nutritionix / ORS : bench.fakes.external_apis_server 스텁 서버
+
+    python -m bench.bench_pages                                   # 전체 흐름 5회씩
+    python -m bench.bench_pages visual_vote mbti_quiz --repeat 10 --latency 0.2
+    python -m bench.bench_pages --save bench_pages.json           # 결과 저장 (배포 전 기준값)
+    python -m bench.bench_pages --compare bench_pages.json        # 기준값보다 p95가 20% 넘게 느려지면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+from bench.fakes import FakeWorksheet, external_apis_server
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+SEOUL_CITY_HALL = {"latitude": 37.5663, "longitude": 126.9779}
+
+
+class FlowRun:
+    """AppTest 한 세션: rerun마다 걸린 시간(ms)을 기록"""
+
+    def __init__(self, timeout: float):
+        self.at = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+        self.rerun_ms = []
+
+    def run(self, widget=None):
+        """widget(예: at.button(key=...).click())이 있으면 그 상호작용으로 rerun"""
+        start = time.perf_counter()
+        (widget or self.at).run()
+        self.rerun_ms.append((time.perf_counter() - start) * 1000)
+        if self.at.exception:
+            raise RuntimeError(f"앱 예외: {self.at.exception[0].message}")
+        return self.at
+
+    def button(self, label: str):
+        return next(b for b in self.at.button if b.label == label)
+
+
+# ✅ 사용자 흐름 (홈에서 시작)
+def flow_home(f: FlowRun):
+    f.run()
+
+
+def flow_visual_vote(f: FlowRun):
+    at = f.run()
+    f.run(at.button(key="go_visual").click())
+    f.run(at.selectbox(key="menu2").select_index(2))
+    f.run(at.selectbox(key="vote_select").select_index(1))
+    f.run(f.button("✅ 이 메뉴에 투표하기").click())
+    f.run(f.button("🔁 수동 새로고침").click())
+    categories = at.selectbox[0].options
+    f.run(at.selectbox[0].select(categories[-1]))
+
+
+def flow_mbti_quiz(f: FlowRun):
+    at = f.run()
+    f.run(at.button(key="go_mbti").click())
+    f.run(f.button("🔥 테스트 시작하기").click())
+    for radio in at.radio:
+        if radio.key and radio.key.startswith("q_"):
+            radio.set_value(random.randint(0, 1))
+    f.run(f.button("🍔 결과 보기").click())
+    f.run(at.button(key="retry_button").click())
+
+
+def flow_specialty(f: FlowRun):
+    at = f.run()
+    f.run(at.button(key="go_specialty").click())
+    for label, value in (("단백질 중요도", 0.8), ("나트륨 중요도", 0.6), ("칼로리 중요도", 0.1)):
+        f.run(next(s for s in at.slider if s.label == label).set_value(value))
+    cal = next(s for s in at.slider if s.label == "칼로리 (kcal)")
+    f.run(cal.set_value((cal.min, (cal.min + cal.max) // 2)))
+    f.run(f.button("메뉴 추천 받기").click())
+    f.run(f.button("🍱 조합 추천 받기").click())
+
+
+def flow_map(f: FlowRun):
+    at = f.run()
+    f.run(at.button(key="go_map").click())
+    at.number_input[0].set_value(31)
+    at.number_input[1].set_value(64)
+    f.run(f.button("✅ 신체정보 입력 완료").click())
+    at.session_state.location = SEOUL_CITY_HALL  # 브라우저 위치 컴포넌트 대신
+    f.run(at.selectbox[0].select_index(1))
+    f.run(at.selectbox[1].select_index(1))
+    direction = next(r for r in at.radio if r.label.startswith("📌"))
+    for option in direction.options[1:]:
+        f.run(direction.set_value(option))
+    f.run(at.selectbox[4].select_index(3))
+    if at.toggle:
+        f.run(at.toggle[0].set_value(True))
+
+
+FLOWS = {
+    "home":        flow_home,
+    "visual_vote": flow_visual_vote,
+    "mbti_quiz":   flow_mbti_quiz,
+    "specialty":   flow_specialty,
+    "map":         flow_map,
+}
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def clear_caches():
+    import streamlit as st
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def bench_flow(name: str, repeat: int, timeout: float, cold: bool) -> dict:
+    """흐름을 repeat번 (매번 새 세션) 실행. 메모리는 tracemalloc 기준"""
+    rerun_ms, flow_ms, alloc_mb, peak_mb = [], [], [], []
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        f = FlowRun(timeout)
+        tracemalloc.start()
+        start = time.perf_counter()
+        FLOWS[name](f)
+        flow_ms.append((time.perf_counter() - start) * 1000)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rerun_ms.extend(f.rerun_ms)
+        alloc_mb.append(current / 2**20)
+        peak_mb.append(peak / 2**20)
+    return {
+        "reruns":     len(rerun_ms),
+        "p50_ms":     round(percentile(rerun_ms, 0.50), 1),
+        "p95_ms":     round(percentile(rerun_ms, 0.95), 1),
+        "max_ms":     round(max(rerun_ms), 1),
+        "flow_ms":    round(statistics.median(flow_ms), 1),
+        "retained_mb": round(statistics.median(alloc_mb), 2),
+        "peak_mb":    round(max(peak_mb), 2),
+    }
+
+
+def seed_votes(n: int, seed: int = 0) -> list:
+    """카탈로그에서 무작위로 뽑은 투표 행 n개"""
+    from core.catalog import get_catalog
+    catalog = get_catalog()
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        category = rng.choice(catalog.category_names)
+        rows.append([category, rng.choice(catalog.menus(category)), "2025-01-01T12:00:00"])
+    return rows
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> list:
+    """기준값 대비 p95가 tolerance 비율 넘게 늘어난 흐름"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["flows"]
+    slower = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base and r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            slower.append((name, base["p95_ms"], r["p95_ms"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별 헤드리스 벤치마크 (AppTest + 가짜 외부 서비스)")
+    parser.add_argument("flows", nargs="*", help=f"실행할 흐름 (기본: 전체) {list(FLOWS)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 외부 서비스 응답 지연(초)")
+    parser.add_argument("--seed-votes", type=int, default=500, help="가짜 시트에 미리 넣어 둘 투표 수")
+    parser.add_argument("--vote-backend", choices=["gsheet", "sqlite"], default="gsheet")
+    parser.add_argument("--cold", action="store_true", help="반복마다 st.cache_resource / cache_data 비우기")
+    parser.add_argument("--timeout", type=float, default=60.0, help="rerun 하나의 제한 시간(초)")
+    parser.add_argument("--save", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="기준 결과 JSON (p95 회귀 검사)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 p95 증가 비율")
+    args = parser.parse_args()
+    unknown = [name for name in args.flows if name not in FLOWS]
+    if unknown:
+        parser.error(f"알 수 없는 흐름: {unknown} (가능: {list(FLOWS)})")
+    flows = args.flows or list(FLOWS)
+
+    # 페이지 모듈이 import될 때 읽는 설정 → 스텁 주소, 가짜 키, 임시 저장소
+    stub = external_apis_server(latency=args.latency).start()
+    tmpdir = tempfile.mkdtemp(prefix="bench_pages_")
+    os.environ.update({
+        "NUTRITIONIX_BASE_URL": stub.url, "NUTRITIONIX_APP_ID": "bench", "NUTRITIONIX_APP_KEY": "bench",
+        "ORS_BASE_URL": stub.url, "ORS_API_KEY": "bench",
+        "BURN_RATE_CACHE_PATH": "",
+        "VOTE_BACKEND": args.vote_backend, "VOTE_DB_PATH": os.path.join(tmpdir, "votes.db"),
+        # 쓰기 버퍼 저널도 임시 폴더로 (중간에 끊겨도 가짜 투표가 data/ 저널에 남아 실제 시트로 재전송되지 않게)
+        "VOTE_JOURNAL_PATH": os.path.join(tmpdir, "vote_journal.jsonl"),
+        "VOTE_SYNC_JOURNAL_PATH": os.path.join(tmpdir, "vote_sync_journal.jsonl"),
+    })
+    os.environ.pop("LOCAL_ROAD_GRAPH", None)
+
+    sheet = FakeWorksheet(seed_votes(args.seed_votes), latency=args.latency)
+    from core.startup import load_page
+    visual = load_page("visual")
+    visual.get_gsheet = lambda: sheet
+    if args.vote_backend == "sqlite":
+        from core.vote_store import SQLiteVoteStore
+        SQLiteVoteStore(os.environ["VOTE_DB_PATH"]).append(sheet.rows[1:])
+
+    print(f"{'흐름':<12} {'rerun':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'흐름(ms)':>10} "
+          f"{'잔여(MB)':>9} {'최대(MB)':>9}  외부 호출")
+    results = {}
+    try:
+        for name in flows:
+            before_api, before_sheet = dict(stub.requests), dict(sheet.requests)
+            r = bench_flow(name, args.repeat, args.timeout, args.cold)
+            calls = {k: v - before_api.get(k, 0) for k, v in stub.requests.items() if v - before_api.get(k, 0)}
+            calls.update({f"sheets.{k}": v - before_sheet.get(k, 0)
+                          for k, v in sheet.requests.items() if v - before_sheet.get(k, 0)})
+            r["external_calls"] = calls
+            results[name] = r
+            print(f"{name:<12} {r['reruns']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['max_ms']:>9.1f} "
+                  f"{r['flow_ms']:>10.1f} {r['retained_mb']:>9.2f} {r['peak_mb']:>9.2f}  "
+                  f"{sum(calls.values())}")
+    finally:
+        stub.stop()
+
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\n프로세스 최대 RSS: {max_rss_mb:.0f}MB · 외부 지연 {args.latency * 1000:.0f}ms · "
+          f"반복 {args.repeat}회{' (매번 캐시 비움)' if args.cold else ''}")
+
+    report = {"flows": results, "max_rss_mb": round(max_rss_mb, 1),
+              "config": {k: getattr(args, k) for k in ("repeat", "latency", "seed_votes", "vote_backend", "cold")}}
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 저장: {args.save}")
+    if args.compare:
+        slower = compare(results, args.compare, args.tolerance)
+        for name, base, now in slower:
+            print(f"❌ {name}: p95 {base:.1f}ms → {now:.1f}ms")
+        if slower:
+            sys.exit(1)
+        print(f"✅ 기준값 대비 p95 증가가 모두 {args.tolerance:.0%} 이내")
+
+
+if __name__ == "__main__":
+    main()
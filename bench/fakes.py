@@ -0,0 +1,226 @@
+"""외부 API 대신 쓰는 로컬 스텁 서버 + 가짜 Google Sheets 워크시트 (오프라인 테스트 / 벤치마크용)
+
+    python -m bench.fakes                       # Nutritionix + ORS 스텁을 127.0.0.1:8765에 띄움
+    python -m bench.fakes --latency 0.3         # 응답마다 300ms 지연
+    python -m bench.fakes --sheets              # 가짜 시트(/sheets/*)도 함께 (bench/load_app.py가 사용)
+    NUTRITIONIX_BASE_URL=http://127.0.0.1:8765 ORS_BASE_URL=http://127.0.0.1:8765 streamlit run main.py
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 운동별 MET (스텁 응답을 그럴듯하게 만들기 위한 값)
+STUB_METS = {"walking": 3.5, "brisk walking": 4.3, "hiking": 6.0, "jogging": 7.0,
+             "running": 9.8, "cycling": 7.5, "swimming": 6.0}
+
+
+class StubServer:
+    """경로 → 처리 함수(payload dict → (상태 코드, 응답 dict))를 등록해서 띄우는 HTTP 서버
+
+    latency: 응답마다 더할 지연(초), requests: 경로별 받은 요청 수
+    """
+
+    def __init__(self, routes: dict, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.routes   = routes
+        self.latency  = latency
+        self.requests = {}
+        self._lock    = threading.Lock()
+        self._server  = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread  = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self):
+                path = self.path.split("?")[0]
+                with stub._lock:
+                    stub.requests[path] = stub.requests.get(path, 0) + 1
+                length  = int(self.headers.get("Content-Length") or 0)
+                body    = self.rfile.read(length) if length else b""
+                try:
+                    payload = json.loads(body) if body else {}
+                except json.JSONDecodeError:
+                    payload = {}
+                handler = stub.routes.get(path)
+                status, data = handler(payload, self.headers) if handler else (404, {"error": "not found"})
+                if stub.latency:
+                    time.sleep(stub.latency)
+                out = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+            do_GET = do_POST = _dispatch
+
+            def log_message(self, *args):  # 요청마다 stderr에 찍지 않음
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def nutritionix_exercise(payload: dict, headers) -> tuple:
+    """/v2/natural/exercise 흉내: "<운동> <분> minutes" → MET × 체중 기준 칼로리"""
+    if not headers.get("x-app-id") or not headers.get("x-app-key"):
+        return 401, {"message": "unauthorized"}
+    m = re.match(r"\s*([a-z ]+?)\s+(\d+)\s*minutes", payload.get("query", ""))
+    if not m or m.group(1) not in STUB_METS:
+        return 200, {"exercises": []}
+    activity, minutes = m.group(1), int(m.group(2))
+    met    = STUB_METS[activity]
+    weight = float(payload.get("weight_kg") or 70)
+    kcal   = round(met * weight * minutes / 60, 2)
+    return 200, {"exercises": [{"name": activity, "met": met, "duration_min": minutes, "nf_calories": kcal}]}
+
+
+def ors_directions(payload: dict, headers) -> tuple:
+    """/v2/directions/<프로필>/geojson 흉내: 출발-도착 사이를 살짝 구부린 20개 점"""
+    if not headers.get("Authorization"):
+        return 403, {"error": "Access to this API has been disallowed"}
+    try:
+        (lon0, lat0), (lon1, lat1) = payload["coordinates"][:2]
+    except (KeyError, ValueError, TypeError):
+        return 400, {"error": {"code": 2003, "message": "Parameter 'coordinates' has incorrect value"}}
+    n = 20
+    coords = []
+    for i in range(n + 1):
+        t = i / n
+        wiggle = 0.0005 * math.sin(t * math.pi * 3)
+        coords.append([lon0 + (lon1 - lon0) * t + wiggle, lat0 + (lat1 - lat0) * t + wiggle])
+    return 200, {"type": "FeatureCollection",
+                 "features": [{"type": "Feature", "geometry": {"type": "LineString", "coordinates": coords}}]}
+
+
+class FakeWorksheet:
+    """gspread Worksheet 중 투표 저장소가 쓰는 부분(append_rows / get_values)만 흉내내는 메모리 시트
+
+    latency: 호출마다 더할 지연(초), requests: 메서드별 호출 수
+    """
+
+    def __init__(self, rows: list = None, header: tuple = ("카테고리", "메뉴", "시각"), latency: float = 0.0):
+        self.rows     = [list(header)] + [list(r) for r in rows or []]
+        self.latency  = latency
+        self.requests = {}
+        self._lock    = threading.Lock()
+
+    def _call(self, name: str):
+        with self._lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def append_rows(self, rows: list):
+        self._call("append_rows")
+        with self._lock:
+            self.rows.extend(list(r) for r in rows)
+
+    def get_values(self, range_name: str = None) -> list:
+        """"A<n>:C" 형식만 지원 (n행부터 끝까지, 1행 = 헤더)"""
+        self._call("get_values")
+        start = int(re.match(r"A(\d+)", range_name).group(1)) if range_name else 1
+        with self._lock:
+            return [r[:3] for r in self.rows[start - 1:]]
+
+
+def sheets_routes(sheet: FakeWorksheet) -> dict:
+    """가짜 시트를 HTTP로 노출 (다른 프로세스에서 HttpWorksheet로 접근)"""
+    def append_rows(payload: dict, headers) -> tuple:
+        rows = payload.get("rows") or []
+        sheet.append_rows(rows)
+        return 200, {"updates": {"updatedRows": len(rows)}}
+
+    def get_values(payload: dict, headers) -> tuple:
+        return 200, {"values": sheet.get_values(payload.get("range"))}
+
+    return {"/sheets/append_rows": append_rows, "/sheets/get_values": get_values}
+
+
+class HttpWorksheet:
+    """sheets_routes 스텁에 붙는 워크시트 (gspread Worksheet 대신 투표 저장소에 넘김)"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.timeout  = timeout
+        self._session = requests.Session()
+
+    def _post(self, name: str, payload: dict) -> dict:
+        resp = self._session.post(f"{self.base_url}/sheets/{name}", json=payload, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def append_rows(self, rows: list):
+        self._post("append_rows", {"rows": rows})
+
+    def get_values(self, range_name: str = None) -> list:
+        return self._post("get_values", {"range": range_name})["values"]
+
+
+ORS_PROFILES = ("foot-walking", "foot-hiking", "cycling-regular")
+
+
+def nutritionix_server(port: int = 0, latency: float = 0.0) -> StubServer:
+    return StubServer({"/v2/natural/exercise": nutritionix_exercise}, port=port, latency=latency)
+
+
+def ors_server(port: int = 0, latency: float = 0.0) -> StubServer:
+    return StubServer({f"/v2/directions/{p}/geojson": ors_directions for p in ORS_PROFILES},
+                      port=port, latency=latency)
+
+
+def external_apis_server(port: int = 0, latency: float = 0.0, sheet: FakeWorksheet = None) -> StubServer:
+    """Nutritionix와 ORS(+ sheet를 주면 가짜 시트)를 한 서버에서 (경로가 겹치지 않음)"""
+    routes = {"/v2/natural/exercise": nutritionix_exercise}
+    routes.update({f"/v2/directions/{p}/geojson": ors_directions for p in ORS_PROFILES})
+    if sheet is not None:
+        routes.update(sheets_routes(sheet))
+    return StubServer(routes, port=port, latency=latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="외부 API 로컬 스텁 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--sheets", action="store_true", help="가짜 Google Sheets 경로도 띄우기")
+    args = parser.parse_args()
+
+    server = external_apis_server(args.port, args.latency, FakeWorksheet() if args.sheets else None)
+    print(f"✅ 스텁 서버: NUTRITIONIX_BASE_URL={server.url} ORS_BASE_URL={server.url}"
+          + (f" SHEETS_STUB_URL={server.url}" if args.sheets else ""))
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""부하 테스트용 앱 진입점: 투표 시트를 SHEETS_STUB_URL의 가짜 시트(bench.fakes.HttpWorksheet)로 바꾼 뒤 main.py 실행
+
+    python -m bench.fakes --sheets
+    SHEETS_STUB_URL=http://127.0.0.1:8765 streamlit run bench/load_app.py
+"""
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:  # streamlit run은 스크립트 폴더(bench/)만 경로에 넣음
+    sys.path.insert(0, ROOT)
+
+from bench.fakes import HttpWorksheet
+from core.startup import load_page
+
+# 프로세스당 한 번만 바꿈 (이 스크립트는 rerun마다 다시 실행됨)
+visual = load_page("visual")
+if not hasattr(visual, "_stub_sheet"):
+    visual._stub_sheet = HttpWorksheet(os.environ["SHEETS_STUB_URL"])
+    visual.get_gsheet = lambda: visual._stub_sheet
+
+runpy.run_path(os.path.join(ROOT, "main.py"), run_name="__main__")
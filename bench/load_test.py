@@ -0,0 +1,478 @@
+"""다중 세션 부하 테스트: 로컬 Streamlit 서버에 수백 개의 가상 사용자를 붙여 네 기능을 동시에 사용
+
+브라우저 대신 Streamlit 웹소켓 프로토콜(/_stcore/stream)을 직접 말하는 가벼운 클라이언트를 씀
+(위젯 id는 서버가 보낸 요소에서 라벨/키로 찾아 값을 보냄). 외부 서비스는 모두 로컬 스텁:
+- Google Sheets : bench.fakes 스텁의 /sheets/* (서버는 bench/load_app.py로 띄워 시트를 바꿈)
+- Nutritionix / ORS : 같은 스텁 서버
+
+    python -m bench.load_test                                    # 100명, 전체 시나리오
+    python -m bench.load_test --users 300 --latency 0.2 visual watch
+    python -m bench.load_test --url http://127.0.0.1:8501 --server-pid 1234   # 이미 떠 있는 서버 (같은 스텁 필요)
+
+시나리오마다 보고: 처리량(동작/초), 지연 시간 p50/p95/p99, 오류, 서버 RSS 증가,
+외부 호출 수 (처음 한 명이 순서대로 실행할 때 동작별 호출 수 + 동시 실행 중 동작당 평균)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import websocket_connect
+
+from bench.fakes import FakeWorksheet, external_apis_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEOUL_CITY_HALL = {"latitude": 37.5663, "longitude": 126.9779}
+
+
+class AppError(Exception):
+    pass
+
+
+class Session:
+    """가상 사용자 하나 (웹소켓 연결 = Streamlit 세션 하나)
+
+    elements: 마지막 실행에서 받은 위젯 요소 (id → (종류, proto)), values: 계속 보내는 위젯 값,
+    auto_reruns: 서버가 알려준 자동 재실행 fragment (id → 간격 초)
+    """
+
+    def __init__(self, url: str, record):
+        self.url         = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.record      = record  # (동작 이름, 지연 ms, 오류 여부) → None
+        self.elements    = {}
+        self.values      = {}
+        self.auto_reruns = {}
+        self.ws          = None
+
+    async def connect(self):
+        # 사용자마다 다른 주소로 보이게 (서버의 투표 허용 판단은 헤더 지문으로 클라이언트를 구분)
+        ip = ".".join(str(random.randint(1, 254)) for _ in range(4))
+        request = HTTPRequest(self.url, headers={"X-Forwarded-For": ip, "User-Agent": "hamhowmany-load-test"})
+        self.ws = await websocket_connect(request, max_message_size=200 * 2**20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    # ── 위젯 찾기 / 값 만들기 ──────────────────────────────
+    def find(self, name: str):
+        """키(…-<key>) 또는 라벨로 위젯 찾기 → (id, 종류, proto)"""
+        for wid, (kind, el) in self.elements.items():
+            if wid.endswith(f"-{name}") or getattr(el, "label", None) == name:
+                return wid, kind, el
+        raise AppError(f"위젯 없음: {name}")
+
+    def _state(self, name: str, value) -> WidgetState:
+        wid, kind, el = self.find(name)
+        state = WidgetState(id=wid)
+        if kind in ("selectbox", "radio"):
+            state.int_value = value
+        elif kind == "slider":
+            state.double_array_value.data.extend(value if isinstance(value, (list, tuple)) else [value])
+        elif kind == "number_input":
+            if el.data_type == NumberInput.INT:
+                state.int_value = int(value)
+            else:
+                state.double_value = float(value)
+        elif kind == "checkbox":
+            state.bool_value = bool(value)
+        elif kind == "component_instance":
+            state.json_value = json.dumps(value)
+        else:
+            raise AppError(f"값을 줄 수 없는 위젯: {name} ({kind})")
+        return state
+
+    # ── 동작 = rerun 한 번 ────────────────────────────────
+    async def act(self, action: str, click: str = None, values: dict = None, fragment_id: str = None):
+        """values(위젯 키/라벨 → 값)를 반영하고 click 버튼을 누른 rerun. 끝날 때까지(st.rerun 포함) 기다림
+
+        fragment_id를 주면 그 fragment만 다시 실행 (브라우저의 run_every 자동 재실행과 같음)
+        """
+        for name, value in (values or {}).items():
+            state = self._state(name, value)
+            self.values[state.id] = state
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        if click:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=self.find(click)[0], trigger_value=True))
+
+        start, error = time.perf_counter(), False
+        try:
+            await self.ws.write_message(msg.SerializeToString(), binary=True)
+            error = await self._read_run()
+        except AppError:
+            error = True
+            raise
+        except Exception as e:
+            error = True
+            raise AppError(f"{action}: {e!r}") from e
+        finally:
+            self.record(action, (time.perf_counter() - start) * 1000, error)
+
+    async def _read_run(self) -> bool:
+        """마지막 실행의 위젯 요소를 모으고, 앱 예외가 있었는지 반환"""
+        elements, error = {}, False
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise AppError("연결 끊김")
+            fm = ForwardMsg()
+            fm.ParseFromString(data)
+            kind = fm.WhichOneof("type")
+            if kind == "new_session":
+                elements, error = {}, False
+            elif kind == "auto_rerun":
+                self.auto_reruns[fm.auto_rerun.fragment_id] = fm.auto_rerun.interval
+            elif kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                el_kind = fm.delta.new_element.WhichOneof("type")
+                el = getattr(fm.delta.new_element, el_kind)
+                if el_kind == "exception":
+                    error = True
+                elif getattr(el, "id", ""):
+                    elements[el.id] = (el_kind, el)
+            elif kind == "script_finished" and fm.script_finished == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                self.elements.update(elements)  # fragment 밖의 위젯은 그대로
+                return error
+            elif kind == "script_finished" and fm.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                self.elements = elements
+                # 화면에서 사라진 위젯 값은 더 보내지 않음
+                self.values = {k: v for k, v in self.values.items() if k in elements}
+                return error
+
+
+# ✅ 시나리오 (홈에서 시작, 동작 이름은 보고서에 그대로 나옴)
+async def scenario_visual(s: Session, think):
+    await s.act("load")
+    await think()
+    await s.act("open_visual", click="go_visual")
+    await think()
+    await s.act("compare", values={"menu2": random.randint(1, 4)})
+    await think()
+    await s.act("vote", click="✅ 이 메뉴에 투표하기", values={"vote_select": random.randint(0, 4)})
+    await think()
+    await s.act("refresh", click="🔁 수동 새로고침")
+
+
+async def scenario_mbti(s: Session, think):
+    await s.act("load")
+    await think()
+    await s.act("open_mbti", click="go_mbti")
+    await think()
+    await s.act("start", click="🔥 테스트 시작하기")
+    await think()
+    await s.act("submit", click="🍔 결과 보기", values={f"q_{i}": random.randint(0, 1) for i in range(12)})
+    await think()
+    await s.act("retry", click="retry_button")
+
+
+async def scenario_specialty(s: Session, think):
+    await s.act("load")
+    await think()
+    await s.act("open_specialty", click="go_specialty")
+    await think()
+    await s.act("weights", values={"단백질 중요도": round(random.uniform(0.3, 1.0), 1)})
+    await think()
+    _, _, cal = s.find("칼로리 (kcal)")
+    await s.act("range", values={"칼로리 (kcal)": [cal.min, random.randint(int(cal.min) + 200, int(cal.max))]})
+    await think()
+    await s.act("recommend", click="메뉴 추천 받기")
+
+
+async def scenario_map(s: Session, think):
+    await s.act("load")
+    await think()
+    await s.act("open_map", click="go_map")
+    await think()
+    body = {"🎂 나이": random.randint(20, 60), "⚖️ 체중 (kg)": random.randint(50, 95)}
+    await s.act("body_info", click="✅ 신체정보 입력 완료", values=body)
+    await s.act("locate_probe", click="🌍 내 위치 적용하기!")  # 위치 컴포넌트 id를 알아내기 위한 한 번
+    jitter = {k: v + random.uniform(-0.01, 0.01) for k, v in SEOUL_CITY_HALL.items()}
+    await s.act("locate", click="🌍 내 위치 적용하기!", values={"loc": jitter})
+    await think()
+    await s.act("pick_menu", values={"🍔 버거": random.randint(1, 10)})
+    await think()
+    await s.act("direction", values={"📌 어느 방향으로 걸어볼까요?": random.randint(1, 3)})
+
+
+async def scenario_watch(s: Session, think, duration: float = 60.0, interval: float = None):
+    """투표 화면을 열어 두고 자동 새로고침 (여러 탭이 동시에 새로고침하는 피크)
+
+    앱이 run_every fragment를 쓰면 브라우저처럼 그 fragment만, 아니면 페이지 전체를 다시 실행.
+    interval이 없으면 서버가 알려준 간격
+    """
+    await s.act("load")
+    await s.act("open_visual", click="go_visual")
+    fragment_id, server_interval = next(iter(s.auto_reruns.items()), (None, 30.0))
+    interval = interval or server_interval
+    end = time.monotonic() + duration
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < end:
+        await s.act("autorefresh", fragment_id=fragment_id)
+        await asyncio.sleep(interval)
+
+
+SCENARIOS = {
+    "visual":    scenario_visual,
+    "mbti":      scenario_mbti,
+    "specialty": scenario_specialty,
+    "map":       scenario_map,
+    "watch":     scenario_watch,
+}
+
+
+# ✅ 서버 / RSS
+def rss_mb(pid: int):
+    """/proc 기준 RSS(MB). 리눅스가 아니거나 프로세스가 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+class RssSampler:
+    """서버 RSS를 interval초마다 읽어 구간별 최대값을 기록"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid, self.interval = pid, interval
+        self.peak = rss_mb(pid) or 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mb(self.pid) or 0.0)
+
+    def reset_peak(self):
+        self.peak = rss_mb(self.pid) or 0.0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "bench", "load_app.py"),
+           "--server.headless", "true", "--server.port", str(port),
+           "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_healthy(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"서버가 {timeout:.0f}초 안에 뜨지 않았습니다: {url}")
+
+
+# ✅ 측정
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class PhaseStats:
+    def __init__(self):
+        self.latencies = {}  # 동작 → [ms]
+        self.errors    = {}  # 동작 → 횟수
+        self.failed_users = 0
+
+    def record(self, action: str, ms: float, error: bool):
+        self.latencies.setdefault(action, []).append(ms)
+        if error:
+            self.errors[action] = self.errors.get(action, 0) + 1
+
+    @property
+    def actions(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+
+def calls_since(stub, before: dict) -> dict:
+    return {k: v - before.get(k, 0) for k, v in stub.requests.items() if v - before.get(k, 0)}
+
+
+async def probe_fanout(url: str, stub, name: str) -> list:
+    """사용자 한 명이 순서대로 실행할 때 동작별 외부 호출 수 → [(동작, {경로: 호출 수})]"""
+    rows, before = [], {}
+
+    def record(action, ms, error):
+        nonlocal before
+        rows.append((action, calls_since(stub, before)))
+        before = dict(stub.requests)
+
+    s = Session(url, record)
+    await s.connect()
+    before = dict(stub.requests)
+    try:
+        if name == "watch":
+            await scenario_watch(s, None, duration=0.1, interval=0.05)
+        else:
+            await SCENARIOS[name](s, lambda: asyncio.sleep(0))
+    finally:
+        s.close()
+    await asyncio.sleep(0.5)  # 비동기 쓰기(투표 버퍼) 반영 대기
+    return rows
+
+
+async def run_phase(url: str, name: str, users: int, ramp: float, think: tuple, watch: tuple) -> PhaseStats:
+    stats = PhaseStats()
+
+    async def user(i: int):
+        await asyncio.sleep(ramp * i / max(users, 1))
+        s = Session(url, stats.record)
+        try:
+            await s.connect()
+            if name == "watch":
+                await scenario_watch(s, None, *watch)
+            else:
+                await SCENARIOS[name](s, lambda: asyncio.sleep(random.uniform(*think)))
+        except Exception:
+            stats.failed_users += 1
+        finally:
+            s.close()
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 세션 부하 테스트 (로컬 Streamlit 서버 + 외부 서비스 스텁)")
+    parser.add_argument("scenarios", nargs="*", help=f"실행할 시나리오 (기본: 전체) {list(SCENARIOS)}")
+    parser.add_argument("--users", type=int, default=100, help="시나리오마다 동시 사용자 수")
+    parser.add_argument("--ramp", type=float, default=10.0, help="사용자를 모두 붙이는 데 걸리는 시간(초)")
+    parser.add_argument("--think", type=float, nargs=2, default=(0.5, 2.0), metavar=("MIN", "MAX"),
+                        help="동작 사이 대기(초)")
+    parser.add_argument("--watch-duration", type=float, default=60.0, help="watch: 투표 화면을 열어 두는 시간(초)")
+    parser.add_argument("--refresh-interval", type=float, help="watch: 자동 새로고침 간격(초, 기본: 앱 설정)")
+    parser.add_argument("--latency", type=float, default=0.1, help="스텁 응답 지연(초)")
+    parser.add_argument("--seed-votes", type=int, default=500)
+    parser.add_argument("--vote-backend", choices=["gsheet", "sqlite"], default="gsheet")
+    parser.add_argument("--port", type=int, default=8599, help="띄울 Streamlit 서버 포트")
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (이때는 서버를 띄우지 않음)")
+    parser.add_argument("--server-pid", type=int, help="--url 서버의 PID (RSS 측정용)")
+    parser.add_argument("--stub-port", type=int, default=0, help="스텁 서버 포트 (--url과 함께 쓸 때 고정)")
+    parser.add_argument("--save", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {unknown} (가능: {list(SCENARIOS)})")
+    scenarios = args.scenarios or list(SCENARIOS)
+
+    from bench.bench_pages import seed_votes
+    sheet = FakeWorksheet(seed_votes(args.seed_votes))
+    stub  = external_apis_server(args.stub_port, args.latency, sheet).start()
+
+    server, url, pid = None, args.url, args.server_pid
+    if url is None:
+        tmpdir = tempfile.mkdtemp(prefix="load_test_")
+        env = dict(os.environ, PYTHONPATH=ROOT,
+                   NUTRITIONIX_BASE_URL=stub.url, NUTRITIONIX_APP_ID="load", NUTRITIONIX_APP_KEY="load",
+                   ORS_BASE_URL=stub.url, ORS_API_KEY="load", SHEETS_STUB_URL=stub.url,
+                   BURN_RATE_CACHE_PATH="", VOTE_BACKEND=args.vote_backend,
+                   VOTE_DB_PATH=os.path.join(tmpdir, "votes.db"),
+                   VOTE_JOURNAL_PATH=os.path.join(tmpdir, "vote_journal.jsonl"),
+                   VOTE_SYNC_JOURNAL_PATH=os.path.join(tmpdir, "vote_sync_journal.jsonl"))
+        env.pop("LOCAL_ROAD_GRAPH", None)
+        server = start_server(args.port, env)
+        url, pid = f"http://127.0.0.1:{args.port}", server.pid
+    print(f"✅ 스텁 {stub.url} · 서버 {url} · 사용자 {args.users}명 · 외부 지연 {args.latency * 1000:.0f}ms")
+
+    report = {}
+    sampler = None
+    try:
+        wait_healthy(url)
+        sampler = RssSampler(pid).start() if pid and rss_mb(pid) is not None else None
+        rss_start = rss_mb(pid) if sampler else None
+        for name in scenarios:
+            fanout = asyncio.run(probe_fanout(url, stub, name))
+            before_calls = dict(stub.requests)
+            rss_before = rss_mb(pid) if sampler else None
+            if sampler:
+                sampler.reset_peak()
+
+            start = time.perf_counter()
+            stats = asyncio.run(run_phase(url, name, args.users, args.ramp, tuple(args.think),
+                                          (args.watch_duration, args.refresh_interval)))
+            elapsed = time.perf_counter() - start
+            time.sleep(0.5)
+            calls = calls_since(stub, before_calls)
+
+            all_ms = [ms for v in stats.latencies.values() for ms in v]
+            report[name] = {
+                "actions": stats.actions, "seconds": round(elapsed, 1),
+                "throughput_per_s": round(stats.actions / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(percentile(all_ms, 0.50), 1), "p95_ms": round(percentile(all_ms, 0.95), 1),
+                "p99_ms": round(percentile(all_ms, 0.99), 1),
+                "errors": sum(stats.errors.values()), "failed_users": stats.failed_users,
+                "by_action": {a: {"n": len(v), "p50_ms": round(percentile(v, 0.5), 1),
+                                  "p95_ms": round(percentile(v, 0.95), 1), "errors": stats.errors.get(a, 0)}
+                              for a, v in stats.latencies.items()},
+                "external_calls": calls,
+                "external_calls_per_action": round(sum(calls.values()) / stats.actions, 3) if stats.actions else 0.0,
+                "first_user_fanout": [{"action": a, "calls": c} for a, c in fanout],
+            }
+            if sampler:
+                report[name].update(rss_before_mb=round(rss_before, 1), rss_peak_mb=round(sampler.peak, 1),
+                                    rss_after_mb=round(rss_mb(pid) or 0.0, 1))
+            print_phase(name, report[name])
+        if sampler:
+            print(f"\n서버 RSS: 시작 {rss_start:.0f}MB → 끝 {rss_mb(pid) or 0:.0f}MB")
+    finally:
+        if sampler:
+            sampler.stop()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        stub.stop()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"scenarios": report, "config": vars(args)}, f, ensure_ascii=False, indent=2)
+        print(f"✅ 저장: {args.save}")
+
+
+def print_phase(name: str, r: dict):
+    rss = (f" · RSS {r['rss_before_mb']:.0f}→{r['rss_after_mb']:.0f}MB (최대 {r['rss_peak_mb']:.0f})"
+           if "rss_peak_mb" in r else "")
+    print(f"\n■ {name}: {r['actions']}동작 / {r['seconds']}초 = {r['throughput_per_s']}/초 · "
+          f"p50 {r['p50_ms']}ms p95 {r['p95_ms']}ms p99 {r['p99_ms']}ms · "
+          f"오류 {r['errors']} (실패 사용자 {r['failed_users']}){rss}")
+    print(f"  {'동작':<14} {'횟수':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'오류':>5}  첫 사용자 외부 호출")
+    first = {}
+    for row in r["first_user_fanout"]:
+        first.setdefault(row["action"], row["calls"])
+    for action, a in r["by_action"].items():
+        calls = ", ".join(f"{k.rsplit('/', 2)[-2] if k.endswith('geojson') else k.rsplit('/', 1)[-1]}×{v}"
+                          for k, v in first.get(action, {}).items()) or "-"
+        print(f"  {action:<14} {a['n']:>6} {a['p50_ms']:>9.1f} {a['p95_ms']:>9.1f} {a['errors']:>5}  {calls}")
+    total = ", ".join(f"{k}×{v}" for k, v in r["external_calls"].items()) or "-"
+    print(f"  외부 호출 합계: {total} (동작당 {r['external_calls_per_action']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""벤치마크용 가상 카탈로그: 실제 메뉴를 지역/시즌 메뉴처럼 복제하고 값에 노이즈를 섞어 크기를 키움"""
+import numpy as np
+import pandas as pd
+
+from core.catalog import NUMERIC_COLUMNS, Catalog, get_catalog
+
+
+def grow_catalog(size: int, seed: int = 0) -> Catalog:
+    """행 수가 size 정도인 가상 카탈로그 (원본 카테고리 비율 유지)"""
+    base = get_catalog().frame
+    reps = max(1, int(np.ceil(size / len(base))))
+    rng  = np.random.default_rng(seed)
+    frames = []
+    for r in range(reps):
+        df = base.copy()
+        if r:
+            df["메뉴"] = df["메뉴"] + f" #{r}"
+            for col in NUMERIC_COLUMNS:
+                df[col] = np.round(df[col] * rng.uniform(0.7, 1.3, len(df)), 1)
+        frames.append(df)
+    return Catalog(pd.concat(frames, ignore_index=True).head(size))
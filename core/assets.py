@@ -0,0 +1,140 @@
+"""이미지 변형본: 표시 폭 버킷별로 줄이고 압축한 파일을 콘텐츠 해시 이름으로 캐시
+
+원본 PNG(MBTI 이미지 장당 약 3MB)를 그대로 보내지 않고, 화면에 그릴 폭에 맞는 가장 작은 변형본을 보냄
+- 투명도가 없는 이미지는 JPEG, 투명 배경이 있으면 PNG(팔레트 압축)
+  st.image는 JPEG/PNG가 아닌 파일(WebP 등)을 매번 다시 인코딩하므로 기본은 이 두 형식만 사용
+  (WebP는 fmt="webp"로 직접 만들 수 있음 — HTML/정적 파일로 보낼 때)
+- 파일명: <원본 이름>.<원본 내용 해시>.w<폭>.<확장자> → 원본이 바뀌면 자동으로 새 파일
+
+    python -m core.assets          # 배포 전에 모든 변형본 미리 만들기
+"""
+import argparse
+import glob
+import hashlib
+import os
+import threading
+
+from core.catalog import BASE_DIR
+from core.metrics import timed
+
+DATA_DIR        = os.path.join(BASE_DIR, "data")
+ASSET_CACHE_DIR = os.path.join(DATA_DIR, ".asset_cache")
+WIDTH_BUCKETS   = (200, 320, 480, 720, 960, 1280)
+JPEG_QUALITY    = 82
+WEBP_QUALITY    = 80
+
+# 미리 만들어 둘 원본 (glob 패턴, 페이지에서 쓰는 폭)
+ASSET_SOURCES = [
+    (os.path.join(DATA_DIR, "burgers.png"),           [720]),
+    (os.path.join(DATA_DIR, "mbti_images", "*.png"),  [480]),
+    (os.path.join(DATA_DIR, "menu_images", "*.png"),  [200]),
+]
+
+_hash_cache = {}  # (경로, mtime_ns, 크기) → 내용 해시
+_variants   = {}  # (경로, mtime_ns, 버킷, 형식) → 변형본 경로
+_lock       = threading.Lock()
+
+
+def bucket_for(width: int) -> int:
+    """표시 폭 이상인 가장 작은 버킷 (없으면 가장 큰 버킷)"""
+    for b in WIDTH_BUCKETS:
+        if b >= width:
+            return b
+    return WIDTH_BUCKETS[-1]
+
+
+def content_hash(path: str, st=None) -> str:
+    st = st or os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    h = _hash_cache.get(key)
+    if h is None:
+        with open(path, "rb") as f:
+            h = hashlib.sha1(f.read()).hexdigest()[:12]
+        _hash_cache[key] = h
+    return h
+
+
+def _has_transparency(im) -> bool:
+    if im.mode in ("RGBA", "LA"):
+        return im.getchannel("A").getextrema()[0] < 255
+    return im.mode == "P" and "transparency" in im.info
+
+
+def build_variant(src: str, width: int, fmt: str = None) -> str:
+    """src를 폭 width 이하로 줄인 변형본을 만들고 경로 반환 (이미 있으면 그대로 반환)
+
+    fmt: None이면 투명도에 따라 jpeg/png 자동 선택, "webp"도 가능
+    """
+    from PIL import Image
+
+    stem = os.path.splitext(os.path.basename(src))[0]
+    h    = content_hash(src)
+    with Image.open(src) as im:
+        alpha = _has_transparency(im)
+        fmt   = fmt or ("png" if alpha else "jpeg")
+        ext   = "jpg" if fmt == "jpeg" else fmt
+        out   = os.path.join(ASSET_CACHE_DIR, f"{stem}.{h}.w{width}.{ext}")
+        if os.path.exists(out):
+            return out
+
+        im = im.convert("RGBA" if alpha else "RGB")
+        if im.width > width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        tmp = f"{out}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if fmt == "jpeg":
+            im.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        elif fmt == "png":
+            im.quantize(256, method=Image.Quantize.FASTOCTREE).save(tmp, "PNG", optimize=True)
+        else:
+            im.save(tmp, fmt.upper(), quality=WEBP_QUALITY, method=6)
+    os.replace(tmp, out)
+    return out
+
+
+def image_variant(src: str, width: int, fmt: str = None) -> str:
+    """페이지에서 쓰는 진입점: 표시 폭에 맞는 변형본 경로 (실패하면 원본 경로)"""
+    try:
+        st = os.stat(src)
+    except OSError:
+        return src
+    key = (src, st.st_mtime_ns, bucket_for(width), fmt)
+    path = _variants.get(key)
+    if path and os.path.exists(path):
+        return path
+    with _lock:
+        try:
+            with timed("asset.variant"):
+                path = build_variant(src, bucket_for(width), fmt)
+        except Exception:
+            return src
+        _variants[key] = path
+    return path
+
+
+def build_all(sources=ASSET_SOURCES) -> list:
+    """ASSET_SOURCES의 모든 변형본을 만들고, 더 이상 쓰지 않는 옛 변형본은 삭제"""
+    built = []
+    for pattern, widths in sources:
+        for src in sorted(glob.glob(pattern)):
+            for w in widths:
+                built.append(build_variant(src, bucket_for(w)))
+    keep = set(built)
+    for path in glob.glob(os.path.join(ASSET_CACHE_DIR, "*")):
+        if path not in keep:
+            os.remove(path)
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 변형본 미리 만들기")
+    parser.parse_args()
+    built = build_all()
+    src_bytes = sum(os.path.getsize(p) for pattern, _ in ASSET_SOURCES for p in glob.glob(pattern))
+    out_bytes = sum(os.path.getsize(p) for p in built)
+    print(f"✅ 변형본 {len(built)}개: 원본 {src_bytes / 1e6:.1f}MB → {out_bytes / 1e6:.1f}MB ({ASSET_CACHE_DIR})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""운동별 분당 소모 칼로리 (Nutritionix natural/exercise API) + 캐시
+
+- 키: (운동, 성별, 나이 5세 단위, 체중 2kg 단위, 신장 5cm 단위) → 비슷한 체형은 같은 값을 재사용
+  API에도 양자화한 값을 보내므로 캐시된 값과 새로 받은 값이 항상 같은 입력 기준
+- 1단계: 프로세스 전역 메모리 캐시 (TTL + LRU), 2단계(선택): SQLite 파일 → 재시작 후에도 재사용
+- requests.Session 하나로 연결을 재사용하고, 모든 요청에 타임아웃을 둠
+- 같은 키를 여러 세션이 동시에 요청하면 한 번만 호출
+
+    NUTRITIONIX_BASE_URL=http://127.0.0.1:8765   # 로컬 스텁 서버 (python -m bench.fakes)
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from core.catalog import BASE_DIR
+from core.metrics import observe
+
+NUTRITIONIX_BASE_URL  = os.getenv("NUTRITIONIX_BASE_URL", "https://trackapi.nutritionix.com")
+BURN_RATE_CACHE_PATH  = os.getenv("BURN_RATE_CACHE_PATH", os.path.join(BASE_DIR, "data", "burn_rate_cache.db"))
+BURN_RATE_TTL         = float(os.getenv("BURN_RATE_TTL", str(7 * 24 * 3600)))
+FAILURE_TTL           = 60.0           # 실패한 키는 잠깐만 기억해서 매 rerun마다 다시 호출하지 않음
+REQUEST_TIMEOUT       = (3.05, 10.0)   # (연결, 응답) 초
+
+AGE_STEP, WEIGHT_STEP, HEIGHT_STEP = 5, 2.0, 5.0
+GENDERS = {"남성": "male", "여성": "female", "male": "male", "female": "female"}
+
+
+def quantize_profile(profile: dict) -> tuple:
+    """(성별, 나이, 체중, 신장)을 구간 대표값으로 맞춘 튜플"""
+    gender = GENDERS.get(profile.get("gender"), profile.get("gender"))
+    age    = int(profile["age"]) // AGE_STEP * AGE_STEP + AGE_STEP // 2
+    weight = round(float(profile["weight_kg"]) / WEIGHT_STEP) * WEIGHT_STEP
+    height = round(float(profile["height_cm"]) / HEIGHT_STEP) * HEIGHT_STEP
+    return gender, age, weight, height
+
+
+class BurnRateCache:
+    """메모리(TTL + LRU) + 선택적 SQLite 디스크 캐시. 값은 분당 kcal (실패는 None)"""
+
+    def __init__(self, ttl: float = BURN_RATE_TTL, max_entries: int = 4096, disk_path: str = None):
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.disk_path   = disk_path
+        self._items = OrderedDict()  # key → (값, 만료 시각)
+        self._lock  = threading.Lock()
+        self._local = threading.local()
+        if disk_path:
+            with self._conn() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS burn_rates ("
+                    " key TEXT PRIMARY KEY, kcal_per_min REAL NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: tuple):
+        """(찾았는지, 값, 위치) — 위치는 "memory" / "disk" / None"""
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                if item[1] > now:
+                    self._items.move_to_end(key)
+                    return True, item[0], "memory"
+                del self._items[key]
+        if self.disk_path:
+            row = self._conn().execute(
+                "SELECT kcal_per_min, expires_at FROM burn_rates WHERE key = ?", (repr(key),)
+            ).fetchone()
+            if row and row[1] > now:
+                self._remember(key, row[0], row[1])
+                return True, row[0], "disk"
+        return False, None, None
+
+    def put(self, key: tuple, value, ttl: float = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, value, expires_at)
+        if self.disk_path and value is not None:  # 실패는 디스크에 남기지 않음
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO burn_rates (key, kcal_per_min, expires_at) VALUES (?, ?, ?)",
+                    (repr(key), value, expires_at),
+                )
+
+    def _remember(self, key, value, expires_at):
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class NutritionixClient:
+    def __init__(self, app_id: str, app_key: str, base_url: str = NUTRITIONIX_BASE_URL,
+                 cache: BurnRateCache = None, timeout=REQUEST_TIMEOUT, pool_size: int = 8):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url     = base_url.rstrip("/") + "/v2/natural/exercise"
+        self.timeout = timeout
+        self.cache   = cache if cache is not None else BurnRateCache()
+
+        self._session = requests.Session()
+        self._session.headers.update({"x-app-id": app_id or "", "x-app-key": app_key or "",
+                                      "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._key_locks = {}
+        self._lock      = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "calls": 0, "errors": 0,
+                       "total_call_ms": 0.0, "max_call_ms": 0.0}
+
+    def burn_rate(self, activity: str, profile: dict):
+        """분당 소모 칼로리. API 실패 시 None"""
+        key = (activity, *quantize_profile(profile))
+        found, value, where = self.cache.get(key)
+        if found:
+            self._count(f"{where}_hits")
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # 기다리는 동안 다른 세션이 받아 왔을 수 있음
+            found, value, where = self.cache.get(key)
+            if found:
+                self._count(f"{where}_hits")
+                return value
+            value = self._fetch(key)
+            self.cache.put(key, value, ttl=None if value is not None else FAILURE_TTL)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return value
+
+    def _fetch(self, key: tuple):
+        activity, gender, age, weight, height = key
+        payload = {"query": f"{activity} 30 minutes", "gender": gender, "age": age,
+                   "weight_kg": weight, "height_cm": height}
+        start = time.perf_counter()
+        try:
+            res = self._session.post(self.url, json=payload, timeout=self.timeout)
+            data = res.json() if res.status_code == 200 else {}
+        except Exception:
+            data = None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["calls"]         += 1
+            self._stats["total_call_ms"] += elapsed_ms
+            self._stats["max_call_ms"]    = max(self._stats["max_call_ms"], elapsed_ms)
+        exercises = (data or {}).get("exercises")
+        ok = bool(exercises and exercises[0].get("duration_min"))
+        observe("nutritionix.exercise", elapsed_ms, error=not ok)
+        if not ok:
+            self._count("errors")
+            return None
+        return exercises[0]["nf_calories"] / exercises[0]["duration_min"]
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+        s["avg_call_ms"] = s["total_call_ms"] / s["calls"] if s["calls"] else None
+        s["entries"]     = len(self.cache)
+        return s
+
+    def close(self):
+        self._session.close()
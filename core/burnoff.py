@@ -0,0 +1,139 @@
+"""메뉴 × 운동 × 체형 "칼로리 태우기" 행렬: 메뉴 하나를 운동으로 소모하는 데 걸리는 시간(분)과 거리(km)
+
+카탈로그 전체 × core.met의 모든 운동 × 체형 격자를 한 번에 계산해 두고 (numpy 브로드캐스팅),
+조회는 인덱스 세 개로 바로 꺼냄. 격자에 없는 체형은 가장 가까운 격자점으로 맞춤
+
+    python -m core.burnoff export data/burnoff.csv                 # 전체 행렬 (긴 형식)
+    python -m core.burnoff export burnoff.parquet --gender 여성 --age 30 --weight 60 --height 165
+"""
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from core.catalog import get_catalog
+from core.met import ACTIVITIES, ACTIVITY_INDEX, SPEEDS_KMPH, burn_rates
+
+# 체형 격자 (성별 × 나이 × 체중 × 신장)
+GENDERS     = ("남성", "여성")
+AGE_GRID    = np.array([20, 30, 40, 50, 60])
+WEIGHT_GRID = np.array([50, 60, 70, 80, 90, 100])
+HEIGHT_GRID = np.array([155, 165, 175, 185])
+
+DEFAULT_PROFILE = {"gender": "남성", "age": 30, "weight_kg": 70, "height_cm": 175}
+
+
+def _nearest(grid: np.ndarray, value: float) -> int:
+    return int(np.abs(grid - float(value)).argmin())
+
+
+class BurnoffMatrix:
+    """minutes / km: 모양 (메뉴 수, 운동 수, 성별, 나이, 체중, 신장) float32"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        g, a, w, h = np.meshgrid(np.array(GENDERS, dtype=object), AGE_GRID, WEIGHT_GRID, HEIGHT_GRID,
+                                 indexing="ij")
+        grid_shape = g.shape
+        rates = burn_rates(g.ravel(), a.ravel(), w.ravel(), h.ravel())          # (체형 수, 운동 수)
+        rates = rates.T.reshape((len(ACTIVITIES),) + grid_shape)                # (운동, 성별, 나이, 체중, 신장)
+
+        kcal = catalog.kcal.reshape((-1,) + (1,) * rates.ndim)
+        self.minutes = (kcal / rates[None]).astype(np.float32)
+        speed = SPEEDS_KMPH.reshape((1, -1) + (1,) * len(grid_shape))
+        self.km = (self.minutes * speed / 60.0).astype(np.float32)
+        self.minutes.flags.writeable = False
+        self.km.flags.writeable = False
+
+    def profile_index(self, profile: dict) -> tuple:
+        """체형 → 격자 인덱스 (성별, 나이, 체중, 신장). 가장 가까운 격자점"""
+        gender = 0 if profile.get("gender") in ("남성", "male") else 1
+        return (gender, _nearest(AGE_GRID, profile["age"]),
+                _nearest(WEIGHT_GRID, profile["weight_kg"]), _nearest(HEIGHT_GRID, profile["height_cm"]))
+
+    def lookup(self, menu: str, activity: str, profile: dict = DEFAULT_PROFILE, category: str = None):
+        """(분, km). 메뉴가 없으면 None"""
+        row = self.catalog.row(menu, category)
+        if row is None:
+            return None
+        idx = (row, ACTIVITY_INDEX[activity]) + self.profile_index(profile)
+        return float(self.minutes[idx]), float(self.km[idx])
+
+    def menu_table(self, rows, profile: dict = DEFAULT_PROFILE) -> pd.DataFrame:
+        """메뉴 행 번호들 × 운동 → "분 (km)" 요약 표 (행: 운동, 열: 메뉴)"""
+        p = self.profile_index(profile)
+        minutes = self.minutes[(list(rows), slice(None)) + p]
+        km      = self.km[(list(rows), slice(None)) + p]
+        cells = {
+            self.catalog.names[r]: [f"{m:.0f}분 ({d:.1f}km)" for m, d in zip(minutes[i], km[i])]
+            for i, r in enumerate(rows)
+        }
+        return pd.DataFrame(cells, index=pd.Index([a.label for a in ACTIVITIES], name="운동"))
+
+    def to_frame(self, profile: dict = None) -> pd.DataFrame:
+        """긴 형식 표. profile을 주면 그 체형(가장 가까운 격자점)만"""
+        c = self.catalog
+        if profile is not None:
+            p = self.profile_index(profile)
+            combos = [p]
+        else:
+            combos = list(itertools.product(range(len(GENDERS)), range(len(AGE_GRID)),
+                                            range(len(WEIGHT_GRID)), range(len(HEIGHT_GRID))))
+        n_items, n_act = len(c), len(ACTIVITIES)
+        frames = []
+        for gi, ai, wi, hi in combos:
+            frames.append(pd.DataFrame({
+                "카테고리":     np.repeat(c.categories, n_act),
+                "메뉴":         np.repeat(c.names, n_act),
+                "칼로리(Kcal)": np.repeat(c.kcal, n_act),
+                "운동":         np.tile([a.key for a in ACTIVITIES], n_items),
+                "성별":         GENDERS[gi],
+                "나이":         AGE_GRID[ai],
+                "체중(kg)":     WEIGHT_GRID[wi],
+                "신장(cm)":     HEIGHT_GRID[hi],
+                "분":           self.minutes[:, :, gi, ai, wi, hi].ravel().astype(np.float64).round(1),
+                "km":           self.km[:, :, gi, ai, wi, hi].ravel().astype(np.float64).round(2),
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+    def export(self, path: str, profile: dict = None) -> int:
+        """CSV(.csv) 또는 Parquet(.parquet)로 저장하고 행 수 반환"""
+        frame = self.to_frame(profile)
+        if path.endswith(".parquet"):
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False, encoding="utf-8-sig")
+        return len(frame)
+
+
+def get_burnoff_matrix() -> BurnoffMatrix:
+    """현재 카탈로그 버전에 묶인 행렬 (카탈로그가 다시 로딩되면 새로 만듦)"""
+    return get_catalog().derived("burnoff", BurnoffMatrix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메뉴 × 운동 × 체형 칼로리 소모 표 내보내기")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    exp = sub.add_parser("export", help="CSV/Parquet로 저장")
+    exp.add_argument("path")
+    exp.add_argument("--gender", choices=GENDERS)
+    exp.add_argument("--age", type=int)
+    exp.add_argument("--weight", type=float)
+    exp.add_argument("--height", type=float)
+    args = parser.parse_args()
+
+    profile = None
+    if any(v is not None for v in (args.gender, args.age, args.weight, args.height)):
+        profile = {
+            "gender":    args.gender or DEFAULT_PROFILE["gender"],
+            "age":       args.age if args.age is not None else DEFAULT_PROFILE["age"],
+            "weight_kg": args.weight if args.weight is not None else DEFAULT_PROFILE["weight_kg"],
+            "height_cm": args.height if args.height is not None else DEFAULT_PROFILE["height_cm"],
+        }
+    n = get_burnoff_matrix().export(args.path, profile)
+    print(f"✅ {n:,}행 → {args.path}")
+
+
+if __name__ == "__main__":
+    main()
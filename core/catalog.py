@@ -0,0 +1,180 @@
+"""메뉴 카탈로그: 서버 프로세스당 한 번만 로딩해서 모든 페이지가 공유하는 메뉴 데이터
+
+런타임에는 CSV를 파싱하지 않고, 미리 검증·병합해 둔 Arrow 파일(data/catalog.arrow)을 메모리 매핑으로 읽음
+(만들기: python -m core.catalog_artifact build)
+"""
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.metrics import timed
+
+BASE_DIR  = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH    = os.path.join(BASE_DIR, "data", "McDelivery Nutritional Information Table.csv")
+PRICES_PATH  = os.path.join(BASE_DIR, "data", "Mcdelivery_menu_prices_Kacl.csv")
+CATALOG_PATH = os.path.join(BASE_DIR, "data", "catalog.arrow")
+# 아티팩트 메타데이터에 해시를 남기는 원본 (이름 → 경로)
+SOURCE_PATHS = {"nutrition": DATA_PATH, "prices": PRICES_PATH}
+
+# 숫자 컬럼명 → Catalog 속성명
+NUMERIC_COLUMNS = {
+    "가격":         "price",
+    "칼로리(Kcal)": "kcal",
+    "단백질":       "protein",
+    "지방":         "fat",
+    "나트륨":       "sodium",
+    "당류":         "sugar",
+}
+# CSV 버전마다 다르게 적힌 컬럼명 보정
+COLUMN_ALIASES = {"컬로리(Kcal)": "칼로리(Kcal)", "매뉴얼": "메뉴"}
+
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_artifact(path: str = CATALOG_PATH):
+    """Arrow IPC 파일 → (DataFrame, 메타데이터 dict). 파일은 메모리 매핑 (프로세스끼리 OS 페이지 캐시 공유)"""
+    import pyarrow as pa
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    return table.to_pandas(), meta
+
+
+def stale_sources(meta: dict) -> list:
+    """아티팩트를 만든 뒤 내용이 바뀐 원본 이름 (원본 파일이 없으면 아티팩트를 믿음)"""
+    recorded = json.loads(meta.get("hamhowmany.sources", "{}"))
+    return [name for name, path in SOURCE_PATHS.items()
+            if os.path.exists(path) and recorded.get(name, {}).get("sha256") != file_sha256(path)]
+
+
+def catalog_mtime(path: str = CATALOG_PATH) -> float:
+    """아티팩트와 원본 CSV 중 가장 최근 수정 시각 (CSV만 고쳐도 바뀜 → 다시 로딩하면서 해시로 확인)"""
+    paths = [path, *SOURCE_PATHS.values()]
+    return max(os.path.getmtime(p) for p in paths if os.path.exists(p))
+
+
+class Catalog:
+    """컬럼별 NumPy 배열 + 메뉴명 인덱스 + 카테고리 마스크를 들고 있는 읽기 전용 카탈로그"""
+
+    def __init__(self, frame: pd.DataFrame, version: float = 0.0):
+        self.frame   = frame
+        self.version = version
+
+        self.names      = frame["메뉴"].to_numpy(dtype=object)
+        self.categories = frame["카테고리"].to_numpy(dtype=object)
+        for col, attr in NUMERIC_COLUMNS.items():
+            setattr(self, attr, frame[col].to_numpy(dtype=np.float64))
+
+        # 메뉴명 → 행 번호 (같은 이름이 여러 카테고리에 있으면 첫 행)
+        self.index = {}
+        self.pair_index = {}
+        for i, (cat, name) in enumerate(zip(self.categories, self.names)):
+            self.index.setdefault(name, i)
+            self.pair_index[(cat, name)] = i
+
+        # 카테고리 → 행 마스크 / 행 번호 (CSV 등장 순서 유지)
+        self.category_names = list(dict.fromkeys(self.categories))
+        self.category_masks = {cat: self.categories == cat for cat in self.category_names}
+        self.category_rows  = {cat: np.flatnonzero(m) for cat, m in self.category_masks.items()}
+        self._menus         = {cat: self.names[rows].tolist() for cat, rows in self.category_rows.items()}
+
+        for arr in [self.names, self.categories, *self.category_masks.values(), *self.category_rows.values()]:
+            arr.flags.writeable = False
+        for attr in NUMERIC_COLUMNS.values():
+            getattr(self, attr).flags.writeable = False
+
+        self._derived      = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def from_artifact(cls, path: str = CATALOG_PATH) -> "Catalog":
+        """아티팩트에서 로딩. 아티팩트가 없거나 원본 CSV가 바뀌었으면 CSV를 검증·병합해서 만들고 경고"""
+        from core.catalog_artifact import build_frame
+        version = catalog_mtime(path)
+        if not os.path.exists(path):
+            print(f"⚠️ {os.path.basename(path)}이 없어 CSV에서 만듭니다 (python -m core.catalog_artifact build)")
+            return cls(build_frame()[0], version=version)
+        frame, meta = read_artifact(path)
+        stale = stale_sources(meta)
+        if stale:
+            print(f"⚠️ {os.path.basename(path)}이 원본({', '.join(stale)})보다 오래되어 CSV에서 만듭니다 "
+                  f"(python -m core.catalog_artifact build)")
+            frame = build_frame()[0]
+        return cls(frame, version=version)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def values(self, column: str) -> np.ndarray:
+        """컬럼명(예: '나트륨') 또는 속성명(예: 'sodium')으로 배열 반환"""
+        return getattr(self, NUMERIC_COLUMNS.get(column, column))
+
+    def matrix(self, columns) -> np.ndarray:
+        """(행 수, 컬럼 수) 영양소 행렬"""
+        return np.column_stack([self.values(c) for c in columns])
+
+    def row(self, name: str, category: str = None):
+        """메뉴명 → 행 번호 (없으면 None)"""
+        if category is not None:
+            return self.pair_index.get((category, name))
+        return self.index.get(name)
+
+    def nutrients(self, name: str, columns, category: str = None) -> np.ndarray:
+        i = self.row(name, category)
+        if i is None:
+            return np.full(len(columns), np.nan)
+        return np.array([self.values(c)[i] for c in columns])
+
+    def menus(self, category: str) -> list:
+        """카테고리에 속한 메뉴 목록"""
+        return self._menus.get(category, [])
+
+    def menus_matching(self, keyword: str) -> list:
+        """카테고리 이름에 keyword가 들어간 메뉴 목록 (예: '음료')"""
+        return self.derived(("menus_matching", keyword), lambda cat: [
+            name for c in cat.category_names if keyword in c for name in cat.menus(c)
+        ])
+
+    def derived(self, key, factory):
+        """이 카탈로그 버전에 묶인 파생 데이터(인덱스, 엔진 등)를 한 번만 만들어 재사용"""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = factory(self)
+            return self._derived[key]
+
+
+_catalog      = None
+_catalog_lock = threading.Lock()
+_failed_mtime = None  # 다시 로딩이 검증에 실패한 수정 시각 (같은 파일로 매번 다시 시도하지 않음)
+
+
+def get_catalog(path: str = CATALOG_PATH) -> Catalog:
+    """프로세스 전역 카탈로그 반환. 아티팩트나 원본 CSV의 수정 시각(mtime)이 바뀌면 자동으로 다시 읽음
+    (CSV만 고치고 빌드하지 않았으면 CSV에서 만들고 경고)"""
+    global _catalog, _failed_mtime
+    mtime = catalog_mtime(path)
+    cat = _catalog
+    if cat is not None and mtime in (cat.version, _failed_mtime):
+        return cat
+    with _catalog_lock:
+        if _catalog is None or mtime not in (_catalog.version, _failed_mtime):
+            try:
+                with timed("data.catalog_load"):
+                    _catalog = Catalog.from_artifact(path)
+            except ValueError as e:  # 실행 중 CSV를 잘못 고친 경우 이전 카탈로그로 계속 (처음 로딩은 그대로 실패)
+                if _catalog is None:
+                    raise
+                _failed_mtime = mtime
+                print(f"❌ 카탈로그 다시 로딩 실패 → 이전 카탈로그 유지\n{e}")
+        return _catalog
@@ -0,0 +1,161 @@
+"""카탈로그 아티팩트 빌드: 영양 CSV + 가격 CSV를 검증·병합해서 Arrow IPC 파일 하나로 저장
+
+    python -m core.catalog_artifact build      # data/catalog.arrow 생성 (잘못된 행이 있으면 목록 출력 후 종료 코드 1)
+    python -m core.catalog_artifact check      # 아티팩트가 원본 CSV와 맞는지 (배포 전 확인)
+    python -m core.catalog_artifact info       # 스키마 / 메타데이터
+
+검증 (하나라도 걸리면 CatalogValidationError, 행 번호와 함께 전부 보고)
+- 필수 컬럼, 빈 카테고리/메뉴, 숫자로 읽을 수 없거나 음수인 값, 같은 (카테고리, 메뉴) 중복
+- 두 CSV에 모두 있는 메뉴는 가격·칼로리가 같아야 함
+가격 CSV에만 있는 메뉴(영양 정보 없음)는 싣지 않고 보고만 함
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+from core.catalog import (CATALOG_PATH, COLUMN_ALIASES, DATA_PATH, NUMERIC_COLUMNS, PRICES_PATH,
+                          file_sha256, read_artifact, stale_sources)
+
+SCHEMA_VERSION = "1"
+KEY_COLUMNS    = ["카테고리", "메뉴"]
+# 가격 CSV에서 영양 CSV와 맞춰 보는 컬럼
+SHARED_COLUMNS = ["가격", "칼로리(Kcal)"]
+
+# 천 단위 쉼표와 단위는 허용 ("10,300원", "807 kcal"), 부호나 다른 글자는 잘못된 값
+_NUMBER = re.compile(r"^(\d+(?:\.\d+)?)\s*(?:원|kcal|mg|g)?$", re.IGNORECASE)
+
+
+class CatalogValidationError(ValueError):
+    """원본 CSV에 잘못된 행이 있음 (problems: '파일:줄 설명' 목록)"""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        shown = "\n".join(f"  - {p}" for p in problems[:30])
+        more = f"\n  ... 외 {len(problems) - 30}건" if len(problems) > 30 else ""
+        super().__init__(f"카탈로그 원본 검증 실패 ({len(problems)}건)\n{shown}{more}")
+
+
+def _read_source(path: str, columns: list, problems: list) -> pd.DataFrame:
+    """문자열 그대로 읽고 (BOM 제거) 컬럼명 보정 → 키 공백 제거, 숫자 변환. 문제는 problems에 쌓음"""
+    name = os.path.basename(path)
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    raw.columns = raw.columns.str.strip()
+    raw = raw.rename(columns=COLUMN_ALIASES)
+    missing = [c for c in KEY_COLUMNS + columns if c not in raw.columns]
+    if missing:
+        problems.append(f"{name}: 필수 컬럼 없음 {missing}")
+        return pd.DataFrame(columns=KEY_COLUMNS + columns)
+
+    df = raw[KEY_COLUMNS + columns].apply(lambda s: s.str.strip())
+    df.index = df.index + 2  # CSV 줄 번호 (헤더가 1줄)
+    for line, row in df.iterrows():
+        for col in KEY_COLUMNS:
+            if not row[col]:
+                problems.append(f"{name}:{line} {col} 비어 있음")
+        for col in columns:
+            m = _NUMBER.match(row[col].replace(",", ""))
+            if m is None:
+                problems.append(f"{name}:{line} {col} 값 {row[col]!r}을 0 이상의 숫자로 읽을 수 없음")
+    for line, (cat, menu) in df[df.duplicated(KEY_COLUMNS)][KEY_COLUMNS].iterrows():
+        problems.append(f"{name}:{line} ({cat}, {menu}) 중복")
+    for col in columns:
+        df[col] = pd.to_numeric(df[col].str.replace(",", "").str.extract(r"^([\d.]+)", expand=False),
+                                errors="coerce")
+    return df
+
+
+def build_frame(nutrition_path: str = DATA_PATH, prices_path: str = PRICES_PATH):
+    """검증·병합한 카탈로그 DataFrame과 보고서 dict 반환 (문제가 있으면 CatalogValidationError)"""
+    problems = []
+    nutrition = _read_source(nutrition_path, list(NUMERIC_COLUMNS), problems)
+    prices = _read_source(prices_path, SHARED_COLUMNS, problems) if os.path.exists(prices_path) else None
+    if problems:
+        raise CatalogValidationError(problems)
+
+    report = {"rows": len(nutrition), "price_checked": 0, "without_price_row": len(nutrition), "price_only": []}
+    if prices is not None:
+        merged = nutrition.reset_index().merge(prices.reset_index(), on=KEY_COLUMNS, how="outer",
+                                               suffixes=("", "_prices"), indicator=True)
+        both = merged[merged["_merge"] == "both"]
+        for col in SHARED_COLUMNS:
+            for _, row in both[both[col] != both[f"{col}_prices"]].iterrows():
+                problems.append(f"{os.path.basename(prices_path)}:{int(row['index_prices'])} ({row['카테고리']}, "
+                                f"{row['메뉴']}) {col} {row[f'{col}_prices']:g} ≠ 영양 CSV {row[col]:g}")
+        if problems:
+            raise CatalogValidationError(problems)
+        price_only = merged[merged["_merge"] == "right_only"]
+        report.update(price_checked=len(both), without_price_row=len(nutrition) - len(both),
+                      price_only=[f"{c} / {m}" for c, m in zip(price_only["카테고리"], price_only["메뉴"])])
+
+    frame = nutrition.reset_index(drop=True)
+    frame[list(NUMERIC_COLUMNS)] = frame[list(NUMERIC_COLUMNS)].astype("float64")
+    return frame, report
+
+
+def build_artifact(out: str = CATALOG_PATH, nutrition_path: str = DATA_PATH, prices_path: str = PRICES_PATH) -> dict:
+    """검증·병합 후 Arrow IPC 파일로 저장 (임시 파일에 쓰고 교체 → 읽는 프로세스가 반쯤 쓴 파일을 보지 않음)"""
+    import pyarrow as pa
+    frame, report = build_frame(nutrition_path, prices_path)
+    sources = {name: {"file": os.path.basename(path), "sha256": file_sha256(path)}
+               for name, path in (("nutrition", nutrition_path), ("prices", prices_path)) if os.path.exists(path)}
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({
+        "hamhowmany.schema":   SCHEMA_VERSION,
+        "hamhowmany.sources":  json.dumps(sources, ensure_ascii=False),
+        "hamhowmany.built_at": datetime.now().isoformat(timespec="seconds"),
+        "hamhowmany.report":   json.dumps(report, ensure_ascii=False),
+    })
+    tmp = f"{out}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, out)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카탈로그 아티팩트 (Arrow) 빌드 / 확인")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    bld = sub.add_parser("build", help="CSV 검증·병합 → 아티팩트")
+    bld.add_argument("out", nargs="?", default=CATALOG_PATH)
+    chk = sub.add_parser("check", help="아티팩트가 원본 CSV로 만든 최신본인지 확인")
+    chk.add_argument("path", nargs="?", default=CATALOG_PATH)
+    inf = sub.add_parser("info", help="스키마 / 메타데이터")
+    inf.add_argument("path", nargs="?", default=CATALOG_PATH)
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        try:
+            report = build_artifact(args.out)
+        except CatalogValidationError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ {report['rows']}행 → {args.out} ({os.path.getsize(args.out):,} bytes)")
+        print(f"   가격 CSV와 대조 {report['price_checked']}행, 가격 CSV에 없는 메뉴 {report['without_price_row']}행")
+        if report["price_only"]:
+            print(f"   ⚠️ 가격 CSV에만 있어 제외 (영양 정보 없음) {len(report['price_only'])}행: "
+                  f"{', '.join(report['price_only'])}")
+    elif args.cmd == "check":
+        if not os.path.exists(args.path):
+            print(f"❌ {args.path} 없음 (python -m core.catalog_artifact build)")
+            sys.exit(1)
+        stale = stale_sources(read_artifact(args.path)[1])
+        if stale:
+            print(f"❌ 원본이 바뀜: {', '.join(stale)} (python -m core.catalog_artifact build)")
+            sys.exit(1)
+        print(f"✅ {args.path}이 원본 CSV와 일치")
+    else:
+        frame, meta = read_artifact(args.path)
+        print(f"{len(frame)}행 × {len(frame.columns)}열, 스키마 v{meta.get('hamhowmany.schema')}, "
+              f"빌드 {meta.get('hamhowmany.built_at')}")
+        print(frame.dtypes.to_string())
+        for name, src in json.loads(meta.get("hamhowmany.sources", "{}")).items():
+            print(f"{name}: {src['file']} sha256={src['sha256'][:12]}…")
+
+
+if __name__ == "__main__":
+    main()
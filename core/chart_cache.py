@@ -0,0 +1,107 @@
+"""차트 렌더링 캐시: 입력 데이터로 만든 키 → 렌더링된 PNG 바이트 (LRU)
+
+- 같은 데이터면 matplotlib를 다시 그리지 않고 바이트를 그대로 재사용 (30초 자동 새로고침 포함)
+- figure는 저장 직후 항상 닫아서 pyplot 레지스트리에 쌓이지 않게 함
+- 처음 그릴 때 한글 폰트를 등록 (프로세스당 한 번)
+- 폭이 st.image 최대 폭(1460px)을 넘지 않게 한 번만 줄여 두어 Streamlit이 매번 다시 인코딩하지 않음
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from core.fonts import setup_fonts
+from core.metrics import timed
+
+CHART_DPI       = 200
+MAX_CHART_WIDTH = 1460  # streamlit.elements.image.MAXIMUM_CONTENT_WIDTH
+
+
+def chart_key(*parts) -> str:
+    """차트 입력(문자열, 숫자, 배열, Series)으로 안정적인 해시 키 생성"""
+    h = hashlib.sha1()
+    for part in parts:
+        if hasattr(part, "index") and hasattr(part, "to_numpy"):  # pandas Series / DataFrame
+            h.update(repr(list(part.index)).encode())
+            part = part.to_numpy()
+        if isinstance(part, np.ndarray):
+            h.update(str(part.dtype).encode() + repr(part.shape).encode())
+            h.update(np.ascontiguousarray(part).tobytes() if part.dtype != object else repr(part.tolist()).encode())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class ChartCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock  = threading.Lock()
+        # pyplot은 스레드 안전하지 않아서 그리는 동안은 한 세션만
+        self._render_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def render(self, key: str, draw) -> bytes:
+        """key에 해당하는 PNG 바이트. 없으면 draw()로 figure를 만들어 저장 후 닫음"""
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                self._stats["hits"] += 1
+                return data
+            self._stats["misses"] += 1
+
+        import matplotlib.pyplot as plt
+        setup_fonts()
+        with self._render_lock, timed("chart.render"):
+            fig = draw()
+            try:
+                buf = io.BytesIO()
+                fig.savefig(buf, format="png", dpi=CHART_DPI, bbox_inches="tight")
+            finally:
+                plt.close(fig)
+        data = _fit_width(buf.getvalue())
+
+        with self._lock:
+            self._items[key] = data
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self._stats["evictions"] += 1
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                entries=len(self._items),
+                bytes=sum(len(v) for v in self._items.values()),
+                hit_rate=self._stats["hits"] / total if total else None,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _fit_width(png: bytes) -> bytes:
+    from PIL import Image
+    im = Image.open(io.BytesIO(png))
+    if im.width <= MAX_CHART_WIDTH:
+        return png
+    im = im.resize((MAX_CHART_WIDTH, round(im.height * MAX_CHART_WIDTH / im.width)), Image.LANCZOS)
+    buf = io.BytesIO()
+    im.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+_chart_cache = ChartCache()
+
+
+def get_chart_cache() -> ChartCache:
+    """프로세스 전역 차트 캐시"""
+    return _chart_cache
@@ -0,0 +1,150 @@
+"""세트 조합 추천: 버거 + 사이드 + 음료 + 디저트 조합 중 예산/영양 상한 안에서 점수가 높은 조합 찾기
+
+전체 곱집합을 만들지 않고
+  1) 카테고리별로 N개 이상의 메뉴에게 지배되는(점수↑ 가격↓ 영양↓ 모두 밀리는) 메뉴를 미리 제거하고
+  2) 남은 후보를 점수순으로 훑는 분기 한정(branch and bound)으로 상위 N개 조합만 탐색
+"""
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+from core.catalog import get_catalog
+from core.scoring import get_scoring_engine
+
+# (슬롯 이름, 카테고리)
+COMBO_SLOTS = [
+    ("버거",   "버거 & 세트"),
+    ("사이드", "스낵 & 사이드"),
+    ("음료",   "음료"),
+    ("디저트", "디저트"),
+]
+
+TOTAL_COLUMNS = ["칼로리(Kcal)", "단백질", "지방", "나트륨", "당류"]
+
+Combo = namedtuple("Combo", ["rows", "score", "price", "totals"])
+
+
+def _dominance_pruned(rows, score, costs, n, block=256):
+    """다른 후보 n개 이상에게 지배되는 후보를 제거 (상위 n개 조합에는 절대 들어갈 수 없음)
+
+    costs: (후보 수, 비용 축 수) — 가격과 상한이 걸린 영양소, 작을수록 좋음
+    지배 관계는 추이적이라 "살아남은 후보 중 지배자 수 < n" 만 확인하면 충분하고,
+    (점수 내림차순, 비용 합 오름차순)으로 훑으면 지배자가 항상 먼저 나옴
+    """
+    m = len(rows)
+    if m <= n:
+        return rows
+    order = np.lexsort((np.arange(m), costs.sum(axis=1), -score))
+    kept  = np.empty(0, dtype=np.int64)
+    for start in range(0, m, block):
+        b = order[start:start + block]
+        # 앞선 블록에서 살아남은 후보 + 같은 블록의 앞 순서 후보 중 지배자 수
+        # (둘 다 세도 "지배자 수 >= n" 판정 결과는 같음)
+        cand = np.concatenate([kept, b])
+        dom  = score[cand][None, :] >= score[b][:, None]
+        for col in costs.T:
+            dom &= col[cand][None, :] <= col[b][:, None]
+        dom[:, len(kept):] &= np.tri(len(b), k=-1, dtype=bool)
+        kept = np.concatenate([kept, b[np.count_nonzero(dom, axis=1) < n]])
+    return rows[np.sort(kept)]
+
+
+class ComboOptimizer:
+    """카탈로그 버전마다 하나씩 만들어 두고 선호도/예산/상한만 바꿔 가며 조회"""
+
+    def __init__(self, catalog, slots=COMBO_SLOTS):
+        self.catalog = catalog
+        self.slots   = [(name, catalog.category_rows.get(cat, np.empty(0, dtype=np.int64))) for name, cat in slots]
+
+    def top_combos(self, weights, budget: float = 0, caps: dict = None, n: int = 5,
+                   slots=None, scores=None) -> list:
+        """점수 합이 높은 조합 상위 n개 (점수 내림차순)
+
+        weights: 점수 엔진 선호도 dict, budget: 0이면 예산 제한 없음,
+        caps: {"칼로리(Kcal)": 1200, "나트륨": 2000} 처럼 한 끼 합계 상한,
+        slots: 조합에 넣을 슬롯 이름 목록 (None이면 전체)
+        """
+        caps   = caps or {}
+        score  = get_scoring_engine().score(weights) if scores is None else scores
+        budget = budget if budget and budget > 0 else np.inf
+        limits = np.array([budget] + list(caps.values()), dtype=np.float64)
+        costs  = np.column_stack([self.catalog.price] + [self.catalog.values(c) for c in caps])
+
+        # 1) 슬롯별 후보: 단독으로 한도를 넘는 메뉴 제외 → 지배 관계로 가지치기 → 점수순 정렬
+        use   = [s for s in self.slots if slots is None or s[0] in slots]
+        slots = []
+        for i, (_, rows) in enumerate(use):
+            if len(rows) == 0:
+                continue
+            rows = rows[np.all(costs[rows] <= limits, axis=1)]
+            rows = _dominance_pruned(rows, score[rows], costs[rows], n)
+            if len(rows) == 0:
+                return []
+            slots.append((i, rows[np.argsort(-score[rows], kind="stable")]))
+        if not slots:
+            return []
+        # 후보가 적은 슬롯부터 탐색해야 위쪽 분기가 적음
+        slots.sort(key=lambda s: len(s[1]))
+        slot_ids = [i for i, _ in slots]
+        slots    = [rows for _, rows in slots]
+
+        # 2) 남은 슬롯들로 얻을 수 있는 최대 점수 / 최소 비용 (가지치기 한계값)
+        k = len(slots)
+        best_rest = np.zeros(k + 1)
+        min_rest  = np.zeros((k + 1, len(limits)))
+        for d in range(k - 1, -1, -1):
+            best_rest[d] = best_rest[d + 1] + score[slots[d][0]]
+            min_rest[d]  = min_rest[d + 1] + costs[slots[d]].min(axis=0)
+
+        heap = []  # (점수, 행 튜플) 최소 힙 — 현재까지의 상위 n개
+        picked = []
+        slot_scores = [score[rows] for rows in slots]
+        slot_costs  = [costs[rows] for rows in slots]
+
+        def push(total, rows):
+            item = (total, rows)
+            if len(heap) < n:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        def search(d, cur_score, cur_cost):
+            if d == k - 1:
+                # 마지막 슬롯(후보가 가장 많음)은 반복문 대신 한 번에 계산
+                totals = cur_score + slot_scores[d]
+                ok = np.all(cur_cost + slot_costs[d] <= limits, axis=1)
+                if len(heap) == n:
+                    ok &= totals > heap[0][0]
+                cand = np.flatnonzero(ok)
+                if len(cand) > n:
+                    cand = cand[np.argpartition(-totals[cand], n - 1)[:n]]
+                for c in cand:
+                    push(float(totals[c]), tuple(picked) + (int(slots[d][c]),))
+                return
+            for j, r in enumerate(slots[d]):
+                s = cur_score + slot_scores[d][j]
+                # 후보가 점수순이라 한계 점수가 상위 n개 최저점 이하이면 이후 후보도 모두 불가
+                if len(heap) == n and s + best_rest[d + 1] <= heap[0][0]:
+                    break
+                c = cur_cost + slot_costs[d][j]
+                if np.any(c + min_rest[d + 1] > limits):
+                    continue
+                picked.append(int(r))
+                search(d + 1, s, c)
+                picked.pop()
+
+        search(0, 0.0, np.zeros(len(limits)))
+
+        combos = []
+        for total, rows in sorted(heap, reverse=True):
+            # 탐색 순서 → COMBO_SLOTS 순서(버거, 사이드, 음료, 디저트)로 되돌림
+            rows = [int(r) for _, r in sorted(zip(slot_ids, rows))]
+            totals = {c: float(self.catalog.values(c)[rows].sum()) for c in TOTAL_COLUMNS}
+            combos.append(Combo(tuple(rows), float(total), float(self.catalog.price[rows].sum()), totals))
+        return combos
+
+
+def get_combo_optimizer() -> ComboOptimizer:
+    """현재 카탈로그 버전에 묶인 조합 탐색기"""
+    return get_catalog().derived("combo", ComboOptimizer)
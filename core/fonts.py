@@ -0,0 +1,32 @@
+"""matplotlib 한글 폰트 등록 (프로세스당 한 번만)"""
+import os
+import threading
+
+from core.catalog import BASE_DIR
+
+FONT_PATH = os.path.join(BASE_DIR, "assets", "fonts", "NanumGothic.ttf")
+
+_done = False
+_lock = threading.Lock()
+
+
+def setup_fonts():
+    """NanumGothic을 matplotlib에 등록. 이미 등록했으면 아무것도 하지 않음"""
+    global _done
+    if _done:
+        return
+    with _lock:
+        if _done:
+            return
+        import matplotlib.pyplot as plt
+        import matplotlib.font_manager as fm
+
+        if os.path.exists(FONT_PATH):
+            fm.fontManager.addfont(FONT_PATH)
+            nanum_font = fm.FontProperties(fname=FONT_PATH)
+            plt.rcParams["font.family"] = nanum_font.get_name()
+            print(f"✅ matplotlib에 폰트 직접 등록: {nanum_font.get_name()}")
+        else:
+            print("❌ NanumGothic.ttf 경로를 찾을 수 없습니다.")
+        plt.rcParams["axes.unicode_minus"] = False
+        _done = True
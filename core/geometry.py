@@ -0,0 +1,88 @@
+"""경로 좌표 단순화 (Douglas-Peucker) + 지도 줌에 맞춘 허용 오차
+
+좌표는 (n, 2) numpy 배열 [[위도, 경도], ...]로 다룸
+허용 오차는 "해당 줌에서 화면 1픽셀이 몇 m인지" 기준 → 화면에서 구분되지 않는 점만 제거
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M   = 6371008.8
+TILE_M_PER_PIXEL = 156543.03392  # 줌 0, 적도에서 256px 타일 1픽셀의 길이 (m)
+
+
+def meters_per_pixel(zoom: float, lat: float) -> float:
+    return TILE_M_PER_PIXEL * math.cos(math.radians(lat)) / (2 ** zoom)
+
+
+def tolerance_for_zoom(zoom: float, lat: float, pixels: float = 1.0) -> float:
+    """줌에서 pixels 픽셀에 해당하는 허용 오차 (m)"""
+    return pixels * meters_per_pixel(zoom, lat)
+
+
+def zoom_for_span(span_m: float, lat: float, view_px: int = 500, lo: int = 10, hi: int = 16) -> int:
+    """span_m 거리가 view_px 픽셀 안에 들어오는 가장 큰 줌 (lo~hi 사이)"""
+    if span_m <= 0:
+        return hi
+    zoom = math.floor(math.log2(TILE_M_PER_PIXEL * math.cos(math.radians(lat)) * view_px / span_m))
+    return max(lo, min(hi, zoom))
+
+
+def to_local_xy(coords: np.ndarray) -> np.ndarray:
+    """위도/경도 → 첫 점 기준 평면 좌표 (m, 등장방형 근사 — 수십 km 범위에서 충분)"""
+    lat0 = math.radians(float(coords[0, 0]))
+    rad  = np.radians(coords)
+    x = (rad[:, 1] - rad[0, 1]) * math.cos(lat0) * EARTH_RADIUS_M
+    y = (rad[:, 0] - rad[0, 0]) * EARTH_RADIUS_M
+    return np.column_stack([x, y])
+
+
+def radius_m(origin, coords) -> float:
+    """origin(위도, 경도)에서 가장 먼 좌표까지의 거리 (m)"""
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if not len(coords):
+        return 0.0
+    xy = to_local_xy(np.vstack([np.asarray(origin, dtype=np.float64), coords]))
+    return float(np.hypot(xy[1:, 0], xy[1:, 1]).max())
+
+
+def douglas_peucker(coords, tolerance_m: float) -> np.ndarray:
+    """허용 오차(m) 안에서 선 모양을 유지하며 점을 줄인 좌표 배열
+
+    재귀 대신 스택을 쓰고, 구간마다 선분까지의 거리는 한 번에 벡터 계산
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    if n <= 2 or tolerance_m <= 0:
+        return coords
+    xy   = to_local_xy(coords)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        seg  = xy[last] - xy[first]
+        pts  = xy[first + 1:last] - xy[first]
+        norm = math.hypot(seg[0], seg[1])
+        if norm == 0:  # 되돌아오는 경로(시작=끝)는 시작점까지의 거리
+            dist = np.hypot(pts[:, 0], pts[:, 1])
+        else:
+            dist = np.abs(seg[0] * pts[:, 1] - seg[1] * pts[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance_m:
+            split = first + 1 + i
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return coords[keep]
+
+
+def simplify_for_zoom(coords, zoom: float, pixels: float = 1.0) -> np.ndarray:
+    """지도 줌에서 pixels 픽셀보다 작은 굴곡은 없앤 좌표"""
+    coords = np.asarray(coords, dtype=np.float64)
+    if len(coords) <= 2:
+        return coords
+    lat = float(coords[:, 0].mean())
+    return douglas_peucker(coords, tolerance_for_zoom(zoom, lat, pixels))
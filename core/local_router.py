@@ -0,0 +1,393 @@
+"""로컬 도로 그래프 라우터 (네트워크 없이 경로 계산)
+
+그래프 파일(.npz): 배열 기반 CSR 인접 리스트
+    lat, lon  : 노드 좌표 (float64)
+    indptr    : 노드 i의 간선은 indices[indptr[i]:indptr[i+1]] (int32)
+    indices   : 간선 도착 노드 (int32)
+    weights   : 간선 길이 m (float32)
+
+- route(): 출발점에서 도로 거리(네트워크 거리)가 distance_km에 가장 가깝고 방향이 bearing에 가까운
+  노드까지의 최단 경로 → 도착점이 항상 도로 위에 있고 경로 길이가 계산한 거리와 거의 같음
+- loop(): 출발점으로 돌아오는 삼각형 코스 (경유지 2개, A*로 연결, 길이가 맞도록 반경 보정)
+- 출발점에서 가장 가까운 노드가 max_snap_m(LOCAL_ROUTER_MAX_SNAP_M, 기본 300m)보다 멀면 그래프 범위 밖 → None
+  (호출하는 쪽에서 ORS 등으로 대체)
+
+    LOCAL_ROAD_GRAPH=data/sample_road_graph.npz streamlit run main.py   # ORS 대신 로컬 라우터
+    python -m core.local_router convert seoul.osm data/seoul_walk.npz   # OSM XML → 그래프 파일
+    python -m core.local_router sample                                  # 샘플 격자 그래프 생성
+    python -m core.local_router info data/sample_road_graph.npz
+"""
+import argparse
+import heapq
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from core.catalog import BASE_DIR
+from core.metrics import observe
+from core.routing import EMPTY_COORDS, Route, route_key
+
+SAMPLE_GRAPH_PATH = os.path.join(BASE_DIR, "data", "sample_road_graph.npz")
+EARTH_RADIUS_M    = 6371008.8
+MAX_SNAP_M        = float(os.getenv("LOCAL_ROUTER_MAX_SNAP_M", "300"))
+
+# 걸어서 다닐 수 있는 OSM highway 값
+WALKABLE_HIGHWAYS = {
+    "primary", "primary_link", "secondary", "secondary_link", "tertiary", "tertiary_link",
+    "unclassified", "residential", "living_street", "service", "pedestrian", "footway",
+    "path", "steps", "track", "cycleway", "road",
+}
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """두 점(또는 배열) 사이 대원 거리 (m)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """lat1/lon1에서 본 lat2/lon2의 방위각 (0=북, 90=동)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    y = np.sin(lon2 - lon1) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def offset_point(lat, lon, bearing, distance_m):
+    """(lat, lon)에서 bearing 방향으로 distance_m 떨어진 점 (구면 근사)"""
+    d, b = distance_m / EARTH_RADIUS_M, math.radians(bearing)
+    p1, l1 = math.radians(lat), math.radians(lon)
+    p2 = math.asin(math.sin(p1) * math.cos(d) + math.cos(p1) * math.sin(d) * math.cos(b))
+    l2 = l1 + math.atan2(math.sin(b) * math.sin(d) * math.cos(p1), math.cos(d) - math.sin(p1) * math.sin(p2))
+    return math.degrees(p2), math.degrees(l2)
+
+
+class RoadGraph:
+    def __init__(self, lat, lon, indptr, indices, weights):
+        self.lat     = np.asarray(lat, dtype=np.float64)
+        self.lon     = np.asarray(lon, dtype=np.float64)
+        self.indptr  = np.asarray(indptr, dtype=np.int32)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        # 탐색 루프는 파이썬 리스트가 numpy 스칼라 접근보다 훨씬 빠름
+        self._ptr, self._adj, self._w = self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()
+        self._lat_l, self._lon_l = self.lat.tolist(), self.lon.tolist()
+
+    @classmethod
+    def from_edges(cls, lat, lon, src, dst, undirected: bool = True) -> "RoadGraph":
+        """간선 목록(노드 번호 쌍) → CSR. 길이는 좌표로 계산"""
+        src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+        if undirected:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        keep = src != dst
+        src, dst = src[keep], dst[keep]
+        lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+        weights = haversine_m(lat[src], lon[src], lat[dst], lon[dst]).astype(np.float32)
+        order   = np.lexsort((dst, src))
+        src, dst, weights = src[order], dst[order], weights[order]
+        indptr = np.zeros(len(lat) + 1, dtype=np.int64)
+        np.add.at(indptr, src + 1, 1)
+        return cls(lat, lon, np.cumsum(indptr), dst, weights)
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        with np.load(path) as z:
+            return cls(z["lat"], z["lon"], z["indptr"], z["indices"], z["weights"])
+
+    def save(self, path: str):
+        np.savez_compressed(path, lat=self.lat, lon=self.lon, indptr=self.indptr,
+                            indices=self.indices, weights=self.weights)
+
+    def __len__(self):
+        return len(self.lat)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def nearest(self, lat: float, lon: float) -> int:
+        """좌표에서 가장 가까운 노드 (등장방형 근사, 전체 벡터 연산)"""
+        dx = (self.lon - lon) * math.cos(math.radians(lat))
+        dy = self.lat - lat
+        return int(np.argmin(dx * dx + dy * dy))
+
+    def path_length(self, path: list) -> float:
+        """노드 경로의 길이 (m)"""
+        if len(path) < 2:
+            return 0.0
+        p = np.asarray(path)
+        return float(haversine_m(self.lat[p[:-1]], self.lon[p[:-1]], self.lat[p[1:]], self.lon[p[1:]]).sum())
+
+    # ── 탐색 ───────────────────────────────────────────
+    def dijkstra(self, src: int, limit_m: float) -> tuple:
+        """src에서 limit_m 이내 노드들의 (거리 dict, 이전 노드 dict)"""
+        ptr, adj, w = self._ptr, self._adj, self._w
+        dist, prev = {src: 0.0}, {src: -1}
+        heap, done = [(0.0, src)], set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            for k in range(ptr[u], ptr[u + 1]):
+                v, nd = adj[k], d + w[k]
+                if nd <= limit_m and nd < dist.get(v, math.inf):
+                    dist[v], prev[v] = nd, u
+                    heapq.heappush(heap, (nd, v))
+        return dist, prev
+
+    def astar(self, src: int, dst: int) -> list:
+        """src → dst 최단 경로 노드 리스트 (없으면 빈 리스트). 휴리스틱: 대원 거리"""
+        if src == dst:
+            return [src]
+        ptr, adj, w = self._ptr, self._adj, self._w
+        lat_l, lon_l = self._lat_l, self._lon_l
+        # 휴리스틱은 필요한 노드만 계산 (대원 거리 ≤ 도로 길이 → 허용 가능)
+        tlat, tlon = lat_l[dst], lon_l[dst]
+        cos_lat = math.cos(math.radians(tlat))
+        scale   = math.radians(1) * EARTH_RADIUS_M
+
+        def h(v):
+            dx, dy = (lon_l[v] - tlon) * cos_lat, lat_l[v] - tlat
+            return math.sqrt(dx * dx + dy * dy) * scale * 0.995  # 등장방형 근사 오차 여유
+
+        g, prev = {src: 0.0}, {src: -1}
+        heap, done = [(h(src), src)], set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u == dst:
+                return _unwind(prev, dst)
+            if u in done:
+                continue
+            done.add(u)
+            gu = g[u]
+            for k in range(ptr[u], ptr[u + 1]):
+                v, ng = adj[k], gu + w[k]
+                if ng < g.get(v, math.inf):
+                    g[v], prev[v] = ng, u
+                    heapq.heappush(heap, (ng + h(v), v))
+        return []
+
+
+def _unwind(prev: dict, node: int) -> list:
+    path = []
+    while node != -1:
+        path.append(node)
+        node = prev[node]
+    return path[::-1]
+
+
+class LocalRouter:
+    """core.routing.RouteClient와 같은 인터페이스 (route / prefetch / stats) + loop"""
+
+    def __init__(self, graph: RoadGraph, max_entries: int = 256, bearing_weight: float = 0.5,
+                 max_snap_m: float = MAX_SNAP_M):
+        self.graph          = graph
+        self.max_snap_m     = max_snap_m      # 출발점 → 가장 가까운 노드 허용 거리 (넘으면 범위 밖)
+        self.max_entries    = max_entries
+        self.bearing_weight = bearing_weight  # 거리 오차 1(=100%)과 방향 오차 180°의 상대 가중치
+        self._items = OrderedDict()
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocalRouter":
+        return cls(RoadGraph.load(path))
+
+    def route(self, lat: float, lon: float, bearing: float, distance_km: float,
+              profile: str = "foot-walking") -> Route:
+        """도로 거리가 distance_km에 가장 가깝고 bearing 방향인 지점까지의 경로 (그래프 범위 밖이면 None)"""
+        return self._cached(("out",) + route_key(profile, lat, lon, bearing, distance_km), self._route)
+
+    def loop(self, lat: float, lon: float, bearing: float, distance_km: float,
+             profile: str = "foot-walking") -> Route:
+        """bearing 쪽으로 나갔다가 출발점으로 돌아오는 코스 (전체 길이 ≈ distance_km, 그래프 범위 밖이면 None)"""
+        return self._cached(("loop",) + route_key(profile, lat, lon, bearing, distance_km), self._loop)
+
+    def prefetch(self, lat, lon, bearings, distance_km, profile="foot-walking") -> int:
+        return 0  # 로컬 계산이라 미리 받을 필요 없음
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats, entries=len(self._items), nodes=len(self.graph), edges=self.graph.n_edges)
+        lookups = s["hits"] + s["misses"]
+        s["hit_rate"] = s["hits"] / lookups if lookups else None
+        s["avg_ms"]   = s["total_ms"] / s["misses"] if s["misses"] else None
+        return s
+
+    # ── 내부 ───────────────────────────────────────────
+    def _cached(self, key: tuple, compute) -> Route:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._items[key]
+        start = time.perf_counter()
+        _, _, lat, lon, bearing, distance_km = key
+        route = compute(lat, lon, bearing, distance_km * 1000)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        observe(f"local_router.{key[0]}", elapsed_ms)
+        with self._lock:
+            self._items[key] = route
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+            self._stats["misses"]  += 1
+            self._stats["total_ms"] += elapsed_ms
+            self._stats["max_ms"]    = max(self._stats["max_ms"], elapsed_ms)
+        return route
+
+    def _snap(self, lat: float, lon: float):
+        """출발점에서 가장 가까운 노드. max_snap_m보다 멀면 None"""
+        g = self.graph
+        node = g.nearest(lat, lon)
+        if haversine_m(lat, lon, g.lat[node], g.lon[node]) > self.max_snap_m:
+            return None
+        return node
+
+    def _as_route(self, path: list, lat: float, lon: float) -> Route:
+        g = self.graph
+        if not path:
+            return Route((lat, lon), (lat, lon), EMPTY_COORDS)
+        coords = np.column_stack([g.lat[path], g.lon[path]])
+        return Route(tuple(coords[0].tolist()), tuple(coords[-1].tolist()), coords)
+
+    def _route(self, lat, lon, bearing, target_m) -> Route:
+        g   = self.graph
+        src = self._snap(lat, lon)
+        if src is None:
+            return None
+        dist, prev = g.dijkstra(src, target_m * 1.2)
+        nodes = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+        if len(nodes) < 2:
+            return self._as_route([], lat, lon)
+        d   = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+        brg = initial_bearing(g.lat[src], g.lon[src], g.lat[nodes], g.lon[nodes])
+        off = np.abs((brg - bearing + 180) % 360 - 180) / 180
+        cost = np.abs(d - target_m) / target_m + self.bearing_weight * off
+        cost[nodes == src] = np.inf
+        return self._as_route(_unwind(prev, int(nodes[np.argmin(cost)])), lat, lon)
+
+    def _loop(self, lat, lon, bearing, target_m) -> Route:
+        """출발 → 경유지 A(bearing−spread) → 경유지 B(bearing+spread) → 출발
+
+        삼각형 둘레가 target_m이 되도록 반경을 보정하고, 도로망에 따라 벌림 각도도 몇 가지 시도
+        """
+        g   = self.graph
+        src = self._snap(lat, lon)
+        if src is None:
+            return None
+        s_lat, s_lon = float(g.lat[src]), float(g.lon[src])
+        best, best_err = [], math.inf
+        for spread in (30, 20, 45):
+            # 이등변 삼각형 둘레 = 2r + 2r·sin(spread)
+            radius = target_m / (2 + 2 * math.sin(math.radians(spread)))
+            for _ in range(4):  # 도로가 직선보다 길어지는 만큼 반경을 줄여가며 맞춤
+                a = g.nearest(*offset_point(s_lat, s_lon, bearing - spread, radius))
+                b = g.nearest(*offset_point(s_lat, s_lon, bearing + spread, radius))
+                legs = [g.astar(src, a), g.astar(a, b), g.astar(b, src)]
+                if not all(legs):
+                    break
+                path   = legs[0] + legs[1][1:] + legs[2][1:]
+                length = g.path_length(path)
+                err    = abs(length - target_m) / target_m
+                if err < best_err:
+                    best, best_err = path, err
+                if length == 0 or err < 0.03:
+                    break
+                radius *= target_m / length
+            if best_err < 0.03:
+                break
+        route = self._as_route(best, lat, lon)
+        return route._replace(end=route.start)
+
+
+# ── 그래프 파일 만들기 ─────────────────────────────────
+def convert_osm(osm_path: str) -> RoadGraph:
+    """OSM XML(.osm)에서 걸을 수 있는 길만 뽑아 그래프로 변환"""
+    import xml.etree.ElementTree as ET
+
+    coords, ways = {}, []
+    for _, elem in ET.iterparse(osm_path, events=("end",)):
+        if elem.tag == "node":
+            coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+            elem.clear()
+        elif elem.tag == "way":
+            tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+            if tags.get("highway") in WALKABLE_HIGHWAYS and tags.get("foot") != "no" and tags.get("access") != "private":
+                ways.append([int(nd.get("ref")) for nd in elem.iter("nd")])
+            elem.clear()
+
+    used = sorted({ref for way in ways for ref in way if ref in coords})
+    index = {osm_id: i for i, osm_id in enumerate(used)}
+    src, dst = [], []
+    for way in ways:
+        refs = [index[r] for r in way if r in index]
+        src.extend(refs[:-1])
+        dst.extend(refs[1:])
+    lat = [coords[i][0] for i in used]
+    lon = [coords[i][1] for i in used]
+    return RoadGraph.from_edges(lat, lon, src, dst)
+
+
+def sample_graph(lat: float = 37.5665, lon: float = 126.9780, size: int = 60,
+                 spacing_m: float = 120.0, seed: int = 7) -> RoadGraph:
+    """출발점 주변 격자 도로망 (좌표를 조금 흔들고 일부 도로를 끊어서 실제 도로처럼)"""
+    rng = np.random.default_rng(seed)
+    ii, jj = np.meshgrid(np.arange(size), np.arange(size), indexing="ij")
+    dlat = spacing_m / (math.radians(1) * EARTH_RADIUS_M)
+    dlon = dlat / math.cos(math.radians(lat))
+    half = (size - 1) / 2
+    node_lat = lat + (ii - half + rng.uniform(-0.2, 0.2, ii.shape)) * dlat
+    node_lon = lon + (jj - half + rng.uniform(-0.2, 0.2, jj.shape)) * dlon
+    node = np.arange(size * size).reshape(size, size)
+    src = np.concatenate([node[:, :-1].ravel(), node[:-1, :].ravel()])
+    dst = np.concatenate([node[:, 1:].ravel(), node[1:, :].ravel()])
+    keep = rng.random(len(src)) > 0.12
+    return RoadGraph.from_edges(node_lat.ravel(), node_lon.ravel(), src[keep], dst[keep])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 도로 그래프 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="OSM XML → 그래프 파일(.npz)")
+    conv.add_argument("osm")
+    conv.add_argument("out")
+    smp = sub.add_parser("sample", help="샘플 격자 그래프 생성")
+    smp.add_argument("out", nargs="?", default=SAMPLE_GRAPH_PATH)
+    inf = sub.add_parser("info", help="그래프 정보와 예시 경로")
+    inf.add_argument("path", nargs="?", default=SAMPLE_GRAPH_PATH)
+    args = parser.parse_args()
+
+    if args.cmd == "convert":
+        graph = convert_osm(args.osm)
+        graph.save(args.out)
+        print(f"✅ 노드 {len(graph):,}개, 간선 {graph.n_edges:,}개 → {args.out}")
+    elif args.cmd == "sample":
+        graph = sample_graph()
+        graph.save(args.out)
+        print(f"✅ 샘플 그래프: 노드 {len(graph):,}개, 간선 {graph.n_edges:,}개 → {args.out}")
+    else:
+        router = LocalRouter.from_file(args.path)
+        g = router.graph
+        print(f"노드 {len(g):,}개, 간선 {g.n_edges:,}개")
+        lat, lon = float(np.median(g.lat)), float(np.median(g.lon))
+        for km in (1.0, 3.0):
+            out, loop = router.route(lat, lon, 90, km), router.loop(lat, lon, 90, km)
+            print(f"{km:.1f}km → 편도 {_length_km(out):.2f}km ({len(out.coords)}점), 왕복 {_length_km(loop):.2f}km ({len(loop.coords)}점)")
+        print(router.stats())
+
+
+def _length_km(route: Route) -> float:
+    if len(route.coords) < 2:
+        return 0.0
+    c = np.asarray(route.coords)
+    return float(haversine_m(c[:-1, 0], c[:-1, 1], c[1:, 0], c[1:, 1]).sum() / 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""오프라인 운동 소모 칼로리 계산 (MET × 기초대사량)
+
+- 기초대사량(BMR): Mifflin-St Jeor 공식
+    남성 10×체중 + 6.25×신장 − 5×나이 + 5 / 여성 … − 161   (kcal/일)
+- 분당 소모 칼로리 = MET × BMR / 1440
+  (1 MET = 안정 시 대사량이므로, 평균 체형에서는 흔히 쓰는 MET × 3.5 × 체중 / 200 과 거의 같음)
+- MET 값은 Compendium of Physical Activities 기준
+- 프로필/운동을 배열로 받아 모든 조합을 한 번에 계산 (numpy 브로드캐스팅)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+Activity = namedtuple("Activity", "key label met speed_kmph query")
+
+# 지도에 거리로 그릴 수 있는 운동들 (query: Nutritionix 자연어 질의)
+ACTIVITIES = [
+    Activity("walking",       "걷기 🚶",        3.5,  5.0,  "walking"),
+    Activity("brisk_walking", "빠르게 걷기 🚶‍♂️", 4.3,  6.0,  "brisk walking"),
+    Activity("hiking",        "등산 🥾",        6.0,  4.0,  "hiking"),
+    Activity("jogging",       "조깅 🏃‍♀️",       7.0,  8.0,  "jogging"),
+    Activity("running",       "달리기 🏃",      9.8,  10.0, "running"),
+    Activity("cycling",       "자전거 🚴",      6.8,  16.0, "cycling"),
+]
+ACTIVITY_INDEX = {a.key: i for i, a in enumerate(ACTIVITIES)}
+METS           = np.array([a.met for a in ACTIVITIES])
+SPEEDS_KMPH    = np.array([a.speed_kmph for a in ACTIVITIES])
+
+MALE_LABELS = {"남성", "male", "m", "M"}
+
+
+def bmr(gender, age, weight_kg, height_cm) -> np.ndarray:
+    """Mifflin-St Jeor 기초대사량 (kcal/일). 인자는 스칼라나 같은 모양의 배열"""
+    male = np.isin(np.asarray(gender, dtype=object), list(MALE_LABELS))
+    base = 10.0 * np.asarray(weight_kg, float) + 6.25 * np.asarray(height_cm, float) - 5.0 * np.asarray(age, float)
+    return base + np.where(male, 5.0, -161.0)
+
+
+def burn_rates(gender, age, weight_kg, height_cm, mets=METS) -> np.ndarray:
+    """분당 소모 칼로리 행렬: 모양 (프로필 수, 운동 수). 스칼라 프로필이면 (운동 수,)"""
+    per_min = np.atleast_1d(bmr(gender, age, weight_kg, height_cm)) / 1440.0
+    rates = per_min[:, None] * np.asarray(mets, float)[None, :]
+    return rates[0] if np.ndim(age) == 0 else rates
+
+
+def burn_rate(activity: str, profile: dict) -> float:
+    """운동 하나의 분당 소모 칼로리 (profile: gender, age, weight_kg, height_cm)"""
+    met = ACTIVITIES[ACTIVITY_INDEX[activity]].met
+    return float(burn_rates(profile["gender"], profile["age"], profile["weight_kg"], profile["height_cm"], [met])[0])
+
+
+def burn_rate_table(profile: dict) -> dict:
+    """프로필 하나에 대해 모든 운동의 분당 소모 칼로리 {운동 key: kcal/분}"""
+    rates = burn_rates(profile["gender"], profile["age"], profile["weight_kg"], profile["height_cm"])
+    return {a.key: float(r) for a, r in zip(ACTIVITIES, rates)}
+
+
+def time_and_distance(kcal, rate_per_min, speed_kmph):
+    """kcal을 태우는 데 걸리는 시간(분)과 그 시간 동안 이동 거리(km). 배열도 가능"""
+    minutes = np.asarray(kcal, float) / np.asarray(rate_per_min, float)
+    return minutes, np.asarray(speed_kmph, float) * minutes / 60.0
@@ -0,0 +1,180 @@
+"""지연 시간 히스토그램 + 호출 수 + 이벤트 카운터 (프로세스 전역 / 세션별)
+
+    with timed("ors.directions"):      # 또는 @timed("page.visual.run")
+        ...
+    incr("votes.admission.duplicate")  # 지연 시간 없이 횟수만 세는 이벤트
+
+- 모든 측정은 프로세스 레지스트리에 기록되고, 현재 스레드에 세션 레지스트리가 연결돼 있으면
+  (main.py가 rerun마다 bind_session으로 연결) 그 세션에도 같이 기록
+- 버킷은 고정(ms)이라 기록은 O(버킷 수), 메모리는 연산 이름 수에 비례
+- to_json / to_prometheus로 내보내기 (진단 페이지, 외부 수집기)
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import ContextDecorator, contextmanager
+
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+METRIC_PREFIX = "hamhowmany"
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "errors", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)  # 마지막 칸은 +Inf
+        self.count  = 0
+        self.errors = 0
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def observe(self, ms: float, error: bool = False):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantile(self, q: float):
+        """버킷 안에서 선형 보간한 근사 분위수 (ms)"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BUCKETS_MS[i - 1] if i else 0.0
+                hi = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count, "errors": self.errors,
+            "avg_ms": self.total / self.count if self.count else None,
+            "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95), "p99_ms": self.quantile(0.99),
+            "max_ms": self.max, "sum_ms": self.total,
+            "buckets": dict(zip([*map(str, BUCKETS_MS), "+Inf"], self.counts)),
+        }
+
+
+class Registry:
+    def __init__(self):
+        self._hists    = {}
+        self._counters = {}
+        self._lock     = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, op: str, ms: float, error: bool = False):
+        with self._lock:
+            hist = self._hists.get(op)
+            if hist is None:
+                hist = self._hists[op] = Histogram()
+            hist.observe(ms, error)
+
+    def incr(self, event: str, n: int = 1):
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + n
+
+    def snapshot(self) -> dict:
+        """연산 이름 → 요약 dict"""
+        with self._lock:
+            return {op: h.summary() for op, h in sorted(self._hists.items())}
+
+    def counters(self) -> dict:
+        """이벤트 이름 → 횟수"""
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+
+_process = Registry()
+_session = contextvars.ContextVar("metrics_session", default=None)
+
+
+def process_registry() -> Registry:
+    return _process
+
+
+@contextmanager
+def bind_session(registry: Registry):
+    """이 블록 안(같은 스레드)의 측정을 세션 레지스트리에도 기록"""
+    token = _session.set(registry)
+    try:
+        yield registry
+    finally:
+        _session.reset(token)
+
+
+def observe(op: str, ms: float, error: bool = False):
+    _process.observe(op, ms, error)
+    session = _session.get()
+    if session is not None:
+        session.observe(op, ms, error)
+
+
+def incr(event: str, n: int = 1):
+    _process.incr(event, n)
+    session = _session.get()
+    if session is not None:
+        session.incr(event, n)
+
+
+class timed(ContextDecorator):
+    """with timed("op"): ... 또는 @timed("op") — Exception이 나면 errors도 셈
+
+    st.rerun() 같은 Streamlit 흐름 제어 예외는 BaseException이라 오류로 세지 않음
+    """
+
+    def __init__(self, op: str):
+        self.op = op
+
+    def _recreate_cm(self):
+        # 데코레이터로 쓸 때 호출마다 새 인스턴스 (동시 호출끼리 시작 시각을 공유하지 않게)
+        return timed(self.op)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.op, (time.perf_counter() - self._start) * 1000, error=exc_type is not None and issubclass(exc_type, Exception))
+        return False
+
+
+# ── 내보내기 ───────────────────────────────────────────
+def to_json(registry: Registry = None) -> dict:
+    registry = registry or _process
+    return {"started_at": registry.started_at, "uptime_s": time.time() - registry.started_at,
+            "ops": registry.snapshot(), "counters": registry.counters()}
+
+
+def to_prometheus(registry: Registry = None) -> str:
+    """Prometheus 텍스트 형식 (histogram + 오류 counter + 이벤트 counter)"""
+    registry = registry or _process
+    name = f"{METRIC_PREFIX}_op_latency_ms"
+    lines = [f"# HELP {name} Latency of instrumented operations in milliseconds.", f"# TYPE {name} histogram"]
+    errors = [f"# HELP {METRIC_PREFIX}_op_errors_total Instrumented operations that raised.",
+              f"# TYPE {METRIC_PREFIX}_op_errors_total counter"]
+    for op, s in registry.snapshot().items():
+        label = op.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for le, n in s["buckets"].items():
+            cumulative += n
+            lines.append(f'{name}_bucket{{op="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{op="{label}"}} {s["sum_ms"]:.3f}')
+        lines.append(f'{name}_count{{op="{label}"}} {s["count"]}')
+        errors.append(f'{METRIC_PREFIX}_op_errors_total{{op="{label}"}} {s["errors"]}')
+    events = [f"# HELP {METRIC_PREFIX}_events_total Counted events (no latency).",
+              f"# TYPE {METRIC_PREFIX}_events_total counter"]
+    for event, n in registry.counters().items():
+        label = event.replace("\\", "\\\\").replace('"', '\\"')
+        events.append(f'{METRIC_PREFIX}_events_total{{event="{label}"}} {n}')
+    return "\n".join(lines + errors + events) + "\n"
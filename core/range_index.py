@@ -0,0 +1,63 @@
+"""영양소 범위 인덱스: 슬라이더 범위 / 카테고리 제외 / 예산 필터를 미리 만든 정렬 인덱스로 처리"""
+import numpy as np
+
+from core.catalog import get_catalog
+
+INDEXED_COLUMNS = ["가격", "칼로리(Kcal)", "단백질", "지방", "나트륨", "당류"]
+
+
+class RangeIndex:
+    """영양소별 정렬 순서(order) + 행별 순위(rank) + 카테고리 비트셋
+
+    범위 하나는 정렬 배열에서 searchsorted 두 번으로 [start, stop) 구간이 되고,
+    가장 좁은 구간의 행들만 나머지 구간의 순위와 비교해서 교집합을 구함
+    """
+
+    def __init__(self, catalog):
+        self.size    = len(catalog)
+        self._order  = {}
+        self._sorted = {}
+        self._rank   = {}
+        for col in INDEXED_COLUMNS:
+            vals  = catalog.values(col)
+            order = np.argsort(vals, kind="stable")
+            rank  = np.empty(self.size, dtype=np.int64)
+            rank[order] = np.arange(self.size)
+            self._order[col], self._sorted[col], self._rank[col] = order, vals[order], rank
+        self._category_bits = {cat: np.packbits(m) for cat, m in catalog.category_masks.items()}
+
+    def span(self, column: str, lo, hi):
+        """lo <= 값 <= hi 인 행들의 정렬 순서상 [start, stop) 구간 (NaN은 항상 제외)"""
+        vals = self._sorted[column]
+        return int(np.searchsorted(vals, lo, "left")), int(np.searchsorted(vals, hi, "right"))
+
+    def category_bitset(self, categories) -> np.ndarray:
+        """카테고리 목록의 합집합 비트셋 (np.packbits 형식)"""
+        bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for cat in categories:
+            if cat in self._category_bits:
+                bits |= self._category_bits[cat]
+        return bits
+
+    def query(self, ranges: dict, exclude_categories=()) -> np.ndarray:
+        """{컬럼: (최소, 최대)} 범위를 모두 만족하고 제외 카테고리에 속하지 않는 행 번호 (오름차순)"""
+        if not ranges:
+            rows = np.arange(self.size)
+        else:
+            spans = {col: self.span(col, lo, hi) for col, (lo, hi) in ranges.items()}
+            driver = min(spans, key=lambda c: spans[c][1] - spans[c][0])
+            start, stop = spans[driver]
+            rows = self._order[driver][start:stop]
+            for col, (start, stop) in spans.items():
+                if col != driver and len(rows):
+                    r = self._rank[col][rows]
+                    rows = rows[(r >= start) & (r < stop)]
+        if len(exclude_categories) and len(rows):
+            excluded = np.unpackbits(self.category_bitset(exclude_categories), count=self.size).view(bool)
+            rows = rows[~excluded[rows]]
+        return np.sort(rows)
+
+
+def get_range_index() -> RangeIndex:
+    """현재 카탈로그 버전에 묶인 범위 인덱스"""
+    return get_catalog().derived("range_index", RangeIndex)
@@ -0,0 +1,175 @@
+"""OpenRouteService 경로 조회 + 캐시 + 4방향 동시 미리 받기
+
+- 키: (ORS 프로필, 출발점 위도/경도 소수 4자리(약 10m), 방향, 거리 50m 단위)
+  도착점도 양자화한 출발점/거리로 계산하므로 같은 키는 항상 같은 요청
+- 위치와 메뉴가 정해지면 4방향을 스레드 풀에서 동시에 받아 두어 방향 전환은 캐시에서 바로 반환
+- 같은 키가 이미 받는 중이면 새로 요청하지 않고 그 결과를 기다림
+- requests.Session(연결 재사용) + 타임아웃 + 429/5xx 재시도
+
+    ORS_BASE_URL=http://127.0.0.1:8765   # 로컬 스텁 서버 (python -m bench.fakes)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from core.metrics import observe
+
+ORS_BASE_URL    = os.getenv("ORS_BASE_URL", "https://api.openrouteservice.org")
+ROUTE_TTL       = float(os.getenv("ROUTE_TTL", str(24 * 3600)))
+FAILURE_TTL     = 30.0
+REQUEST_TIMEOUT = (3.05, 10.0)  # (연결, 응답) 초
+
+COORD_DIGITS  = 4     # 출발점 양자화 (소수 4자리 ≈ 11m)
+DISTANCE_STEP = 0.05  # 거리 양자화 (km)
+
+# 운동 → ORS 프로필 (나머지는 도보)
+ORS_PROFILES = {"cycling": "cycling-regular", "hiking": "foot-hiking"}
+
+# start/end: (위도, 경도), coords: (n, 2) 배열 [[위도, 경도], ...] — 실패하면 빈 배열
+Route = namedtuple("Route", "start end coords")
+EMPTY_COORDS = np.empty((0, 2))
+
+
+def profile_for(activity: str) -> str:
+    return ORS_PROFILES.get(activity, "foot-walking")
+
+
+def route_key(profile: str, lat: float, lon: float, bearing: float, distance_km: float) -> tuple:
+    steps = max(1, round(distance_km / DISTANCE_STEP))
+    return (profile, round(lat, COORD_DIGITS), round(lon, COORD_DIGITS), int(bearing) % 360,
+            round(steps * DISTANCE_STEP, 3))
+
+
+def destination(lat: float, lon: float, bearing: float, distance_km: float) -> tuple:
+    from geopy import Point
+    from geopy.distance import distance
+    end = distance(kilometers=distance_km).destination(Point(lat, lon), bearing)
+    return end.latitude, end.longitude
+
+
+class RouteClient:
+    def __init__(self, api_key: str, base_url: str = ORS_BASE_URL, ttl: float = ROUTE_TTL,
+                 max_entries: int = 1024, workers: int = 4, timeout=REQUEST_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url    = base_url.rstrip("/")
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.timeout     = timeout
+
+        self._session = requests.Session()
+        self._session.headers.update({"Authorization": api_key or "", "Content-Type": "application/json"})
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                      allowed_methods=frozenset({"POST"}))
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._pool     = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ors")
+        self._items    = OrderedDict()  # key → (Route, 만료 시각)
+        self._inflight = {}             # key → Future
+        self._lock     = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "waits": 0, "prefetched": 0, "calls": 0, "errors": 0,
+                       "total_call_ms": 0.0, "max_call_ms": 0.0}
+
+    # ── 공개 API ───────────────────────────────────────
+    def route(self, lat: float, lon: float, bearing: float, distance_km: float,
+              profile: str = "foot-walking") -> Route:
+        """캐시에 있으면 바로, 받는 중이면 기다렸다가, 없으면 직접 요청"""
+        key = route_key(profile, lat, lon, bearing, distance_km)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self._stats["hits"] += 1
+                return cached
+            future = self._inflight.get(key)
+            self._stats["waits" if future else "misses"] += 1
+            if future is None:
+                own = self._inflight[key] = Future()
+        if future is not None:
+            return future.result()
+        try:
+            route = self._load(key)
+        except BaseException as e:
+            own.set_exception(e)
+            raise
+        own.set_result(route)
+        return route
+
+    def prefetch(self, lat: float, lon: float, bearings, distance_km: float, profile: str = "foot-walking") -> int:
+        """캐시에 없는 방향들을 백그라운드에서 동시에 요청. 새로 시작한 요청 수 반환"""
+        started = 0
+        with self._lock:
+            for bearing in bearings:
+                key = route_key(profile, lat, lon, bearing, distance_km)
+                if self._lookup(key) is not None or key in self._inflight:
+                    continue
+                self._inflight[key] = self._pool.submit(self._load, key)
+                started += 1
+            self._stats["prefetched"] += started
+        return started
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats, entries=len(self._items), inflight=len(self._inflight))
+        lookups = s["hits"] + s["misses"] + s["waits"]
+        s["hit_rate"]    = s["hits"] / lookups if lookups else None
+        s["avg_call_ms"] = s["total_call_ms"] / s["calls"] if s["calls"] else None
+        return s
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    # ── 내부 ───────────────────────────────────────────
+    def _lookup(self, key):
+        """_lock 보유 상태에서 호출"""
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[1] <= time.time():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return item[0]
+
+    def _load(self, key: tuple) -> Route:
+        profile, lat, lon, bearing, distance_km = key
+        try:
+            end    = destination(lat, lon, bearing, distance_km)
+            coords = self._fetch(profile, (lat, lon), end)
+            route  = Route((lat, lon), end, coords)
+            with self._lock:
+                self._items[key] = (route, time.time() + (self.ttl if len(coords) else FAILURE_TTL))
+                self._items.move_to_end(key)
+                while len(self._items) > self.max_entries:
+                    self._items.popitem(last=False)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return route
+
+    def _fetch(self, profile: str, start: tuple, end: tuple) -> np.ndarray:
+        body  = {"coordinates": [[start[1], start[0]], [end[1], end[0]]]}
+        began = time.perf_counter()
+        try:
+            res = self._session.post(f"{self.base_url}/v2/directions/{profile}/geojson",
+                                     json=body, timeout=self.timeout)
+            lonlat = np.asarray(res.json()["features"][0]["geometry"]["coordinates"], dtype=np.float64)
+            coords = np.ascontiguousarray(lonlat[:, 1::-1])
+        except Exception:
+            coords = EMPTY_COORDS
+        elapsed_ms = (time.perf_counter() - began) * 1000
+        observe("ors.directions", elapsed_ms, error=not len(coords))
+        with self._lock:
+            self._stats["calls"]         += 1
+            self._stats["errors"]        += not len(coords)
+            self._stats["total_call_ms"] += elapsed_ms
+            self._stats["max_call_ms"]    = max(self._stats["max_call_ms"], elapsed_ms)
+        return coords
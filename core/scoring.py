@@ -0,0 +1,77 @@
+"""영양소 가중치 점수 엔진: 미리 정규화한 영양소 행렬 위에서 NumPy로 점수 계산"""
+import numpy as np
+
+from core.catalog import get_catalog
+
+SCORE_COLUMNS = ["칼로리(Kcal)", "단백질", "지방", "나트륨"]
+WEIGHT_KEYS   = ["칼로리", "단백질", "지방", "나트륨"]
+# 낮을수록 좋은 영양소는 (1 - 정규화값)으로 점수에 반영
+LOWER_IS_BETTER = np.array([True, False, True, True])
+
+
+def _minmax_benefit(mat: np.ndarray) -> np.ndarray:
+    """열별 Min-Max 정규화 후 방향 보정 (MinMaxScaler와 같은 규칙: 범위 0이면 정규화값 0)"""
+    lo  = np.nanmin(mat, axis=0)
+    rng = np.nanmax(mat, axis=0) - lo
+    scaled = (mat - lo) / np.where(rng > 0, rng, 1.0)
+    return np.where(LOWER_IS_BETTER, 1.0 - scaled, scaled)
+
+
+class ScoringEngine:
+    """카탈로그 전체의 (행 수, 4) 점수 행렬을 한 번 만들어 두고 선호도 벡터와 행렬곱으로 점수 계산"""
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.benefit = _minmax_benefit(catalog.matrix(SCORE_COLUMNS))
+        self.benefit.flags.writeable = False
+
+    @staticmethod
+    def weight_matrix(weights) -> np.ndarray:
+        """선호도 dict 하나 / dict 리스트 / (B, 4) 배열 → (B, 4) 가중치 행렬"""
+        if isinstance(weights, dict):
+            weights = [weights]
+        if isinstance(weights, np.ndarray):
+            return np.atleast_2d(weights).astype(np.float64)
+        return np.array([[w.get(k, 0.0) for k in WEIGHT_KEYS] for w in weights], dtype=np.float64)
+
+    def benefit_for(self, rows=None) -> np.ndarray:
+        """rows 부분집합 기준으로 다시 Min-Max 정규화한 점수 행렬 (기존 추천과 같은 점수 스케일)"""
+        if rows is None:
+            return self.benefit
+        sub = self.benefit[rows]
+        lo  = sub.min(axis=0)
+        rng = sub.max(axis=0) - lo
+        out = (sub - lo) / np.where(rng > 0, rng, 1.0)
+        # 값이 모두 같은 열: MinMaxScaler 결과(0)에 방향 보정을 적용한 값
+        out[:, rng == 0] = LOWER_IS_BETTER[rng == 0]
+        return out
+
+    def score(self, weights, rows=None) -> np.ndarray:
+        """(B, 행 수) 점수 행렬. dict 하나를 넘기면 1차원 배열"""
+        scores = self.weight_matrix(weights) @ self.benefit_for(rows).T
+        return scores[0] if isinstance(weights, dict) else scores
+
+    def top_k(self, weights, k: int = 3, rows=None):
+        """점수 상위 k개의 (카탈로그 행 번호, 점수). 전체 정렬 대신 partition 사용"""
+        scores = np.atleast_2d(self.score(weights, rows))
+        rows   = np.arange(len(self.catalog)) if rows is None else np.asarray(rows)
+        k = min(k, scores.shape[1])
+        idx = np.empty((len(scores), k), dtype=np.int64)
+        for b, s in enumerate(scores):
+            if 0 < k < len(s):
+                # k번째 점수와 동점인 행이 경계 밖에도 있을 수 있음 → k번째 점수 이상을 전부 후보로
+                kth  = np.partition(s, len(s) - k)[len(s) - k]
+                cand = np.flatnonzero(s >= kth)
+            else:
+                cand = np.arange(len(s))
+            # 점수 내림차순, 동점이면 카탈로그 행 번호 순 (sort_values(ascending=False)와 같은 순서)
+            idx[b] = cand[np.lexsort((rows[cand], -s[cand]))[:k]]
+        top_rows, top_scores = rows[idx], np.take_along_axis(scores, idx, axis=1)
+        if isinstance(weights, dict):
+            return top_rows[0], top_scores[0]
+        return top_rows, top_scores
+
+
+def get_scoring_engine() -> ScoringEngine:
+    """현재 카탈로그 버전에 묶인 점수 엔진 (카탈로그가 다시 로딩되면 새로 만듦)"""
+    return get_catalog().derived("scoring", ScoringEngine)
@@ -0,0 +1,157 @@
+"""비슷한 메뉴 찾기: 영양소(칼로리, 단백질, 지방, 나트륨, 당류) + 가격을 표준화한 벡터 공간의 최근접 이웃
+
+"X와 가장 비슷하면서 나트륨은 20% 이상 적은 메뉴 k개" 같은 조건부 질의를 빠르게 처리
+- 카탈로그 버전마다 한 번, 메뉴별로 가까운 순서의 이웃 M개(기본 64)를 미리 계산 (블록 단위 → 메모리 O(블록 × 행 수))
+- 질의는 미리 계산한 이웃 목록을 앞에서부터 조건으로 거르기만 함 (M개 배열 연산 몇 번 → 수 µs)
+- 목록 안에서 k개를 못 채우면 조건을 만족하는 전체 행과 거리를 직접 계산 (결과는 항상 정확한 k-최근접)
+
+    python -m core.similarity 빅맥 --lower 나트륨=0.2 -k 5
+    python -m core.similarity 빅맥 --lower 나트륨=0.2 --scale 5000     # 카탈로그를 5000행으로 늘려 질의 시간 측정
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.catalog import Catalog, get_catalog
+from core.metrics import incr
+
+SIMILARITY_COLUMNS = ["칼로리(Kcal)", "단백질", "지방", "나트륨", "당류", "가격"]
+NEIGHBORS  = 64    # 메뉴별로 미리 저장하는 이웃 수
+BLOCK_ROWS = 512   # 사전 계산 시 한 번에 거리를 구하는 행 수
+
+
+class SimilarityIndex:
+    """neighbors / distances: 모양 (행 수, M). 행마다 자기 자신을 뺀 가까운 순서 (거리 같으면 행 번호 순)"""
+
+    def __init__(self, catalog, neighbors: int = NEIGHBORS, block_rows: int = BLOCK_ROWS):
+        self.catalog = catalog
+        mat = catalog.matrix(SIMILARITY_COLUMNS)
+        std = mat.std(axis=0)
+        self.vectors = (mat - mat.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        self.vectors.flags.writeable = False
+        self._sq = (self.vectors ** 2).sum(axis=1)
+        # 이름 / 카테고리 비교는 정수 코드로 (문자열 배열 비교보다 훨씬 빠름)
+        self._name_ids = np.unique(catalog.names, return_inverse=True)[1]
+        self._category_ids = {c: i for i, c in enumerate(catalog.category_names)}
+        self._category_of  = np.array([self._category_ids[c] for c in catalog.categories], dtype=np.int64)
+
+        n = len(self.vectors)
+        m = max(0, min(neighbors, n - 1))
+        self.neighbors = np.empty((n, m), dtype=np.int32)
+        self.distances = np.empty((n, m), dtype=np.float64)
+        for start in range(0, n, block_rows):
+            rows = np.arange(start, min(start + block_rows, n))
+            d = self._distances(rows, np.arange(n))
+            d[np.arange(len(rows)), rows] = np.inf  # 자기 자신 제외
+            if m == 0:
+                break
+            part = np.argpartition(d, m - 1, axis=1)[:, :m]
+            dist = np.take_along_axis(d, part, axis=1)
+            order = np.lexsort((part, dist), axis=1)
+            self.neighbors[rows] = np.take_along_axis(part, order, axis=1)
+            self.distances[rows] = np.take_along_axis(dist, order, axis=1)
+        self.neighbors.flags.writeable = False
+        self.distances.flags.writeable = False
+
+    def _distances(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """행 번호 배열 a × b 유클리드 거리 행렬 (|x|² + |y|² - 2x·y)"""
+        d2 = self._sq[a][:, None] + self._sq[b][None, :] - 2.0 * self.vectors[a] @ self.vectors[b].T
+        return np.sqrt(np.maximum(d2, 0.0))
+
+    def _allowed(self, row: int, candidates: np.ndarray, lower_by: dict, categories) -> np.ndarray:
+        """candidates 중 조건을 만족하는 행 마스크: 같은 이름 제외, lower_by {컬럼: 비율} 이상 적음, 카테고리"""
+        ok = self._name_ids[candidates] != self._name_ids[row]
+        for col, ratio in (lower_by or {}).items():
+            vals = self.catalog.values(col)
+            ok &= vals[candidates] <= vals[row] * (1.0 - ratio)
+        if categories is not None:
+            codes = [self._category_ids[c] for c in categories if c in self._category_ids]
+            ok &= np.isin(self._category_of[candidates], codes)
+        return ok
+
+    def similar(self, row: int, k: int = 5, lower_by: dict = None, categories=None):
+        """row와 가장 가까운 k개 (행 번호 배열, 거리 배열). lower_by={"나트륨": 0.2} → 나트륨 20% 이상 적은 메뉴만"""
+        near = self.neighbors[row]
+        ok = self._allowed(row, near, lower_by, categories)
+        hits = np.flatnonzero(ok)[:k]
+        if len(hits) == k or len(near) == len(self.vectors) - 1:
+            return near[hits].astype(np.int64), self.distances[row, hits]
+
+        # 미리 계산한 이웃 밖까지 봐야 함 → 전체 행과 거리를 한 번에 구하고 조건에 안 맞는 행은 무한대로
+        incr("similarity.fallback")
+        everyone = np.arange(len(self.vectors))
+        d2 = self._sq + self._sq[row] - 2.0 * (self.vectors @ self.vectors[row])
+        d2[~self._allowed(row, everyone, lower_by, categories)] = np.inf
+        d2[row] = np.inf
+        k = min(k, int(np.isfinite(d2).sum()))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        cand = np.argpartition(d2, k - 1)[:k] if k < len(d2) else everyone
+        order = np.lexsort((cand, d2[cand]))[:k]
+        cand = cand[order]
+        return cand, np.sqrt(np.maximum(d2[cand], 0.0))
+
+    def similar_menus(self, menu: str, k: int = 5, lower_by: dict = None, categories=None,
+                      category: str = None) -> list:
+        """메뉴명으로 질의 → [(카테고리, 메뉴, 거리)] (메뉴가 없으면 빈 목록)"""
+        row = self.catalog.row(menu, category)
+        if row is None:
+            return []
+        rows, dist = self.similar(row, k, lower_by, categories)
+        return [(self.catalog.categories[r], self.catalog.names[r], float(d)) for r, d in zip(rows, dist)]
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """현재 카탈로그 버전에 묶인 유사도 인덱스"""
+    return get_catalog().derived("similarity", SimilarityIndex)
+
+
+def scaled_catalog(catalog, rows: int, seed: int = 0):
+    """카탈로그를 rows행으로 늘린 가짜 카탈로그 (지역 메뉴 수천 개 상황 측정용, 값은 ±15% 흔들기)"""
+    rng = np.random.default_rng(seed)
+    extra = catalog.frame.sample(rows - len(catalog), replace=True, random_state=seed).reset_index(drop=True)
+    extra["메뉴"] = [f"{m} #{i}" for i, m in enumerate(extra["메뉴"])]
+    for col in SIMILARITY_COLUMNS:
+        extra[col] = extra[col] * rng.uniform(0.85, 1.15, len(extra))
+    return Catalog(pd.concat([catalog.frame, extra], ignore_index=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비슷한 메뉴 찾기 (조건부 최근접 이웃)")
+    parser.add_argument("menu")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--lower", action="append", default=[], metavar="컬럼=비율",
+                        help="예: 나트륨=0.2 (20%% 이상 적은 메뉴만, 여러 번 지정 가능)")
+    parser.add_argument("--scale", type=int, help="카탈로그를 이 행 수로 늘려서 측정")
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    if args.scale and args.scale > len(catalog):
+        catalog = scaled_catalog(catalog, args.scale)
+    lower_by = {col: float(ratio) for col, ratio in (item.split("=") for item in args.lower)}
+
+    start = time.perf_counter()
+    index = SimilarityIndex(catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+    row = catalog.row(args.menu)
+    if row is None:
+        parser.error(f"메뉴 없음: {args.menu}")
+
+    repeat = 2000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows, dist = index.similar(row, args.k, lower_by)
+    query_us = (time.perf_counter() - start) / repeat * 1e6
+
+    base = catalog.nutrients(args.menu, SIMILARITY_COLUMNS)
+    print(f"{args.menu} ({', '.join(f'{c} {v:g}' for c, v in zip(SIMILARITY_COLUMNS, base))})")
+    for r, d in zip(rows, dist):
+        vals = ", ".join(f"{c} {catalog.values(c)[r]:g}" for c in SIMILARITY_COLUMNS)
+        print(f"  {d:5.2f}  {catalog.categories[r]} / {catalog.names[r]} ({vals})")
+    print(f"{len(catalog):,}행 · 사전 계산 {build_ms:.1f}ms · 질의 {query_us:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
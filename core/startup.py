@@ -0,0 +1,105 @@
+"""페이지 모듈 지연 로딩 + import 시간 기록
+
+main.py는 홈 카드만 그릴 때 페이지 모듈(folium, gspread, google-auth 등)을 불러오지 않고,
+처음 이동할 때 load_page()로 import 함 → 걸린 시간을 기록해 두어 콜드 스타트를 추적
+
+    python -m core.startup          # 새 프로세스에서 페이지별 콜드 import 시간 측정
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.catalog import BASE_DIR
+from core.metrics import observe
+
+# 라우터 페이지 이름 → 모듈
+PAGE_MODULES = {
+    "visual":      "pages.visual",
+    "map":         "pages.map_ui",
+    "mbti":        "pages.mbti",
+    "specialty":   "pages.specialty",
+    "diagnostics": "pages.diagnostics",  # 홈 카드 없음 (?diag=… 로만 진입)
+}
+
+_import_ms = {}  # 페이지 이름 → 처음 import할 때 걸린 시간(ms)
+_lock      = threading.Lock()
+
+
+def load_page(name: str):
+    """페이지 모듈 반환. 처음 불릴 때만 실제로 import 하고 시간을 기록"""
+    module_name = PAGE_MODULES[name]
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _lock:
+        start  = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if name not in _import_ms:
+            _import_ms[name] = elapsed_ms
+            observe(f"page.{name}.import", elapsed_ms)
+            print(f"✅ 페이지 로딩: {module_name} ({elapsed_ms:.0f}ms)")
+    return module
+
+
+def import_report() -> dict:
+    """이 프로세스에서 지금까지 import한 페이지별 시간(ms)"""
+    with _lock:
+        return dict(_import_ms)
+
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import streamlit
+base_ms = (time.perf_counter() - start) * 1000
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"streamlit_ms": base_ms, "page_ms": (time.perf_counter() - start) * 1000,
+                  "modules": len(sys.modules)}}))
+"""
+
+
+def measure_cold_imports(names=None) -> dict:
+    """페이지마다 새 파이썬 프로세스를 띄워 streamlit 이후 페이지 import에 걸린 시간을 측정"""
+    results = {}
+    for name in names or PAGE_MODULES:
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=PAGE_MODULES[name])],
+            cwd=BASE_DIR, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=BASE_DIR),
+        )
+        if proc.returncode != 0:
+            results[name] = {"error": proc.stderr.strip().splitlines()[-1:]}
+            continue
+        results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별 콜드 import 시간 측정")
+    parser.add_argument("pages", nargs="*", help=f"측정할 페이지 {list(PAGE_MODULES)} (기본: 전체)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+    unknown = set(args.pages) - set(PAGE_MODULES)
+    if unknown:
+        parser.error(f"알 수 없는 페이지: {', '.join(sorted(unknown))}")
+
+    results = measure_cold_imports(args.pages or None)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for name, r in results.items():
+        if "error" in r:
+            print(f"❌ {name:<10} {r['error']}")
+        else:
+            print(f"{name:<10} page {r['page_ms']:7.0f}ms  (streamlit {r['streamlit_ms']:.0f}ms, 모듈 {r['modules']}개)")
+
+
+if __name__ == "__main__":
+    main()
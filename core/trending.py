@@ -0,0 +1,114 @@
+"""지금 뜨는 메뉴: 투표 시각으로 최근 5분 / 1시간 / 오늘 구간별 메뉴 투표 수를 유지
+
+구간마다 시간 버킷 링 버퍼(버킷별 Counter)와 구간 합계 Counter를 둠
+- 새 투표: 해당 버킷과 합계에 +1 (집계기가 새로 읽은 행만 넘겨줌 → 기록 전체를 다시 훑지 않음)
+- 시간이 지나면: 밀려난 버킷의 수만큼 합계에서 빼고 버킷을 비움
+시각이 없거나 구간보다 오래된 투표(예: 예전 CSV)는 무시
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+
+
+def _local_day(ts: float) -> int:
+    return datetime.fromtimestamp(ts).toordinal()
+
+
+class RollingCounter:
+    """slots개 버킷 링 버퍼. bucket_of(시각) → 버킷 번호 (늘어나는 정수)"""
+
+    def __init__(self, slots: int, bucket_of):
+        self.bucket_of = bucket_of
+        self._ids      = [None] * slots    # 슬롯에 담긴 버킷 번호
+        self._counts   = [Counter() for _ in range(slots)]
+        self._total    = Counter()
+        self._head     = None              # 가장 최근 버킷 번호
+
+    def _advance(self, bucket: int):
+        """bucket까지 시간을 진행하며 구간 밖으로 밀려난 버킷을 비움"""
+        if self._head is not None and bucket <= self._head:
+            return
+        n = len(self._ids)
+        start = bucket - n + 1 if self._head is None else max(self._head + 1, bucket - n + 1)
+        for b in range(start, bucket + 1):
+            slot = b % n
+            for menu, c in self._counts[slot].items():
+                left = self._total[menu] - c
+                if left > 0:
+                    self._total[menu] = left
+                else:
+                    del self._total[menu]
+            self._counts[slot].clear()
+            self._ids[slot] = b
+        self._head = bucket
+
+    def add(self, menu: str, ts: float, now: float):
+        bucket = min(self.bucket_of(ts), self.bucket_of(now))  # 시계가 앞선 투표는 지금으로
+        self._advance(self.bucket_of(now))
+        slot = bucket % len(self._ids)
+        if self._ids[slot] != bucket:  # 이미 구간 밖
+            return
+        self._counts[slot][menu] += 1
+        self._total[menu] += 1
+
+    def top(self, n: int, now: float) -> list:
+        self._advance(self.bucket_of(now))
+        return self._total.most_common(n)
+
+
+# 구간 이름 → (슬롯 수, 버킷 함수)
+WINDOWS = {
+    "최근 5분":   (30, lambda ts: int(ts // 10)),   # 10초 버킷 × 30
+    "최근 1시간": (60, lambda ts: int(ts // 60)),   # 1분 버킷 × 60
+    "오늘":       (1,  _local_day),                 # 자정에 비워짐
+}
+
+
+class TrendingVotes:
+    """프로세스 전역 구간별 메뉴 투표 수 (스레드 안전)"""
+
+    def __init__(self, windows: dict = None, clock=time.time):
+        self._clock   = clock
+        self._windows = {name: RollingCounter(slots, bucket_of)
+                         for name, (slots, bucket_of) in (windows or WINDOWS).items()}
+        self._lock    = threading.Lock()
+        self._stats   = {"added": 0, "skipped": 0}
+
+    @property
+    def window_names(self) -> list:
+        return list(self._windows)
+
+    def add_rows(self, rows):
+        """투표 행([카테고리, 메뉴, 시각(ISO)]) 반영"""
+        now = self._clock()
+        with self._lock:
+            for row in rows:
+                ts = _parse_ts(row[2]) if len(row) > 2 else None
+                if ts is None:
+                    self._stats["skipped"] += 1
+                    continue
+                for counter in self._windows.values():
+                    counter.add(row[1], ts, now)
+                self._stats["added"] += 1
+
+    def top(self, window: str, n: int = 5) -> pd.Series:
+        """구간 안 투표 수 상위 n개 메뉴 (VoteSnapshot.top과 같은 모양)"""
+        with self._lock:
+            pairs = self._windows[window].top(n, self._clock())
+        return pd.Series(dict(pairs), dtype="int64", name="count").rename_axis("메뉴")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+
+def _parse_ts(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
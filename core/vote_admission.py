@@ -0,0 +1,159 @@
+"""투표 허용 판단: 저장소에 쓰기 전에 중복 투표와 과도한 요청을 프로세스 전역에서 걸러냄
+
+- 클라이언트 = 첫 번째 주소(X-Forwarded-For 첫 항목, 없으면 접속 주소) + UA·언어 + 브라우저 쿠키 id(있으면)
+  세션과 무관하므로 새 탭이나 새 웹소켓 세션으로 다시 투표해도 같은 클라이언트
+  (같은 NAT·같은 브라우저 헤더인데 쿠키가 없는 사용자끼리는 묶일 수 있음 → 전체 버킷이 최종 방어선)
+- 중복: (클라이언트 지문, 카테고리)를 시간 버킷으로 나눈 블룸 필터에 기록 → window 동안 한 번만
+  (버킷이 돌아가며 비워지므로 실제 유지 시간은 window × (buckets-1)/buckets ~ window,
+   거짓 양성률 error만큼 처음 투표도 중복으로 판단될 수 있음)
+- 속도 제한: 클라이언트별 토큰 버킷(LRU로 개수 제한) + 전체 토큰 버킷
+- 메모리는 투표자 수와 관계없이 고정: 블룸 필터 buckets × bits/8 바이트 + 클라이언트 버킷 max_clients개
+- 결과마다 core.metrics 카운터 votes.admission.<결과>를 올림
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from core.metrics import incr
+
+ADMITTED   = "admitted"
+DUPLICATE  = "duplicate"   # 같은 클라이언트가 같은 카테고리에 이미 투표
+THROTTLED  = "throttled"   # 클라이언트별 속도 제한
+OVERLOADED = "overloaded"  # 전체 속도 제한
+
+# 지문에 쓰는 요청 헤더 (주소는 따로: 프록시 뒤면 X-Forwarded-For의 첫 주소가 실제 클라이언트)
+FINGERPRINT_HEADERS = ("User-Agent", "Accept-Language")
+# 브라우저마다 유지되는 쿠키 (Streamlit XSRF 쿠키: 같은 브라우저의 탭끼리 공유)
+FINGERPRINT_COOKIE  = "_streamlit_xsrf"
+
+
+def fingerprint(headers, cookies=None, remote_ip: str = "", fallback: str = "") -> str:
+    """주소 + 요청 헤더 + 쿠키 id로 만든 클라이언트 지문 (세션 id는 쓰지 않음)
+
+    주소·헤더·쿠키가 모두 없을 때만 fallback (예: 테스트 실행기의 세션 id)
+    """
+    headers, cookies = headers or {}, cookies or {}
+    address = str(headers.get("X-Forwarded-For") or "").split(",")[0].strip() or remote_ip or ""
+    parts = [address] + [str(headers.get(h) or "").strip() for h in FINGERPRINT_HEADERS]
+    parts.append(str(cookies.get(FINGERPRINT_COOKIE) or ""))
+    if not any(parts):
+        return fallback
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=12).hexdigest()
+
+
+class TimeBucketedBloom:
+    """window 초를 buckets개 구간으로 나눈 블룸 필터 묶음. 가장 오래된 구간부터 비움
+
+    capacity: 한 구간에 들어갈 것으로 보는 키 수, error: 그때의 거짓 양성률
+    """
+
+    def __init__(self, window: float, buckets: int = 4, capacity: int = 50_000, error: float = 0.001,
+                 clock=time.monotonic):
+        self.window  = window
+        self.span    = window / buckets
+        self.bits    = max(64, int(math.ceil(-capacity * math.log(error) / math.log(2) ** 2)))
+        self.hashes  = max(1, round(self.bits / capacity * math.log(2)))
+        self._clock  = clock
+        self._filters = [bytearray((self.bits + 7) // 8) for _ in range(buckets)]
+        self._epoch   = int(clock() // self.span)  # 현재 구간 번호 (_filters[_epoch % buckets])
+
+    def _indexes(self, key: str):
+        # 128비트 해시 하나를 둘로 나눠 k개 위치를 만듦 (double hashing)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _rotate(self):
+        epoch = int(self._clock() // self.span)
+        n = len(self._filters)
+        for e in range(max(self._epoch + 1, epoch - n + 1), epoch + 1):
+            self._filters[e % n] = bytearray(len(self._filters[0]))
+        self._epoch = max(self._epoch, epoch)
+
+    def __contains__(self, key: str) -> bool:
+        self._rotate()
+        idx = self._indexes(key)
+        return any(all(f[i >> 3] & (1 << (i & 7)) for i in idx) for f in self._filters)
+
+    def add(self, key: str):
+        self._rotate()
+        current = self._filters[self._epoch % len(self._filters)]
+        for i in self._indexes(key):
+            current[i >> 3] |= 1 << (i & 7)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(f) for f in self._filters)
+
+
+class TokenBucket:
+    """burst개까지 모아 두고 초당 rate개씩 채워지는 토큰"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate, self.burst = rate, burst
+        self.tokens, self.updated = burst, now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class VoteAdmission:
+    """admit(클라이언트 지문, 카테고리) → ADMITTED / DUPLICATE / THROTTLED / OVERLOADED
+
+    client_rate/burst: 클라이언트별 (초당, 최대), global_rate/burst: 전체
+    max_clients: 기억하는 클라이언트 버킷 수 (넘으면 가장 오래 안 쓴 것부터 잊음 → 가득 찬 버킷으로 다시 시작)
+    """
+
+    def __init__(self, window: float = 24 * 3600, client_rate: float = 0.1, client_burst: float = 5,
+                 global_rate: float = 20.0, global_burst: float = 200, max_clients: int = 50_000,
+                 bloom_capacity: int = 50_000, bloom_error: float = 0.001, clock=time.monotonic):
+        self._clock       = clock
+        self._seen        = TimeBucketedBloom(window, capacity=bloom_capacity, error=bloom_error, clock=clock)
+        self._client_rate  = client_rate
+        self._client_burst = client_burst
+        self._clients     = OrderedDict()
+        self.max_clients  = max_clients
+        self._global      = TokenBucket(global_rate, global_burst, clock())
+        self._lock        = threading.Lock()
+        self._stats       = {ADMITTED: 0, DUPLICATE: 0, THROTTLED: 0, OVERLOADED: 0, "evicted_clients": 0}
+
+    def admit(self, client: str, category: str) -> str:
+        key = f"{client}\x1f{category}"
+        with self._lock:
+            verdict = self._decide(client, key)
+            self._stats[verdict] += 1
+        incr(f"votes.admission.{verdict}")
+        return verdict
+
+    def _decide(self, client: str, key: str) -> str:
+        # 중복은 토큰을 쓰지 않고 거절 (같은 투표를 반복해도 다른 투표 기회를 깎지 않음)
+        if key in self._seen:
+            return DUPLICATE
+        now = self._clock()
+        bucket = self._clients.get(client)
+        if bucket is None:
+            bucket = self._clients[client] = TokenBucket(self._client_rate, self._client_burst, now)
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+                self._stats["evicted_clients"] += 1
+        else:
+            self._clients.move_to_end(client)
+        if not bucket.take(now):
+            return THROTTLED
+        if not self._global.take(now):
+            return OVERLOADED
+        self._seen.add(key)
+        return ADMITTED
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, clients=len(self._clients), bloom_bytes=self._seen.nbytes)
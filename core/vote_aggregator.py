@@ -0,0 +1,120 @@
+"""투표 집계기: 매번 시트 전체를 받지 않고 마지막으로 읽은 행 이후만 가져와 카운터를 갱신
+
+모든 세션이 프로세스 전역 집계기 하나를 공유하고, 스냅샷은 TTL 동안 재사용함
+저장소가 행 수(version)를 싸게 알려주면 먼저 비교해서, 새 투표가 없을 때는 읽지 않음
+"""
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+from core.metrics import observe
+
+
+class VoteSnapshot:
+    """특정 시점의 집계 결과 (읽기 전용, 세션 간 공유)"""
+
+    def __init__(self, version: int, by_category: dict, total: Counter, fetched_at: float):
+        self.version     = version  # 지금까지 읽은 투표 행 수
+        self.by_category = by_category
+        self.total       = total
+        self.fetched_at  = fetched_at
+
+    def category_counts(self, category: str) -> pd.Series:
+        """카테고리 안의 메뉴별 투표 수 (많은 순, value_counts와 같은 모양)"""
+        return self._series(self.by_category.get(category, Counter()).most_common())
+
+    def top(self, n: int = 5) -> pd.Series:
+        """전체 인기 메뉴 상위 n개"""
+        return self._series(self.total.most_common(n))
+
+    @staticmethod
+    def _series(pairs) -> pd.Series:
+        return pd.Series(dict(pairs), dtype="int64", name="count").rename_axis("메뉴")
+
+
+class VoteAggregator:
+    """fetch_since(offset) → offset번째 이후 투표 행들([카테고리, 메뉴, 시각, ...])
+
+    version() → 현재 투표 행 수 또는 None (모르면 항상 fetch_since로 확인)
+    trending: 새로 읽은 행을 같이 넘겨줄 core.trending.TrendingVotes (선택)
+    """
+
+    def __init__(self, fetch_since, ttl: float = 15.0, version=None, trending=None):
+        self._fetch_since = fetch_since
+        self._version     = version
+        self.trending     = trending
+        self.ttl          = ttl
+
+        self._offset      = 0
+        self._by_category = {}
+        self._total       = Counter()
+        self._snapshot    = None
+
+        self._refresh_lock = threading.Lock()
+        self._stats = {"refreshes": 0, "unchanged": 0, "rows_fetched": 0, "last_fetch_ms": None, "served": 0}
+
+    def snapshot(self) -> VoteSnapshot:
+        """TTL 안이면 캐시된 스냅샷, 지났으면 새 행만 받아서 갱신
+
+        다른 세션이 이미 갱신 중이면 기다리지 않고 직전 스냅샷을 반환
+        """
+        snap = self._snapshot
+        self._stats["served"] += 1
+        if snap is not None and time.monotonic() - snap.fetched_at < self.ttl:
+            return snap
+        if not self._refresh_lock.acquire(blocking=snap is None):
+            return snap
+        try:
+            # 락을 기다리는 동안 다른 스레드가 갱신했을 수 있음
+            if self._snapshot is not snap and self._snapshot is not None:
+                return self._snapshot
+            return self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self) -> VoteSnapshot:
+        """TTL과 관계없이 즉시 갱신 (예: 수동 새로고침)"""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> VoteSnapshot:
+        """마지막 offset 이후 행만 읽어서 카운터에 반영 (_refresh_lock 보유 상태에서 호출)"""
+        prev = self._snapshot
+        if prev is not None and self._version is not None and self._version() == self._offset:
+            # 새 투표 없음 → 집계는 그대로 두고 확인 시각만 갱신
+            self._snapshot = VoteSnapshot(prev.version, prev.by_category, prev.total, time.monotonic())
+            self._stats["unchanged"] += 1
+            return self._snapshot
+
+        start = time.perf_counter()
+        fetched = self._fetch_since(self._offset)
+        rows    = [r for r in fetched if len(r) >= 2 and r[0] and r[1]]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        changed = set()
+        for row in rows:
+            category, menu = row[0], row[1]
+            self._by_category.setdefault(category, Counter())[menu] += 1
+            self._total[menu] += 1
+            changed.add(category)
+        self._offset += len(fetched)
+        if self.trending is not None and rows:
+            self.trending.add_rows(rows)
+
+        # 바뀐 카테고리만 복사 → 이전 스냅샷을 들고 있는 세션과 데이터를 공유해도 안전
+        by_category = dict(prev.by_category) if prev else {}
+        for category in changed:
+            by_category[category] = Counter(self._by_category[category])
+        total = Counter(self._total) if rows or prev is None else prev.total
+
+        self._snapshot = VoteSnapshot(self._offset, by_category, total, time.monotonic())
+        self._stats["refreshes"]    += 1
+        self._stats["rows_fetched"] += len(rows)
+        self._stats["last_fetch_ms"] = elapsed_ms
+        observe("votes.refresh", elapsed_ms)
+        return self._snapshot
+
+    def stats(self) -> dict:
+        return dict(self._stats, offset=self._offset)
@@ -0,0 +1,181 @@
+"""투표 쓰기 버퍼: 투표는 큐에 넣고 바로 반환, 백그라운드 스레드가 모아서 한 번에 기록
+
+- 배치 크기(batch_size)가 차거나 flush_interval 초가 지나면 sink(rows)로 한 번에 기록
+- 큐에 들어간 투표는 로컬 저널(JSON Lines, 추가 전용)에도 적어 두어 재시작해도 유실되지 않음
+  {"op": "add", "row": [...]}  → 큐에 추가
+  {"op": "ack", "n": 12}       → 큐 앞쪽 12건 기록 완료
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from core.catalog import BASE_DIR
+from core.metrics import observe
+
+JOURNAL_PATH = os.path.join(BASE_DIR, "data", "vote_journal.jsonl")
+
+logger = logging.getLogger(__name__)
+
+
+class VoteWriter:
+    """프로세스 전역 투표 큐 + 백그라운드 배치 기록기
+
+    sink: 행 리스트를 받아 한 번에 기록하는 함수 (예: gspread Worksheet.append_rows)
+    """
+
+    def __init__(self, sink, journal_path: str = JOURNAL_PATH, batch_size: int = 50,
+                 flush_interval: float = 5.0, max_backoff: float = 60.0):
+        self._sink           = sink
+        self._journal_path   = journal_path
+        self._batch_size     = batch_size
+        self._flush_interval = flush_interval
+        self._max_backoff    = max_backoff
+
+        self._cond    = threading.Condition()
+        self._pending = deque(self._replay_journal())
+        self._journal = open(journal_path, "a", encoding="utf-8") if journal_path else None
+        self._closed  = False
+        self._force   = False
+
+        self._stats = {
+            "enqueued": 0, "flushed": 0, "flushes": 0, "failures": 0,
+            "last_flush_ms": None, "max_flush_ms": 0.0, "total_flush_ms": 0.0,
+            "last_error": None, "recovered": len(self._pending),
+        }
+        self._thread = threading.Thread(target=self._run, name="vote-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── 저널 ───────────────────────────────────────────
+    def _replay_journal(self) -> list:
+        """저널을 읽어 아직 기록되지 않은 투표를 복구하고, 남은 것만으로 저널을 다시 씀"""
+        if not self._journal_path or not os.path.exists(self._journal_path):
+            return []
+        pending = deque()
+        with open(self._journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 쓰다 만 마지막 줄
+                if entry.get("op") == "add":
+                    pending.append(entry["row"])
+                elif entry.get("op") == "ack":
+                    for _ in range(min(entry["n"], len(pending))):
+                        pending.popleft()
+        self._rewrite_journal(pending)
+        if pending:
+            logger.info("저널에서 미기록 투표 %d건 복구", len(pending))
+        return list(pending)
+
+    def _rewrite_journal(self, rows):
+        tmp = self._journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({"op": "add", "row": row}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self._journal_path)
+
+    def _journal_write(self, entry: dict):
+        if self._journal:
+            self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._journal.flush()
+
+    # ── 공개 API ───────────────────────────────────────
+    def submit(self, row: list):
+        """투표 한 건을 큐에 넣고 바로 반환"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("VoteWriter가 이미 종료되었습니다.")
+            self._journal_write({"op": "add", "row": row})
+            self._pending.append(row)
+            self._stats["enqueued"] += 1
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """큐를 즉시 비우도록 요청하고 비워질 때까지 대기 (종료/테스트용)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._force = True
+            self._cond.notify()
+            while self._pending and time.monotonic() < deadline:
+                self._cond.wait(0.05)
+            return not self._pending
+
+    def pending_rows(self) -> list:
+        """아직 기록되지 않은 투표 (화면 집계에 더할 때 사용)"""
+        with self._cond:
+            return list(self._pending)
+
+    def stats(self) -> dict:
+        """적재량(backlog)과 기록 지연 통계"""
+        with self._cond:
+            s = dict(self._stats)
+            s["backlog"] = len(self._pending)
+        s["avg_flush_ms"] = s["total_flush_ms"] / s["flushes"] if s["flushes"] else None
+        return s
+
+    def close(self, timeout: float = 10.0):
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        if self._journal:
+            self._journal.close()
+
+    # ── 백그라운드 기록 ────────────────────────────────
+    def _run(self):
+        backoff = 0.0
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + max(self._flush_interval, backoff)
+                # 실패 후 백오프 중에는 배치가 차도 기다림
+                while not self._closed and not self._force and (backoff or len(self._pending) < self._batch_size):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed and not self._pending:
+                    return
+                self._force = False
+                batch = list(self._pending)[:self._batch_size * 10]
+            if not batch:
+                continue
+
+            start = time.perf_counter()
+            try:
+                self._sink(batch)
+            except Exception as e:  # 네트워크/쿼터 오류 → 저널에 남겨두고 지수 백오프 후 재시도
+                observe("votes.flush", (time.perf_counter() - start) * 1000, error=True)
+                with self._cond:
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = repr(e)
+                backoff = min(self._max_backoff, max(1.0, backoff * 2))
+                logger.warning("투표 기록 실패 (%d건 대기, %.0f초 후 재시도): %s", len(batch), backoff, e)
+                if self._closed:
+                    return
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            observe("votes.flush", elapsed_ms)
+            backoff = 0.0
+
+            with self._cond:
+                for _ in range(len(batch)):
+                    self._pending.popleft()
+                self._journal_write({"op": "ack", "n": len(batch)})
+                if not self._pending and self._journal:
+                    # 모두 기록되면 저널을 비워서 파일이 계속 커지지 않게 함
+                    self._journal.truncate(0)
+                self._stats["flushed"]        += len(batch)
+                self._stats["flushes"]        += 1
+                self._stats["last_flush_ms"]   = elapsed_ms
+                self._stats["max_flush_ms"]    = max(self._stats["max_flush_ms"], elapsed_ms)
+                self._stats["total_flush_ms"] += elapsed_ms
+                self._cond.notify_all()
@@ -0,0 +1,176 @@
+"""투표 저장소: 추가(append) / 이후 행 읽기(read_since) / 집계(counts) 인터페이스와 구현체
+
+- GSheetVoteStore : Google Sheets (gspread Worksheet)
+- SQLiteVoteStore : 로컬 SQLite (WAL 모드) — 오프라인 부하 테스트, 저지연 기본 저장소
+- MirroredVoteStore: 기본 저장소에 바로 쓰고 다른 저장소(예: 시트)에는 VoteWriter로 비동기 동기화
+
+    python -m core.vote_store import data/vote_result.csv     # CSV → SQLite 가져오기
+    python -m core.vote_store counts
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from core.catalog import BASE_DIR
+from core.metrics import timed
+
+VOTE_DB_PATH = os.path.join(BASE_DIR, "data", "votes.db")
+
+
+class VoteStore(ABC):
+    """투표 행은 [카테고리, 메뉴, 시각(ISO 문자열)] 형식 (append / read_since를 빠뜨린 구현체는 만들 때 바로 실패)"""
+
+    # 원격 저장소는 쓰기가 느려서 VoteWriter로 모아서 기록함
+    remote = False
+
+    @abstractmethod
+    def append(self, rows: list):
+        ...
+
+    @abstractmethod
+    def read_since(self, offset: int) -> list:
+        """앞에서부터 offset개를 건너뛴 나머지 투표 행"""
+
+    def version(self):
+        """지금까지 쌓인 투표 행 수를 싸게 알 수 있으면 그 값, 아니면 None (read_since로 확인)"""
+        return None
+
+    def counts(self):
+        """(카테고리 → Counter(메뉴), 전체 Counter(메뉴))"""
+        by_category, total = {}, Counter()
+        for row in self.read_since(0):
+            if len(row) >= 2 and row[0] and row[1]:
+                by_category.setdefault(row[0], Counter())[row[1]] += 1
+                total[row[1]] += 1
+        return by_category, total
+
+
+class GSheetVoteStore(VoteStore):
+    remote = True
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def append(self, rows: list):
+        with timed("sheets.append_rows"):
+            self.sheet.append_rows(rows)
+
+    def read_since(self, offset: int) -> list:
+        import gspread
+        try:
+            # 1행은 헤더 → 데이터 offset번째 행은 시트의 offset+2번째 행
+            with timed("sheets.get_values"):
+                return self.sheet.get_values(f"A{offset + 2}:C")
+        except gspread.exceptions.APIError as e:
+            if "exceeds grid limits" in str(e):  # 새 행이 없음
+                return []
+            raise
+
+
+class SQLiteVoteStore(VoteStore):
+    """스레드마다 연결 하나, WAL 모드라 읽기와 쓰기가 서로 막지 않음
+
+    id는 AUTOINCREMENT이고 삭제하지 않으므로 1부터 빈틈없이 이어짐 → read_since는 id > offset
+    """
+
+    def __init__(self, path: str = VOTE_DB_PATH):
+        self.path   = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS votes ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " category TEXT NOT NULL, menu TEXT NOT NULL, voted_at TEXT)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def append(self, rows: list):
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT INTO votes (category, menu, voted_at) VALUES (?, ?, ?)",
+                [(r[0], r[1], r[2] if len(r) > 2 else None) for r in rows],
+            )
+
+    def read_since(self, offset: int) -> list:
+        cur = self._conn().execute(
+            "SELECT category, menu, COALESCE(voted_at, '') FROM votes WHERE id > ? ORDER BY id", (offset,)
+        )
+        return [list(r) for r in cur]
+
+    def version(self) -> int:
+        # id는 빈틈없이 이어지므로 MAX(id) = 행 수 (기본 키 인덱스만 봄)
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM votes").fetchone()[0]
+
+    def counts(self):
+        by_category, total = {}, Counter()
+        cur = self._conn().execute("SELECT category, menu, COUNT(*) FROM votes GROUP BY category, menu")
+        for category, menu, n in cur:
+            by_category.setdefault(category, Counter())[menu] = n
+            total[menu] += n
+        return by_category, total
+
+    def import_csv(self, path: str) -> int:
+        """기존 vote_result.csv(카테고리, 메뉴[, 시각]) 가져오기. 가져온 행 수 반환"""
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = [[r["카테고리"], r["메뉴"], r.get("시각") or ""]
+                    for r in csv.DictReader(f) if r.get("카테고리") and r.get("메뉴")]
+        self.append(rows)
+        return len(rows)
+
+
+class MirroredVoteStore(VoteStore):
+    """primary에 바로 쓰고, 같은 행을 writer(VoteWriter)로 다른 저장소에 비동기 동기화"""
+
+    def __init__(self, primary: VoteStore, writer):
+        self.primary = primary
+        self.writer  = writer
+
+    def append(self, rows: list):
+        self.primary.append(rows)
+        for row in rows:
+            self.writer.submit(row)
+
+    def read_since(self, offset: int) -> list:
+        return self.primary.read_since(offset)
+
+    def version(self):
+        return self.primary.version()
+
+    def counts(self):
+        return self.primary.counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 SQLite 투표 저장소 관리")
+    parser.add_argument("--db", default=VOTE_DB_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="CSV 투표 결과 가져오기")
+    imp.add_argument("csv", nargs="?", default=os.path.join(BASE_DIR, "data", "vote_result.csv"))
+    sub.add_parser("counts", help="메뉴별 투표 수 출력")
+    args = parser.parse_args()
+
+    store = SQLiteVoteStore(args.db)
+    if args.cmd == "import":
+        print(f"✅ {store.import_csv(args.csv)}건 가져옴 → {args.db}")
+    else:
+        by_category, _ = store.counts()
+        for category, counter in by_category.items():
+            print(f"[{category}]")
+            for menu, n in counter.most_common():
+                print(f"  {menu}: {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,25 +8,13 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+import hmac
 import os
-import platform
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from pages import visual, map_ui, mbti, specialty
+from core.metrics import Registry, bind_session, timed
+from core.startup import load_page
 
-# setup_fonts 함수 수정
-def setup_fonts():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    local_font_path = os.path.join(base_dir, "assets", "fonts", "NanumGothic.ttf")
-
-    if os.path.exists(local_font_path):
-        fm.fontManager.addfont(local_font_path)
-        nanum_font = fm.FontProperties(fname=local_font_path)
-        plt.rcParams['font.family'] = nanum_font.get_name()
-        plt.rcParams["axes.unicode_minus"] = False
-        print(f"✅ matplotlib에 폰트 직접 등록: {nanum_font.get_name()}")
-    else:
-        print("❌ NanumGothic.ttf 경로를 찾을 수 없습니다.")
+# 진단 페이지 접근 토큰 (설정했을 때만 ?diag=<토큰>으로 진입, 없으면 진단 페이지 꺼짐)
+DIAGNOSTICS_TOKEN = os.getenv("DIAGNOSTICS_TOKEN") or None
 
 
 # ✅ 사이드바 자체 숨기기 (Streamlit 기본 탐색 제거)
@@ -114,17 +102,25 @@ def show_home():
 
 # ✅ 메인 실행 함수
 def main():
-    setup_fonts()
-    if st.session_state.page == "home":
-        show_home()
-    elif st.session_state.page == "visual":
-        visual.run()
-    elif st.session_state.page == "map":
-        map_ui.run()
-    elif st.session_state.page == "mbti":
-        mbti.run()
-    elif st.session_state.page == "specialty":
-        specialty.run()
+    # 숨은 진단 페이지: 카드 없이 쿼리 파라미터로만 진입 (토큰이 맞은 세션만)
+    diag = st.query_params.get("diag")
+    if DIAGNOSTICS_TOKEN and diag and hmac.compare_digest(diag.encode(), DIAGNOSTICS_TOKEN.encode()):
+        st.session_state.diagnostics_authorized = True
+        st.session_state.page = "diagnostics"
+
+    # 이번 rerun의 측정은 프로세스 + 이 세션 레지스트리에 함께 기록
+    if "metrics" not in st.session_state:
+        st.session_state.metrics = Registry()
+    with bind_session(st.session_state.metrics), timed("main.rerun"):
+        page = st.session_state.page
+        if page == "home":
+            with timed("page.home.run"):
+                show_home()
+        else:
+            # 페이지 모듈은 처음 이동할 때 import (홈만 보는 사용자는 folium/gspread 등을 불러오지 않음)
+            module = load_page(page)
+            with timed(f"page.{page}.run"):
+                module.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
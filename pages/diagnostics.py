@@ -0,0 +1,75 @@
+import json
+import pandas as pd
+import streamlit as st
+from core.chart_cache import get_chart_cache
+from core.metrics import process_registry, to_json, to_prometheus
+from core.startup import import_report
+
+SUMMARY_COLUMNS = ["count", "errors", "avg_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+# ✅ 연산별 요약 표
+def metrics_table(registry) -> pd.DataFrame:
+    snap = registry.snapshot()
+    if not snap:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df = pd.DataFrame.from_dict(snap, orient="index")[SUMMARY_COLUMNS]
+    df.index.name = "연산"
+    return df.sort_values("count", ascending=False).round(2)
+
+# ✅ 이벤트 카운터 (투표 거절/제한 등)
+def show_counters(registry):
+    counters = registry.counters()
+    if counters:
+        st.markdown("**이벤트 카운터**")
+        st.dataframe(pd.Series(counters, name="횟수").rename_axis("이벤트"), use_container_width=True)
+
+# ✅ 실행 함수
+def run():
+    # main.py에서 ?diag=<DIAGNOSTICS_TOKEN>이 맞은 세션만 (초기화 버튼 포함)
+    if not st.session_state.get("diagnostics_authorized"):
+        st.session_state.page = "home"
+        st.rerun()
+
+    st.markdown("<h1 style='text-align:center;'>ㅤ🩺 진단</h1>", unsafe_allow_html=True)
+
+    process = process_registry()
+    session = st.session_state.get("metrics")
+    uptime_min = to_json(process)["uptime_s"] / 60
+    st.caption(f"측정 시작 후 {uptime_min:.1f}분 · 지연 시간 단위 ms (분위수는 버킷 기준 근사값)")
+
+    tab_process, tab_session, tab_etc = st.tabs(["프로세스 전체", "이 세션", "캐시 / 로딩"])
+    with tab_process:
+        st.dataframe(metrics_table(process), use_container_width=True)
+        show_counters(process)
+    with tab_session:
+        if session is not None:
+            st.dataframe(metrics_table(session), use_container_width=True)
+            show_counters(session)
+    with tab_etc:
+        st.markdown("**차트 캐시**")
+        st.json(get_chart_cache().stats())
+        st.markdown("**페이지 첫 import 시간 (ms)**")
+        st.json({name: round(ms, 1) for name, ms in import_report().items()})
+
+    # ✅ 내보내기
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("⬇️ JSON", json.dumps(to_json(process), ensure_ascii=False, indent=2),
+                           file_name="metrics.json", mime="application/json", use_container_width=True)
+    with col2:
+        st.download_button("⬇️ Prometheus", to_prometheus(process),
+                           file_name="metrics.prom", mime="text/plain", use_container_width=True)
+    with col3:
+        if st.button("🧹 프로세스 측정 초기화", use_container_width=True):
+            process.reset()
+            st.rerun()
+
+    with st.expander("Prometheus 텍스트 보기"):
+        st.code(to_prometheus(process), language="text")
+
+    # ✅ 홈으로 돌아가기
+    st.markdown("---")
+    if st.button("🏠 홈으로 돌아가기"):
+        st.query_params.clear()
+        st.session_state.page = "home"
+        st.rerun()
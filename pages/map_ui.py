@@ -2,38 +2,65 @@
 
 import streamlit as st
 import pandas as pd
-import requests
 import os
 from dotenv import load_dotenv
 import folium
-from streamlit_folium import st_folium
-from geopy.distance import distance
-from geopy import Point
+import streamlit.components.v1 as components
 from streamlit_geolocation import streamlit_geolocation
-import platform
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-
-# setup_fonts 함수 수정
-def setup_fonts():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    local_font_path = os.path.join(base_dir, "assets", "fonts", "NanumGothic.ttf")
-
-    if os.path.exists(local_font_path):
-        fm.fontManager.addfont(local_font_path)
-        nanum_font = fm.FontProperties(fname=local_font_path)
-        plt.rcParams['font.family'] = nanum_font.get_name()
-        plt.rcParams["axes.unicode_minus"] = False
-        print(f"✅ matplotlib에 폰트 직접 등록: {nanum_font.get_name()}")
+from core.catalog import get_catalog
+from core.met import ACTIVITIES, burn_rate_table
+from core.burn_rate import BURN_RATE_CACHE_PATH, BurnRateCache, NutritionixClient
+from core.routing import RouteClient, profile_for, route_key
+from core.geometry import radius_m, simplify_for_zoom, zoom_for_span
+from core.local_router import LocalRouter
+
+# ✅ 프로세스 전역 Nutritionix 클라이언트 (연결 재사용 + 소모율 캐시)
+@st.cache_resource
+def get_nutritionix_client():
+    load_dotenv()
+    cache = BurnRateCache(disk_path=BURN_RATE_CACHE_PATH or None)
+    return NutritionixClient(os.getenv("NUTRITIONIX_APP_ID"), os.getenv("NUTRITIONIX_APP_KEY"), cache=cache)
+
+# 🔥 운동량 계산 API (분당 소모 칼로리, 실패 시 None)
+def get_burn_rate(query, profile):
+    return get_nutritionix_client().burn_rate(query, profile)
+
+# ✅ 프로세스 전역 경로 클라이언트
+# LOCAL_ROAD_GRAPH가 있으면 로컬 도로 그래프로 계산, 없으면 ORS (경로 캐시 + 4방향 동시 요청)
+@st.cache_resource
+def get_route_client():
+    load_dotenv()
+    graph_path = os.getenv("LOCAL_ROAD_GRAPH")
+    if graph_path:
+        return LocalRouter.from_file(graph_path)
+    return get_ors_client()
+
+# 로컬 그래프 범위 밖 출발점은 ORS로 (키가 없으면 출발/도착 표시만)
+@st.cache_resource
+def get_ors_client():
+    load_dotenv()
+    return RouteClient(os.getenv("ORS_API_KEY"))
+
+# ✅ 지도 HTML은 경로 키마다 한 번만 만들어 재사용
+# 같은 문자열이면 Streamlit이 메시지 캐시로 브라우저에 다시 보내지 않음 (rerun마다 지도 재전송 X)
+@st.cache_resource(max_entries=64)
+def build_map_html(key: tuple, _start, _end, _coords) -> str:
+    zoom = zoom_for_span(2 * radius_m(_start, _coords), _start[0])
+
+    m = folium.Map(location=list(_start), zoom_start=zoom)
+    folium.Marker(list(_start), tooltip="🍽️ 출발!", icon=folium.Icon(color="blue")).add_to(m)
+    if _end != _start:
+        folium.Marker(list(_end), tooltip="🎯 도착!", icon=folium.Icon(color="red")).add_to(m)
+    if len(_coords):
+        # 화면 1픽셀보다 작은 굴곡은 제거 (긴 달리기 경로도 가벼운 페이로드)
+        folium.PolyLine(simplify_for_zoom(_coords, zoom).round(6).tolist(), color="green", weight=5).add_to(m)
     else:
-        print("❌ NanumGothic.ttf 경로를 찾을 수 없습니다.")
+        folium.PolyLine([list(_start), list(_end)], color="gray", dash_array="5").add_to(m)
+    return m.get_root().render()
+
 def run():
-    setup_fonts()  # ✅ 한글 폰트 깨짐 방지
     # 🔐 환경변수 불러오기
     load_dotenv()
-    APP_ID = os.getenv("NUTRITIONIX_APP_ID")
-    APP_KEY = os.getenv("NUTRITIONIX_APP_KEY")
-    ORS_API_KEY = os.getenv("ORS_API_KEY")
 
     # ✅ 상태 초기화
     if "info_submitted" not in st.session_state:
@@ -43,34 +70,6 @@ def run():
     if "menu_shown" not in st.session_state:
         st.session_state.menu_shown = False
 
-    # 📦 데이터 로딩
-    @st.cache_data
-    def load_data():
-        base = os.path.dirname(os.path.abspath(__file__))
-        path = os.path.join(base, "..", "data", "McDelivery Nutritional Information Table.csv")
-        df = pd.read_csv(path)
-        df['가격'] = df['가격'].astype(str).str.replace(",", "").astype(int)
-        df['칼로리(Kcal)'] = df['칼로리(Kcal)'].astype(str).str.replace(r"[^\d.]", "", regex=True)
-        df['칼로리(Kcal)'] = pd.to_numeric(df['칼로리(Kcal)'], errors='coerce')
-        return df.dropna(subset=['칼로리(Kcal)'])
-
-    # 🔥 운동량 계산 API
-    def get_burn_rate(query, profile):
-        headers = {
-            "x-app-id": APP_ID,
-            "x-app-key": APP_KEY,
-            "Content-Type": "application/json"
-        }
-        payload = {"query": f"{query} 30 minutes", **profile}
-        res = requests.post("https://trackapi.nutritionix.com/v2/natural/exercise", json=payload, headers=headers)
-        if res.status_code == 200:
-            data = res.json()
-            if data.get("exercises"):
-                kcal = data["exercises"][0]["nf_calories"]
-                minutes = data["exercises"][0]["duration_min"]
-                return kcal / minutes
-        return None
-
     # 🖼️ 앱 타이틀
     st.markdown(
         """
@@ -107,20 +106,20 @@ def run():
 
     # 🍔 메뉴 선택
     if st.session_state.menu_shown:
-        df = load_data()
+        catalog = get_catalog()
         with st.expander("🍽️ 먹은 메뉴를 선택해주세요!", expanded=True):
-            burger = st.selectbox("🍔 버거", ["(선택 안 함)"] + df[df['카테고리'] == "버거 & 세트"]['메뉴'].tolist())
-            drink = st.selectbox("🥤 음료", ["(선택 안 함)"] + df[df['카테고리'].str.contains("음료", na=False)]['메뉴'].tolist())
-            side = st.selectbox("🍟 사이드", ["(선택 안 함)"] + df[df['카테고리'].str.contains("사이드", na=False)]['메뉴'].tolist())
-            dessert = st.selectbox("🍰 디저트", ["(선택 안 함)"] + df[df['카테고리'].str.contains("디저트", na=False)]['메뉴'].tolist())
+            burger = st.selectbox("🍔 버거", ["(선택 안 함)"] + catalog.menus("버거 & 세트"))
+            drink = st.selectbox("🥤 음료", ["(선택 안 함)"] + catalog.menus_matching("음료"))
+            side = st.selectbox("🍟 사이드", ["(선택 안 함)"] + catalog.menus_matching("사이드"))
+            dessert = st.selectbox("🍰 디저트", ["(선택 안 함)"] + catalog.menus_matching("디저트"))
 
         selected_items = []
         total_kcal = 0
         for item in [burger, drink, side, dessert]:
             if item and item != "(선택 안 함)":
-                row = df[df['메뉴'] == item]
-                if not row.empty:
-                    kcal = row.iloc[0]["칼로리(Kcal)"]
+                row = catalog.row(item)
+                if row is not None:
+                    kcal = catalog.kcal[row]
                     total_kcal += kcal
                     selected_items.append((item, kcal))
                     st.success(f"✅ {item} 선택 완료!")
@@ -132,12 +131,21 @@ def run():
 
         # 🗺️ 지도 출력
         with st.expander("🗺️ 도보 경로 보기", expanded=False):
-            exercise_map = {"걷기 🚶": ("walking", 5), "달리기 🏃": ("running", 10)}
+            exercise_map = {a.label: a for a in ACTIVITIES}
             exercise_choice = st.selectbox("🔥 어떤 운동으로 소모할까요?", list(exercise_map.keys()))
-            eng_query, speed_kmph = exercise_map[exercise_choice]
+            activity = exercise_map[exercise_choice]
+            speed_kmph = activity.speed_kmph
             profile = {"gender": gender, "age": int(age), "weight_kg": float(weight), "height_cm": float(height)}
 
-            burn_per_min = get_burn_rate(eng_query, profile)
+            # ✅ 기본은 로컬 MET 계산 (네트워크 없음), 키가 있으면 Nutritionix로 보정 가능
+            burn_per_min = burn_rate_table(profile)[activity.key]
+            if os.getenv("NUTRITIONIX_APP_ID") and os.getenv("NUTRITIONIX_APP_KEY"):
+                if st.toggle("🔬 Nutritionix로 보정하기", value=False):
+                    refined = get_burn_rate(activity.query, profile)
+                    if refined:
+                        burn_per_min = refined
+                    else:
+                        st.caption("⚠️ Nutritionix 응답이 없어 MET 기준 값을 사용합니다.")
 
             if selected_items and burn_per_min and st.session_state.location:
                 required_time = total_kcal / burn_per_min
@@ -153,30 +161,26 @@ def run():
                 with card3:
                     st.metric("📏 예상 거리", f"{distance_km:.2f} km")
 
-                start = Point(st.session_state.location["latitude"], st.session_state.location["longitude"])
-                end = distance(kilometers=distance_km).destination(start, bearing)
-                coords = [[start.longitude, start.latitude], [end.longitude, end.latitude]]
-
-                try:
-                    res = requests.post(
-                        "https://api.openrouteservice.org/v2/directions/foot-walking/geojson",
-                        json={"coordinates": coords},
-                        headers={"Authorization": ORS_API_KEY, "Content-Type": "application/json"}
-                    )
-                    geojson = res.json()
-                    route = [(lat, lon) for lon, lat in geojson['features'][0]['geometry']['coordinates']]
-                except:
-                    route = []
-
-                m = folium.Map(location=[start.latitude, start.longitude], zoom_start=14)
-                folium.Marker([start.latitude, start.longitude], tooltip="🍽️ 출발!", icon=folium.Icon(color="blue")).add_to(m)
-                folium.Marker([end.latitude, end.longitude], tooltip="🎯 도착!", icon=folium.Icon(color="red")).add_to(m)
-                if route:
-                    folium.PolyLine(route, color="green", weight=5).add_to(m)
-                else:
-                    folium.PolyLine([[start.latitude, start.longitude], [end.latitude, end.longitude]],
-                                    color="gray", dash_array="5").add_to(m)
-                st_folium(m, width=700, height=500)
+                # 🗺️ 경로: 4방향을 한 번에 미리 받아 두어 방향을 바꾸면 캐시에서 바로 표시
+                lat, lon = st.session_state.location["latitude"], st.session_state.location["longitude"]
+                ors_profile = profile_for(activity.key)
+                router, result, mode = get_route_client(), None, "out"
+                if isinstance(router, LocalRouter):
+                    if st.checkbox("🔁 출발점으로 돌아오는 코스", value=False, key="map_loop"):
+                        result, mode = router.loop(lat, lon, bearing, distance_km, ors_profile), "loop"
+                    else:
+                        result = router.route(lat, lon, bearing, distance_km, ors_profile)
+                    if result is None:
+                        st.caption("⚠️ 출발점이 로컬 도로 그래프 범위 밖이라 ORS 경로로 표시합니다.")
+                        router, mode = get_ors_client(), "out"
+                if result is None:
+                    router.prefetch(lat, lon, direction_map.values(), distance_km, ors_profile)
+                    result = router.route(lat, lon, bearing, distance_km, ors_profile)
+                start, end, route = result
+
+                key = (mode, type(router).__name__,
+                       *route_key(ors_profile, lat, lon, bearing, distance_km), len(route))
+                components.html(build_map_html(key, start, end, route), height=500)
             else:
                 st.info("🍴 메뉴를 선택하고 위치를 적용해주세요!")
 
@@ -1,20 +1,51 @@
 import os
+import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-
-# ✅ 폰트 설정
-def setup_fonts():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    local_font_path = os.path.join(base_dir, "assets", "fonts", "NanumGothic.ttf")
-    if os.path.exists(local_font_path):
-        fm.fontManager.addfont(local_font_path)
-        nanum_font = fm.FontProperties(fname=local_font_path)
-        plt.rcParams['font.family'] = nanum_font.get_name()
-        plt.rcParams["axes.unicode_minus"] = False
-        print(f"✅ matplotlib에 폰트 직접 등록: {nanum_font.get_name()}")
-    else:
-        print("❌ NanumGothic.ttf 경로를 찾을 수 없습니다.")
+from core.assets import image_variant
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 퀴즈 방식: "form"(기본, 12문항을 한 번에 제출) | "step"(한 문항씩 카드 선택)
+MBTI_QUIZ_MODE = os.getenv("MBTI_QUIZ_MODE", "form")
+
+# ✅ 질문 표
+QUESTIONS = [
+    {"q": "모임에 초대받았을 때 당신은?", "opts": ["A. 좋아! 사람들과 어울리면 에너지가 나요.", "B. 부담돼요. 혼자가 편해요."], "type": "EI"},
+    {"q": "대화할 때 나는?", "opts": ["A. 즉흥적으로 말이 술술 나와요.", "B. 생각 정리 후 말해요."], "type": "EI"},
+    {"q": "정보를 받아들일 때 나는?", "opts": ["A. 눈에 보이는 사실이 중요해요.", "B. 의미와 가능성이 더 궁금해요."], "type": "SN"},
+    {"q": "설명서를 읽을 때 나는?", "opts": ["A. 순서대로 꼼꼼히 읽어요.", "B. 대충 보고 감으로 파악해요."], "type": "SN"},
+    {"q": "친구가 고민 상담할 때 나는?", "opts": ["A. 객관적인 해결책을 말해줘요.", "B. 감정을 공감해줘요."], "type": "TF"},
+    {"q": "결정을 내릴 때 나는?", "opts": ["A. 논리적으로 분석해요.", "B. 사람 마음과 분위기를 고려해요."], "type": "TF"},
+    {"q": "여행 계획을 세울 때 나는?", "opts": ["A. 일정을 미리 정해놓고 움직여요.", "B. 즉흥적으로 즐겨요."], "type": "JP"},
+    {"q": "과제를 할 때 나는?", "opts": ["A. 마감 전 미리 끝내야 마음 편해요.", "B. 마감 직전이 집중이 잘 돼요."], "type": "JP"},
+    {"q": "메뉴를 고를 때 나는?", "opts": ["A. 새로운 걸 도전해보고 싶어요!", "B. 먹던 거 또 먹어야 안심돼요."], "type": "JP"},
+    {"q": "계획이 바뀌면?", "opts": ["A. 스트레스 받아요. 원래대로 해야 해요.", "B. 뭐 어때요~ 즉흥도 재밌죠."], "type": "JP"},
+    {"q": "실수했을 때 나는?", "opts": ["A. 원인 분석부터 해요.", "B. 스스로를 위로해요."], "type": "TF"},
+    {"q": "점심 메뉴를 친구가 정해준다면?", "opts": ["A. 편해서 좋아요!", "B. 내가 고르는 게 더 좋아요!"], "type": "EI"},
+]
+
+# ✅ 미리 컴파일한 채점 표: 문항별 축 번호(EI=0, SN=1, TF=2, JP=3)
+AXES     = ["EI", "SN", "TF", "JP"]
+AXIS_IDX = np.array([AXES.index(q["type"]) for q in QUESTIONS])
+
+# ✅ 유형별 버거
+BURGER_MAP = {
+    "INTJ": ("ㅤ더블 1955 버거", "차갑고 진한 고기맛처럼 계획적"),
+    "INTP": ("ㅤ트리플 치즈버거", "치즈처럼 말랑하지만 복잡함"),
+    "ENTJ": ("ㅤ쿼터파운더 치즈", "한 입에 존재감 폭발, 리더맛"),
+    "ENTP": ("ㅤ슈비 버거", "새우+소고기 조합처럼 상상초월"),
+    "INFJ": ("ㅤ토마토 치즈 비프 버거", "부드럽고 진지한 속마음 토핑"),
+    "INFP": ("ㅤ불고기 버거", "달달하고 감성 터지는 맛"),
+    "ENFJ": ("ㅤ빅맥", "모두 챙기는 층층한 다정함"),
+    "ENFP": ("ㅤ맥스파이시 상하이 버거", "매콤하고 톡톡 튀는 자유인"),
+    "ISTJ": ("ㅤ맥치킨", "늘 같은 자리, 기본에 진심"),
+    "ISFJ": ("ㅤ슈슈 버거", "바삭함 속 따뜻한 배려심"),
+    "ESTJ": ("ㅤ더블 치즈버거", "정석대로 두 배로 확실하게"),
+    "ESFJ": ("ㅤ맥크리스피 클래식 버거", "딱 맞는 조합, 모두를 위해"),
+    "ISTP": ("ㅤ더블 불고기 버거", "조용하지만 실속 가득"),
+    "ISFP": ("ㅤ치즈버거", "소박하지만 감성 깊은 맛"),
+    "ESTP": ("ㅤ맥크리스피 디럭스 버거", "바삭! 지금 아니면 못 참음"),
+    "ESFP": ("ㅤ더블 맥스파이시 상하이 버거", "매운 맛도 즐기는 인싸감성")
+}
 
 # ✅ CSS 삽입
 def inject_css():
@@ -54,27 +85,48 @@ def inject_css():
         </style>
     """, unsafe_allow_html=True)
 
+# ✅ 채점: 답(문항별 0=A, 1=B) → MBTI 문자열. 축마다 A(앞 글자)가 같거나 많으면 앞 글자
+def score_answers(choices) -> str:
+    choices = np.asarray(choices)
+    first  = np.bincount(AXIS_IDX, weights=choices == 0, minlength=len(AXES))
+    second = np.bincount(AXIS_IDX, weights=choices == 1, minlength=len(AXES))
+    return "".join(axis[0] if a >= b else axis[1] for axis, a, b in zip(AXES, first, second))
+
+# ✅ 16개 유형 결과(버거, 설명, 이미지 변형본)는 프로세스당 한 번만 만듦
+@st.cache_resource
+def get_result_payloads() -> dict:
+    payloads = {}
+    for mbti, (burger, label) in BURGER_MAP.items():
+        img_path = os.path.join(BASE_DIR, "data", "mbti_images", f"{mbti}.png")
+        image = image_variant(img_path, 480) if os.path.exists(img_path) else None
+        payloads[mbti] = {"burger": burger, "label": label, "image": image}
+    return payloads
+
+# ✅ 퀴즈 상태 초기화
+def reset_quiz(mbti_page: str = "intro"):
+    st.session_state.mbti_page = mbti_page
+    st.session_state.answers = []
+    st.session_state.mbti_type = None
+    for key in list(st.session_state.keys()):
+        if key.startswith("sel_") or key.startswith("q_"):
+            del st.session_state[key]
+
 # ✅ 홈 버튼
-def home_button():
+def home_button(key: str = None):
     st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("🏠 홈으로 돌아가기"):
+    if st.button("🏠 홈으로 돌아가기", key=key):
         st.session_state.page = "home"
-        st.session_state.mbti_page = "intro"
-        st.session_state.answers = []
-        st.session_state.mbti_scores = {c: 0 for c in "EISNTFJP"}
-        for key in list(st.session_state.keys()):
-            if key.startswith("sel_"):
-                del st.session_state[key]
+        reset_quiz()
         st.rerun()
 
 # ✅ intro 페이지
-def show_intro(base_dir: str):
+def show_intro():
     st.markdown("<h1 style='text-align:center;'>ㅤ나의 <span style='color:#ffcf48;'>McBTI</span>는?</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#888;'>버거로 알아보는 나의 성격 유형!</p>", unsafe_allow_html=True)
 
-    img_path = os.path.join(base_dir, "..", "data", "burgers.png")
+    img_path = os.path.join(BASE_DIR, "data", "burgers.png")
     if os.path.exists(img_path):
-        st.image(img_path, use_column_width=True, caption="당신을 기다리는 버거들")
+        st.image(image_variant(img_path, 720), use_column_width=True, caption="당신을 기다리는 버거들")
 
     st.markdown('''
         <div class="option-card" style="text-align:center;">
@@ -85,35 +137,36 @@ def show_intro(base_dir: str):
     ''', unsafe_allow_html=True)
 
     if st.button("🔥 테스트 시작하기", use_container_width=True):
-        st.session_state.mbti_page = "quiz"
-        st.session_state.answers = []
-        st.session_state.mbti_scores = {c: 0 for c in "EISNTFJP"}
-        for key in list(st.session_state.keys()):
-            if key.startswith("sel_"):
-                del st.session_state[key]
+        reset_quiz("quiz")
         st.rerun()
 
     home_button()
 
-# ✅ 질문 페이지
-def show_quiz(base_dir: str):
-    questions = [
-        {"q": "모임에 초대받았을 때 당신은?", "opts": ["A. 좋아! 사람들과 어울리면 에너지가 나요.", "B. 부담돼요. 혼자가 편해요."], "type": "EI"},
-        {"q": "대화할 때 나는?", "opts": ["A. 즉흥적으로 말이 술술 나와요.", "B. 생각 정리 후 말해요."], "type": "EI"},
-        {"q": "정보를 받아들일 때 나는?", "opts": ["A. 눈에 보이는 사실이 중요해요.", "B. 의미와 가능성이 더 궁금해요."], "type": "SN"},
-        {"q": "설명서를 읽을 때 나는?", "opts": ["A. 순서대로 꼼꼼히 읽어요.", "B. 대충 보고 감으로 파악해요."], "type": "SN"},
-        {"q": "친구가 고민 상담할 때 나는?", "opts": ["A. 객관적인 해결책을 말해줘요.", "B. 감정을 공감해줘요."], "type": "TF"},
-        {"q": "결정을 내릴 때 나는?", "opts": ["A. 논리적으로 분석해요.", "B. 사람 마음과 분위기를 고려해요."], "type": "TF"},
-        {"q": "여행 계획을 세울 때 나는?", "opts": ["A. 일정을 미리 정해놓고 움직여요.", "B. 즉흥적으로 즐겨요."], "type": "JP"},
-        {"q": "과제를 할 때 나는?", "opts": ["A. 마감 전 미리 끝내야 마음 편해요.", "B. 마감 직전이 집중이 잘 돼요."], "type": "JP"},
-        {"q": "메뉴를 고를 때 나는?", "opts": ["A. 새로운 걸 도전해보고 싶어요!", "B. 먹던 거 또 먹어야 안심돼요."], "type": "JP"},
-        {"q": "계획이 바뀌면?", "opts": ["A. 스트레스 받아요. 원래대로 해야 해요.", "B. 뭐 어때요~ 즉흥도 재밌죠."], "type": "JP"},
-        {"q": "실수했을 때 나는?", "opts": ["A. 원인 분석부터 해요.", "B. 스스로를 위로해요."], "type": "TF"},
-        {"q": "점심 메뉴를 친구가 정해준다면?", "opts": ["A. 편해서 좋아요!", "B. 내가 고르는 게 더 좋아요!"], "type": "EI"},
-    ]
+# ✅ 질문 페이지 (한 번에 제출): 12문항을 폼 하나로 받아서 제출할 때 한 번만 실행
+def show_quiz_form():
+    with st.form("mbti_form"):
+        for idx, q in enumerate(QUESTIONS):
+            st.radio(f"{idx+1}. {q['q']}", [0, 1], index=None, key=f"q_{idx}",
+                     format_func=lambda i, opts=q["opts"]: opts[i])
+        submitted = st.form_submit_button("🍔 결과 보기", use_container_width=True)
+
+    if submitted:
+        answers = [st.session_state.get(f"q_{idx}") for idx in range(len(QUESTIONS))]
+        missing = [str(idx + 1) for idx, a in enumerate(answers) if a is None]
+        if missing:
+            st.warning(f"아직 고르지 않은 문항이 있어요: {', '.join(missing)}번")
+        else:
+            st.session_state.answers = answers
+            st.session_state.mbti_type = score_answers(answers)
+            st.session_state.mbti_page = "result"
+            st.rerun()
+
+    home_button()
 
+# ✅ 질문 페이지 (한 문항씩)
+def show_quiz_step():
     idx = len(st.session_state.answers)
-    current = questions[idx]
+    current = QUESTIONS[idx]
     st.markdown(f"<h4>{idx+1}. {current['q']}</h4>", unsafe_allow_html=True)
 
     sel_key = f"sel_{idx}"
@@ -126,55 +179,28 @@ def show_quiz(base_dir: str):
         st.markdown(f'<div class="{card_cls}" onclick="document.getElementById(\'{btn_id}\').click()">{opt}</div>', unsafe_allow_html=True)
         if st.button("선택", key=btn_id):
             st.session_state[sel_key] = opt
-            st.session_state.answers.append(opt)
-            mbti_type = current["type"]
-            if i == 0:
-                st.session_state.mbti_scores[mbti_type[0]] += 1
+            st.session_state.answers.append(i)
+            if idx + 1 < len(QUESTIONS):
+                st.session_state.mbti_page = "quiz"
             else:
-                st.session_state.mbti_scores[mbti_type[1]] += 1
-            st.session_state.mbti_page = "quiz" if idx + 1 < len(questions) else "result"
+                st.session_state.mbti_type = score_answers(st.session_state.answers)
+                st.session_state.mbti_page = "result"
             st.rerun()
 
     home_button()
 
 # ✅ 결과 페이지
-def show_result(base_dir: str):
-    scores = st.session_state.mbti_scores
-    mbti = "".join([
-        "E" if scores["E"] >= scores["I"] else "I",
-        "S" if scores["S"] >= scores["N"] else "N",
-        "T" if scores["T"] >= scores["F"] else "F",
-        "J" if scores["J"] >= scores["P"] else "P",
-    ])
-
-    burger_map = {
-        "INTJ": ("ㅤ더블 1955 버거", "차갑고 진한 고기맛처럼 계획적"),
-        "INTP": ("ㅤ트리플 치즈버거", "치즈처럼 말랑하지만 복잡함"),
-        "ENTJ": ("ㅤ쿼터파운더 치즈", "한 입에 존재감 폭발, 리더맛"),
-        "ENTP": ("ㅤ슈비 버거", "새우+소고기 조합처럼 상상초월"),
-        "INFJ": ("ㅤ토마토 치즈 비프 버거", "부드럽고 진지한 속마음 토핑"),
-        "INFP": ("ㅤ불고기 버거", "달달하고 감성 터지는 맛"),
-        "ENFJ": ("ㅤ빅맥", "모두 챙기는 층층한 다정함"),
-        "ENFP": ("ㅤ맥스파이시 상하이 버거", "매콤하고 톡톡 튀는 자유인"),
-        "ISTJ": ("ㅤ맥치킨", "늘 같은 자리, 기본에 진심"),
-        "ISFJ": ("ㅤ슈슈 버거", "바삭함 속 따뜻한 배려심"),
-        "ESTJ": ("ㅤ더블 치즈버거", "정석대로 두 배로 확실하게"),
-        "ESFJ": ("ㅤ맥크리스피 클래식 버거", "딱 맞는 조합, 모두를 위해"),
-        "ISTP": ("ㅤ더블 불고기 버거", "조용하지만 실속 가득"),
-        "ISFP": ("ㅤ치즈버거", "소박하지만 감성 깊은 맛"),
-        "ESTP": ("ㅤ맥크리스피 디럭스 버거", "바삭! 지금 아니면 못 참음"),
-        "ESFP": ("ㅤ더블 맥스파이시 상하이 버거", "매운 맛도 즐기는 인싸감성")
-    }
-
-    burger, label = burger_map[mbti]
+def show_result():
+    mbti = st.session_state.mbti_type
+    result = get_result_payloads()[mbti]
+    burger, label = result["burger"], result["label"]
 
     st.markdown("<h2 style='text-align:center;'>ㅤ당신의 버거 유형은?</h2>", unsafe_allow_html=True)
 
-    img_path = os.path.join(base_dir, "..", "data", "mbti_images", f"{mbti}.png")
     cols = st.columns([1, 2, 1])
     with cols[1]:
-        if os.path.exists(img_path):
-            st.image(img_path, caption=f"{mbti} 타입", use_column_width=True)
+        if result["image"]:
+            st.image(result["image"], caption=f"{mbti} 타입", use_column_width=True)
 
         st.markdown(f"""
             <div style='text-align:center;'>
@@ -193,42 +219,31 @@ def show_result(base_dir: str):
 
         with col1:
             if st.button("🔄 다시 테스트하기", key="retry_button"):
-                st.session_state.mbti_page = "intro"
-                st.session_state.answers = []
-                st.session_state.mbti_scores = {c: 0 for c in "EISNTFJP"}
-                for key in list(st.session_state.keys()):
-                    if key.startswith("sel_"):
-                        del st.session_state[key]
+                reset_quiz()
                 st.rerun()
 
         with col2:
             if st.button("🏠 홈으로 돌아가기", key="home_button"):
                 st.session_state.page = "home"
-                st.session_state.mbti_page = "intro"
-                st.session_state.answers = []
-                st.session_state.mbti_scores = {c: 0 for c in "EISNTFJP"}
-                for key in list(st.session_state.keys()):
-                    if key.startswith("sel_"):
-                        del st.session_state[key]
+                reset_quiz()
                 st.rerun()
 
 
 # ✅ 실행 엔트리포인트
 def run():
-    setup_fonts()
     inject_css()
 
     if "mbti_page" not in st.session_state:
-        st.session_state.mbti_page = "intro"
-        st.session_state.answers = []
-        st.session_state.mbti_scores = {c: 0 for c in "EISNTFJP"}
+        reset_quiz()
 
-    base_dir = os.path.dirname(__file__)
     page = st.session_state.mbti_page
 
     if page == "intro":
-        show_intro(base_dir)
+        show_intro()
     elif page == "quiz":
-        show_quiz(base_dir)
+        if MBTI_QUIZ_MODE == "step":
+            show_quiz_step()
+        else:
+            show_quiz_form()
     else:
-        show_result(base_dir)
\ No newline at end of file
+        show_result()
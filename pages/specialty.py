@@ -1,12 +1,15 @@
 import os
-import platform
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import streamlit as st
-from sklearn.preprocessing import MinMaxScaler
-import matplotlib.font_manager as fm
+from core.assets import image_variant
+from core.catalog import get_catalog
+from core.chart_cache import chart_key, get_chart_cache
+from core.combo import COMBO_SLOTS, get_combo_optimizer
+from core.range_index import get_range_index
+from core.scoring import get_scoring_engine
 
 # 메뉴별 이모지 추가
 CATEGORY_EMOJIS = {
@@ -16,34 +19,8 @@ CATEGORY_EMOJIS = {
     "음료": "🥤",
     "맥모닝 & 세트": "🥪",
     }
-# ─────────────────────────────────────────────────────
-# 전역 CSS: 카드 hover 효과 + nutrient-text 스타일
-st.markdown("""
-<style>
-.menu-card {
-    border-radius: 16px;
-    overflow: hidden;
-    transition: transform 0.2s, box-shadow 0.2s;
-}
-.menu-card:hover {
-    transform: scale(1.02);
-    box-shadow: 0 4px 16px rgba(0,0,0,0.2);
-}
-.nutrient-text {
-    background-color: #ffffff !important;
-    color: #333333 !important;
-    padding: 8px;
-    border-radius: 8px;
-    margin-left: 16px;
-    margin-top: 24px;
-    margin-bottom: 4px;
-}
-</style>
-""", unsafe_allow_html=True)
-
 # ─────────────────────────────────────────────────────
 # 상수 정의
-DATA_REL_PATH = os.path.join("..", "data", "McDelivery Nutritional Information Table.csv")
 NUTRIENTS      = ["칼로리(Kcal)", "단백질", "지방", "나트륨"]
 
 STYLE = {
@@ -92,33 +69,30 @@ STYLE = {
 }
 # ─────────────────────────────────────────────────────
 
-# setup_fonts 함수 수정
-def setup_fonts():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    local_font_path = os.path.join(base_dir, "assets", "fonts", "NanumGothic.ttf")
-
-    if os.path.exists(local_font_path):
-        fm.fontManager.addfont(local_font_path)
-        nanum_font = fm.FontProperties(fname=local_font_path)
-        plt.rcParams['font.family'] = nanum_font.get_name()
-        plt.rcParams["axes.unicode_minus"] = False
-        print(f"✅ matplotlib에 폰트 직접 등록: {nanum_font.get_name()}")
-    else:
-        print("❌ NanumGothic.ttf 경로를 찾을 수 없습니다.")
-
-
-
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    """CSV 파일을 읽어와 DataFrame으로 반환"""
-    base = os.path.dirname(os.path.abspath(__file__))
-    df   = pd.read_csv(os.path.join(base, DATA_REL_PATH))
-    df.columns = df.columns.str.strip()
-    if "컬로리(Kcal)" in df.columns:
-        df.rename(columns={"컬로리(Kcal)": "칼로리(Kcal)"}, inplace=True)
-    if "매뉴얼" in df.columns:
-        df.rename(columns={"매뉴얼": "메뉴"}, inplace=True)
-    return df
+def inject_css():
+    """카드 hover 효과 + nutrient-text 스타일 (매 실행마다 출력해야 화면에 남음)"""
+    st.markdown("""
+    <style>
+    .menu-card {
+        border-radius: 16px;
+        overflow: hidden;
+        transition: transform 0.2s, box-shadow 0.2s;
+    }
+    .menu-card:hover {
+        transform: scale(1.02);
+        box-shadow: 0 4px 16px rgba(0,0,0,0.2);
+    }
+    .nutrient-text {
+        background-color: #ffffff !important;
+        color: #333333 !important;
+        padding: 8px;
+        border-radius: 8px;
+        margin-left: 16px;
+        margin-top: 24px;
+        margin-bottom: 4px;
+    }
+    </style>
+    """, unsafe_allow_html=True)
 
 def get_user_preferences(df: pd.DataFrame) -> dict:
     """사용자로부터 필터링 및 기타 설정을 입력받아 반환"""
@@ -167,50 +141,52 @@ def get_user_preferences(df: pd.DataFrame) -> dict:
 
 def recommend(df: pd.DataFrame, prefs: dict) -> pd.DataFrame:
     """필터링, 정규화, 점수 계산을 통해 추천"""
-    cond = (
-        df["칼로리(Kcal)"].between(prefs["min_calories"], prefs["max_calories"]) &
-        df["단백질"].between(prefs["min_protein"],   prefs["max_protein"]) &
-        df["지방"].between(prefs["min_fat"],         prefs["max_fat"]) &
-        df["나트륨"].between(prefs["min_sodium"],    prefs["max_sodium"])
-    )
-    filt = df[cond].copy()
-    if prefs["excluded_categories"]:
-        filt = filt[~filt["카테고리"].isin(prefs["excluded_categories"])]
+    ranges = {
+        "칼로리(Kcal)": (prefs["min_calories"], prefs["max_calories"]),
+        "단백질":       (prefs["min_protein"],  prefs["max_protein"]),
+        "지방":         (prefs["min_fat"],      prefs["max_fat"]),
+        "나트륨":       (prefs["min_sodium"],   prefs["max_sodium"]),
+    }
     if prefs["budget"] > 0:
-        filt = filt[filt["가격"] <= prefs["budget"]]
-    if filt.empty:
-        return filt
+        ranges["가격"] = (-np.inf, prefs["budget"])
+    rows = get_range_index().query(ranges, prefs["excluded_categories"])
+    if len(rows) == 0:
+        return df.iloc[0:0]
 
-    scaler = MinMaxScaler()
-    scaled = scaler.fit_transform(filt[NUTRIENTS])
-    w      = prefs["weights"]
-    filt["점수"] = (
-        w["칼로리"]*(1 - scaled[:,0]) +
-        w["단백질"]*scaled[:,1] +
-        w["지방"]*(1 - scaled[:,2]) +
-        w["나트륨"]*(1 - scaled[:,3])
-    )
-    return filt.sort_values("점수", ascending=False).head(prefs["num_recommendations"])
+    # df는 카탈로그 프레임이므로 행 번호로 바로 조회
+    rows, scores = get_scoring_engine().top_k(prefs["weights"], prefs["num_recommendations"], rows=rows)
+    recs = df.loc[rows].copy()
+    recs["점수"] = scores
+    return recs
 
 def draw_charts(df_rec: pd.DataFrame):
     """차트와 테이블 시각화"""
+    cache = get_chart_cache()
+
+    def draw_price():
+        fig, ax = plt.subplots(figsize=(10, 5))
+        ax.barh(df_rec["메뉴"], df_rec["가격"])
+        ax.set(xlabel="가격 (원)", ylabel="메뉴")
+        for v, i in zip(df_rec["가격"], range(len(df_rec))):
+            ax.text(v, i, f"{v:,}원", va="center")
+        return fig
+
     st.subheader("📊 가격 비교")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.barh(df_rec["메뉴"], df_rec["가격"])
-    ax.set(xlabel="가격 (원)", ylabel="메뉴")
-    for v, i in zip(df_rec["가격"], range(len(df_rec))):
-        ax.text(v, i, f"{v:,}원", va="center")
-    st.pyplot(fig)
+    st.image(cache.render(chart_key("price", df_rec[["메뉴", "가격"]]), draw_price), use_column_width=True)
 
-    st.subheader("📊 주요 영양소 비교")
     nut_df = df_rec.set_index("메뉴")[NUTRIENTS[:3]]
-    fig2, ax2 = plt.subplots(figsize=(8, 5))
-    nut_df.plot.barh(ax=ax2)
-    ax2.set(xlabel="영양 성분", ylabel="메뉴")
-    ax2.legend(title="영양소", bbox_to_anchor=(1, 0.5))
-    for cont in ax2.containers:
-        ax2.bar_label(cont, fmt="%.1f", label_type="edge", padding=3)
-    st.pyplot(fig2)
+
+    def draw_nutrients():
+        fig2, ax2 = plt.subplots(figsize=(8, 5))
+        nut_df.plot.barh(ax=ax2)
+        ax2.set(xlabel="영양 성분", ylabel="메뉴")
+        ax2.legend(title="영양소", bbox_to_anchor=(1, 0.5))
+        for cont in ax2.containers:
+            ax2.bar_label(cont, fmt="%.1f", label_type="edge", padding=3)
+        return fig2
+
+    st.subheader("📊 주요 영양소 비교")
+    st.image(cache.render(chart_key("nutrients", nut_df), draw_nutrients), use_column_width=True)
 
 def render_menu_card(row: pd.Series,emoji: str = "🍔"):
     """햄버거 스타일 메뉴 카드 출력"""
@@ -225,7 +201,7 @@ def render_menu_card(row: pd.Series,emoji: str = "🍔"):
     cols = st.columns([1.5, 1])
     with cols[0]:
         if os.path.exists(img_path):
-            st.image(img_path, width=200)
+            st.image(image_variant(img_path, 200), width=200)
         else:
             st.warning("❌ 이미지 없음")
     with cols[1]:
@@ -245,15 +221,45 @@ def render_menu_card(row: pd.Series,emoji: str = "🍔"):
     st.markdown(f"<div style='{STYLE['price']}'>💰 가격: <b>{int(row['가격']):,}원</b></div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
+def show_combos(prefs: dict):
+    """버거+사이드+음료+디저트 한 끼 조합 추천 (예산 + 한 끼 칼로리/나트륨 상한)"""
+    with st.expander("🍱 한 끼 세트 조합 추천", expanded=False):
+        slot_names = [name for name, _ in COMBO_SLOTS]
+        slots = st.multiselect("조합에 넣을 메뉴", slot_names, default=slot_names[:3])
+        col1, col2 = st.columns(2)
+        with col1:
+            max_kcal = st.number_input("한 끼 최대 칼로리 (0 = 제한 없음)", 0, value=1200, step=100)
+        with col2:
+            max_sod = st.number_input("한 끼 최대 나트륨 (0 = 제한 없음)", 0, value=2000, step=100)
+        if not st.button("🍱 조합 추천 받기") or not slots:
+            return
+        caps = {}
+        if max_kcal > 0:
+            caps["칼로리(Kcal)"] = max_kcal
+        if max_sod > 0:
+            caps["나트륨"] = max_sod
+        combos = get_combo_optimizer().top_combos(prefs["weights"], prefs["budget"], caps, n=3, slots=slots)
+        if not combos:
+            st.warning("조건에 맞는 조합이 없습니다. 예산이나 상한을 조정해보세요.")
+            return
+        catalog = get_catalog()
+        for rank, combo in enumerate(combos, 1):
+            items = " + ".join(f"{catalog.names[r]}" for r in combo.rows)
+            st.markdown(f"**{rank}. {items}**")
+            st.caption(
+                f"💰 {int(combo.price):,}원 · 🔥 {combo.totals['칼로리(Kcal)']:.0f} kcal · "
+                f"🧂 {combo.totals['나트륨']:.0f} mg · ✨ 점수 {combo.score:.3f}"
+            )
+
 def run():
-    setup_fonts()
+    inject_css()
     st.title("ㅤ지금 내가 원하는 맥도날드 메뉴는?")
     st.markdown(
         "<p style='text-align:center; color:#888;'>버거만 수십 개! 뭐 먹을지 고민된다면?</p>",
         unsafe_allow_html=True
     )
 
-    df = load_data()
+    df = get_catalog().frame
     if df.empty:
         st.error("데이터 로드 실패")
         return
@@ -273,6 +279,8 @@ def run():
                     st.markdown("---")
             draw_charts(recs)
 
+    show_combos(prefs)
+
     # ✅ 홈으로 돌아가기 버튼
     st.markdown("---")
     if st.button("🏠 홈으로 돌아가기"):
@@ -5,13 +5,41 @@ import matplotlib.pyplot as plt
 import os
 import json
 from datetime import datetime
-import matplotlib.font_manager as fm
 from google.oauth2 import service_account
 import gspread
 from dotenv import load_dotenv
-from streamlit_autorefresh import st_autorefresh
+from core.catalog import BASE_DIR, get_catalog
+from core.burnoff import DEFAULT_PROFILE, GENDERS, WEIGHT_GRID, get_burnoff_matrix
+from core.chart_cache import chart_key, get_chart_cache
+from core.metrics import timed
+from core.similarity import get_similarity_index
+from core.vote_admission import ADMITTED, DUPLICATE, OVERLOADED, THROTTLED, VoteAdmission, fingerprint
+from core.trending import TrendingVotes
+from core.vote_aggregator import VoteAggregator
+from core.vote_queue import JOURNAL_PATH, VoteWriter
+from core.vote_store import GSheetVoteStore, MirroredVoteStore, SQLiteVoteStore, VOTE_DB_PATH
 
 SHEET_NAME = "google_vote_result"
+# 투표 집계 스냅샷 재사용 시간(초). 모든 세션이 같은 스냅샷을 공유
+VOTE_SNAPSHOT_TTL = float(os.getenv("VOTE_SNAPSHOT_TTL", "15"))
+# 투표 현황만 따로 새로고침하는 간격(초) — 페이지 전체는 다시 실행하지 않음
+VOTE_REFRESH_INTERVAL = float(os.getenv("VOTE_REFRESH_INTERVAL", "30"))
+# 투표 저장소: "gsheet"(기본) 또는 "sqlite". sqlite + VOTE_SYNC_TO_SHEETS=1 이면 시트에 비동기 동기화
+VOTE_BACKEND        = os.getenv("VOTE_BACKEND", "gsheet")
+VOTE_SYNC_TO_SHEETS = os.getenv("VOTE_SYNC_TO_SHEETS", "0") == "1"
+VOTE_SYNC_JOURNAL   = os.getenv("VOTE_SYNC_JOURNAL_PATH", os.path.join(BASE_DIR, "data", "vote_sync_journal.jsonl"))
+# 투표 허용 판단: 같은 클라이언트·카테고리 중복 차단 기간(초), 클라이언트별 / 전체 속도 제한(초당, 최대 묶음)
+VOTE_DEDUP_WINDOW  = float(os.getenv("VOTE_DEDUP_WINDOW", str(24 * 3600)))
+VOTE_CLIENT_RATE   = float(os.getenv("VOTE_CLIENT_RATE", "0.1"))
+VOTE_CLIENT_BURST  = float(os.getenv("VOTE_CLIENT_BURST", "5"))
+VOTE_GLOBAL_RATE   = float(os.getenv("VOTE_GLOBAL_RATE", "20"))
+VOTE_GLOBAL_BURST  = float(os.getenv("VOTE_GLOBAL_BURST", "200"))
+
+ADMISSION_MESSAGES = {
+    DUPLICATE:  "이미 해당 카테고리에 투표하셨습니다.",
+    THROTTLED:  "투표를 너무 자주 하고 있어요. 잠시 후 다시 시도해주세요.",
+    OVERLOADED: "지금 투표가 몰리고 있어요. 잠시 후 다시 시도해주세요.",
+}
 
 # ✅ Google Sheets 연결
 @st.cache_resource
@@ -31,61 +59,194 @@ def get_gsheet():
         "https://www.googleapis.com/auth/drive",
     ]
     credentials = service_account.Credentials.from_service_account_info(info, scopes=scopes)
-    gc = gspread.authorize(credentials)
-    sheet = gc.open(SHEET_NAME).sheet1
+    with timed("sheets.connect"):
+        gc = gspread.authorize(credentials)
+        sheet = gc.open(SHEET_NAME).sheet1
     return sheet
 
-# ✅ 폰트 설정
-def setup_fonts():
-    font_path = os.path.join(os.path.dirname(__file__), "assets", "fonts", "NanumGothic.ttf")
-    if os.path.exists(font_path):
-        fm.fontManager.addfont(font_path)
-        font_prop = fm.FontProperties(fname=font_path)
-        plt.rcParams["font.family"] = font_prop.get_name()
-    plt.rcParams["axes.unicode_minus"] = False
-
-# ✅ 데이터 로딩
-@st.cache_data
-def load_data():
-    path = os.path.join(os.path.dirname(__file__), "..", "data", "McDelivery Nutritional Information Table.csv")
-    df = pd.read_csv(path)
-    df[['칼로리(Kcal)', '단백질', '지방', '나트륨', '당류']] = df[['칼로리(Kcal)', '단백질', '지방', '나트륨', '당류']].apply(pd.to_numeric, errors='coerce')
-    return df
-
-# ✅ 시각화 함수
-def draw_vote_chart(title, vote_series):
-    import matplotlib.cm as cm
-    fig, ax = plt.subplots(figsize=(8, 4))
-    colors = cm.Set3(np.linspace(0, 1, len(vote_series)))
-    bars = ax.bar(vote_series.index, vote_series.values, color=colors)
-
-    ax.set_title(title, fontsize=14)
-    ax.set_ylabel("투표 수")
-    ax.set_xticks(range(len(vote_series)))
-    ax.set_xticklabels(vote_series.index, rotation=15, ha="right")
-
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2, height + 0.1, f"{int(height)}", ha='center', va='bottom', fontsize=9)
-
-    st.pyplot(fig)
+# ✅ 투표 저장소 (설정에 따라 Google Sheets 또는 로컬 SQLite)
+@st.cache_resource
+def get_vote_store():
+    if VOTE_BACKEND == "sqlite":
+        store = SQLiteVoteStore(os.getenv("VOTE_DB_PATH", VOTE_DB_PATH))
+        if VOTE_SYNC_TO_SHEETS:
+            sync = VoteWriter(GSheetVoteStore(get_gsheet()).append, journal_path=VOTE_SYNC_JOURNAL)
+            store = MirroredVoteStore(store, sync)
+        return store
+    return GSheetVoteStore(get_gsheet())
+
+# ✅ 투표 쓰기 버퍼 (프로세스 전역, 원격 저장소에는 백그라운드에서 모아서 기록)
+@st.cache_resource
+def get_vote_writer():
+    return VoteWriter(get_vote_store().append, journal_path=os.getenv("VOTE_JOURNAL_PATH", JOURNAL_PATH))
+
+# ✅ 투표 허용 판단 (프로세스 전역, 클라이언트 = 주소 + 요청 헤더 + 쿠키 → 새 탭을 열어도 같은 클라이언트)
+@st.cache_resource
+def get_vote_admission():
+    return VoteAdmission(window=VOTE_DEDUP_WINDOW, client_rate=VOTE_CLIENT_RATE, client_burst=VOTE_CLIENT_BURST,
+                         global_rate=VOTE_GLOBAL_RATE, global_burst=VOTE_GLOBAL_BURST)
+
+def client_fingerprint() -> str:
+    from streamlit.runtime.context import _get_request
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    request = _get_request()  # 웹소켓 요청 (접속 주소), 테스트 실행기에서는 None
+    return fingerprint(st.context.headers, st.context.cookies, remote_ip=request.remote_ip if request else "",
+                       fallback=ctx.session_id if ctx else "")
+
+def record_vote(row: list, client: str) -> str:
+    """허용되면 기록하고 ADMITTED, 아니면 거절 사유 (DUPLICATE / THROTTLED / OVERLOADED)"""
+    verdict = get_vote_admission().admit(client, row[0])
+    if verdict != ADMITTED:
+        return verdict
+    store = get_vote_store()
+    if store.remote:
+        get_vote_writer().submit(row)
+    else:
+        store.append([row])
+    return verdict
+
+# ✅ 투표 집계기 (프로세스 전역, 마지막으로 읽은 행 이후만 가져옴)
+@st.cache_resource
+def get_vote_aggregator():
+    store = get_vote_store()
+    return VoteAggregator(store.read_since, ttl=VOTE_SNAPSHOT_TTL, version=store.version, trending=TrendingVotes())
+
+# ✅ 시각화 함수 (PNG 바이트)
+def render_vote_chart(title, vote_series) -> bytes:
+    def draw():
+        import matplotlib.cm as cm
+        fig, ax = plt.subplots(figsize=(8, 4))
+        colors = cm.Set3(np.linspace(0, 1, len(vote_series)))
+        bars = ax.bar(vote_series.index, vote_series.values, color=colors)
+
+        ax.set_title(title, fontsize=14)
+        ax.set_ylabel("투표 수")
+        ax.set_xticks(range(len(vote_series)))
+        ax.set_xticklabels(vote_series.index, rotation=15, ha="right")
+
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2, height + 0.1, f"{int(height)}", ha='center', va='bottom', fontsize=9)
+        return fig
+
+    # 집계가 그대로면 다시 그리지 않고 캐시된 이미지 사용
+    return get_chart_cache().render(chart_key("vote", title, vote_series), draw)
+
+# ✅ 실시간 투표 현황: 이 부분만 VOTE_REFRESH_INTERVAL마다 다시 실행 (fragment)
+@st.fragment(run_every=VOTE_REFRESH_INTERVAL)
+@timed("page.visual.vote_results")
+def show_vote_results(category):
+    st.caption(f"⏰ 마지막 새로고침 시각: {datetime.now().strftime('%H:%M:%S')}")
+    if st.button("🔁 수동 새로고침"):
+        get_vote_aggregator().refresh()
+
+    # 집계 버전(읽은 투표 행 수)과 카테고리가 그대로면 차트를 다시 만들지 않고 지난 이미지를 그대로 표시
+    votes = get_vote_aggregator().snapshot()
+    view_key = (votes.version, category)
+    view = st.session_state.get("vote_view")
+    if view is None or view["key"] != view_key:
+        cat_votes, top5 = votes.category_counts(category), votes.top(5)
+        view = {
+            "key":      view_key,
+            "category": None if cat_votes.empty else render_vote_chart("현재 카테고리 별 투표 현황", cat_votes),
+            "top5":     None if top5.empty else render_vote_chart("전체 인기 메뉴 TOP 5", top5),
+        }
+        st.session_state.vote_view = view
+
+    st.markdown("### 📊 현재 카테고리 별 투표 현황")
+    if view["category"] is not None:
+        st.image(view["category"], use_column_width=True)
+
+    st.markdown("### 🏆 전체 인기 메뉴 TOP 5")
+    if view["top5"] is not None:
+        st.image(view["top5"], use_column_width=True)
+
+    # ✅ 지금 뜨는 메뉴 (최근 구간만, 집계기가 새 투표를 받을 때마다 갱신된 구간별 카운터)
+    st.markdown("### 🔥 지금 뜨는 메뉴")
+    trending = get_vote_aggregator().trending
+    window = st.radio("기간", trending.window_names, horizontal=True, key="trending_window",
+                      label_visibility="collapsed")
+    hot = trending.top(window, 5)
+    if hot.empty:
+        st.caption("이 기간에는 아직 투표가 없어요.")
+    else:
+        st.image(render_vote_chart(f"지금 뜨는 메뉴 ({window})", hot), use_column_width=True)
+
+# ✅ 메뉴 비교 차트
+def draw_compare_chart(menu1, menu2, menu1_vals, menu2_vals, labels):
+    def draw():
+        x = np.arange(len(labels))
+        width = 0.35
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.barh(x - width/2, menu1_vals, height=width, label=menu1, color='skyblue')
+        ax.barh(x + width/2, menu2_vals, height=width, label=menu2, color='salmon')
+        ax.set_yticks(x)
+        ax.set_yticklabels(labels)
+        ax.invert_yaxis()
+        ax.set_title(f"{menu1} vs {menu2} 비교")
+        ax.legend()
+        return fig
+
+    png = get_chart_cache().render(chart_key("compare", menu1, menu2, menu1_vals, menu2_vals, labels), draw)
+    st.image(png, use_column_width=True)
+
+# ✅ 두 메뉴를 운동으로 태우려면? (미리 계산된 메뉴 × 운동 × 체형 행렬에서 조회)
+def show_burnoff(catalog, category, menu1, menu2):
+    with st.expander("🏃 이 메뉴, 운동으로 태우려면 얼마나?", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            gender = st.radio("성별", GENDERS, horizontal=True, key="burnoff_gender")
+        with col2:
+            weight = st.select_slider("체중 (kg)", options=[int(w) for w in WEIGHT_GRID], value=70, key="burnoff_weight")
+        profile = dict(DEFAULT_PROFILE, gender=gender, weight_kg=weight)
+        rows = list(dict.fromkeys(catalog.row(m, category) for m in (menu1, menu2)))
+        st.table(get_burnoff_matrix().menu_table(rows, profile))
+        st.caption(f"{DEFAULT_PROFILE['age']}세 · {DEFAULT_PROFILE['height_cm']}cm 기준, MET × 기초대사량으로 계산")
+
+# ✅ 비슷하지만 더 가벼운 메뉴 (미리 계산된 최근접 이웃에서 조건으로 거름)
+LIGHTER_OPTIONS = {"나트륨": "나트륨", "칼로리": "칼로리(Kcal)", "지방": "지방", "당류": "당류"}
+
+def show_similar(catalog, category, menu):
+    with st.expander(f"🥗 '{menu}'와 비슷하지만 더 가벼운 메뉴", expanded=False):
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            nutrient = st.selectbox("줄이고 싶은 성분", list(LIGHTER_OPTIONS), key="similar_nutrient")
+        with col2:
+            percent = st.select_slider("최소 감소율", options=[10, 20, 30, 50], value=20, format_func=lambda p: f"{p}%",
+                                       key="similar_percent")
+        with col3:
+            same_category = st.checkbox("같은 카테고리만", key="similar_same_category")
+        column = LIGHTER_OPTIONS[nutrient]
+        row = catalog.row(menu, category)
+        rows, _ = get_similarity_index().similar(row, k=5, lower_by={column: percent / 100},
+                                                categories=[category] if same_category else None)
+        if not len(rows):
+            st.info(f"{nutrient}이(가) {percent}% 이상 적은 비슷한 메뉴가 없어요.")
+            return
+        base = catalog.values(column)[row]
+        st.table(pd.DataFrame({
+            "메뉴":     catalog.names[rows],
+            "카테고리": catalog.categories[rows],
+            "칼로리(Kcal)": catalog.kcal[rows].round().astype(int),
+            "나트륨 (mg)": catalog.sodium[rows].round().astype(int),
+            "가격 (원)": catalog.price[rows].round().astype(int),
+            f"{nutrient} 변화": [f"{(v - base) / base:+.0%}" if base else "-" for v in catalog.values(column)[rows]],
+        }).set_index("메뉴"))
+        st.caption("칼로리·단백질·지방·나트륨·당류·가격이 가까운 순서")
 
 # ✅ 실행 함수
 def run():
-    setup_fonts()
-    st_autorefresh(interval=30 * 1000, key="auto_refresh")
-    df = load_data()
-    sheet = get_gsheet()
+    catalog = get_catalog()
 
     # ✅ 타이틀
     st.markdown("<h1 style='text-align:center;'>ㅤ 메뉴 별 영양성분 비교! </h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#888;'>내 최애 메뉴, 생각보다 짜다고...?</p>", unsafe_allow_html=True)
 
     # ✅ 메뉴 선택
-    categories = df['카테고리'].dropna().unique()
+    categories = catalog.category_names
     selected_category = st.selectbox("🍽️ 카테고리를 선택하세요", categories)
-    filtered_df = df[df['카테고리'] == selected_category]
-    menu_options = filtered_df['메뉴'].unique()
+    menu_options = catalog.menus(selected_category)
 
     col1, col2 = st.columns(2)
     with col1:
@@ -96,20 +257,12 @@ def run():
     # ✅ 영양성분 비교 그래프
     nutrients = ['칼로리(Kcal)', '단백질', '지방', '나트륨', '당류']
     labels = ['칼로리(Kcal)', '단백질 (g)', '지방 (g)', '나트륨 (mg)', '당류 (g)']
-    menu1_vals = filtered_df[filtered_df['메뉴'] == menu1][nutrients].values.flatten()
-    menu2_vals = filtered_df[filtered_df['메뉴'] == menu2][nutrients].values.flatten()
-
-    x = np.arange(len(nutrients))
-    width = 0.35
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(x - width/2, menu1_vals, height=width, label=menu1, color='skyblue')
-    ax.barh(x + width/2, menu2_vals, height=width, label=menu2, color='salmon')
-    ax.set_yticks(x)
-    ax.set_yticklabels(labels)
-    ax.invert_yaxis()
-    ax.set_title(f"{menu1} vs {menu2} 비교")
-    ax.legend()
-    st.pyplot(fig)
+    menu1_vals = catalog.nutrients(menu1, nutrients, category=selected_category)
+    menu2_vals = catalog.nutrients(menu2, nutrients, category=selected_category)
+
+    draw_compare_chart(menu1, menu2, menu1_vals, menu2_vals, labels)
+    show_burnoff(catalog, selected_category, menu1, menu2)
+    show_similar(catalog, selected_category, menu1)
 
     # ✅ 투표 인터페이스
     st.markdown("---")
@@ -122,30 +275,25 @@ def run():
     selected_vote_menu = st.selectbox("투표할 메뉴 선택", menu_options, key="vote_select")
     if st.button("✅ 이 메뉴에 투표하기"):
         if selected_category in st.session_state.voted:
-            st.warning("이미 해당 카테고리에 투표하셨습니다.")
+            st.warning(ADMISSION_MESSAGES[DUPLICATE])
         else:
             timestamp = datetime.now().isoformat()
             row = [selected_category, selected_vote_menu, timestamp]
-            sheet.append_row(row)
-            st.session_state.voted.append(selected_category)
-            st.success(f"'{selected_vote_menu}'에 투표 완료!")
+            verdict = record_vote(row, client_fingerprint())
+            if verdict == ADMITTED:
+                st.session_state.voted.append(selected_category)
+                st.success(f"'{selected_vote_menu}'에 투표 완료!")
+            else:
+                if verdict == DUPLICATE:
+                    st.session_state.voted.append(selected_category)
+                st.warning(ADMISSION_MESSAGES[verdict])
 
-    # ✅ 실시간 투표 집계 표시 전 새로고침 섹션
-    st.caption(f"⏰ 마지막 새로고침 시각: {datetime.now().strftime('%H:%M:%S')}")
-    if st.button("🔁 수동 새로고침"):
-        st.rerun()
-
-    # ✅ 실시간 투표 시각화
-    st.markdown("### 📊 현재 카테고리 별 투표 현황")
-    all_votes = pd.DataFrame(sheet.get_all_records())
-    cat_votes = all_votes[all_votes["카테고리"] == selected_category]["메뉴"].value_counts()
-    if not cat_votes.empty:
-        draw_vote_chart("현재 카테고리 별 투표 현황", cat_votes)
+    backlog = get_vote_writer().stats()["backlog"] if get_vote_store().remote else 0
+    if backlog:
+        st.caption(f"📨 집계 반영 대기 중인 투표 {backlog}건 (잠시 후 반영됩니다)")
 
-    st.markdown("### 🏆 전체 인기 메뉴 TOP 5")
-    top5 = all_votes["메뉴"].value_counts().head(5)
-    if not top5.empty:
-        draw_vote_chart("전체 인기 메뉴 TOP 5", top5)
+    # ✅ 실시간 투표 현황 (자동 새로고침은 이 섹션만)
+    show_vote_results(selected_category)
 
     # ✅ 홈으로 돌아가기
     st.markdown("---")
@@ -0,0 +1,22 @@
+import pytest
+
+from core.local_router import LocalRouter, haversine_m, sample_graph
+
+SEOUL_CITY_HALL = (37.5665, 126.9780)
+BUSAN_STATION   = (35.1151, 129.0415)
+
+
+@pytest.fixture(scope="module")
+def router():
+    return LocalRouter(sample_graph(*SEOUL_CITY_HALL, size=20), max_snap_m=300)
+
+
+def test_route_inside_coverage_starts_near_input(router):
+    route = router.route(*SEOUL_CITY_HALL, 90, 1.0)
+    assert route is not None and len(route.coords)
+    assert haversine_m(*SEOUL_CITY_HALL, *route.start) <= 300
+
+
+@pytest.mark.parametrize("method", ["route", "loop"])
+def test_start_outside_coverage_returns_none(router, method):
+    assert getattr(router, method)(*BUSAN_STATION, 90, 1.0) is None
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.catalog import Catalog, get_catalog
+from core.scoring import SCORE_COLUMNS, ScoringEngine
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    # 같은 영양소 행을 여러 번 넣어 동점을 만듦
+    base  = get_catalog().frame
+    extra = pd.concat([base] * 2, ignore_index=True)
+    extra["메뉴"] = [f"{m} #{i}" for i, m in enumerate(extra["메뉴"])]
+    return Catalog(pd.concat([base, extra], ignore_index=True))
+
+
+@pytest.fixture(scope="module")
+def engine(catalog):
+    return ScoringEngine(catalog)
+
+
+def pandas_top(frame: pd.DataFrame, weights: dict, k: int) -> list:
+    """기존 추천 방식: 부분집합 Min-Max 정규화 → 가중합 → 점수 내림차순 (동점이면 행 순서)"""
+    sub = frame[SCORE_COLUMNS]
+    rng = sub.max() - sub.min()
+    scaled = (sub - sub.min()) / rng.where(rng > 0, 1.0)
+    score = (weights["칼로리"] * (1 - scaled.iloc[:, 0]) + weights["단백질"] * scaled.iloc[:, 1]
+             + weights["지방"] * (1 - scaled.iloc[:, 2]) + weights["나트륨"] * (1 - scaled.iloc[:, 3]))
+    return score.sort_values(ascending=False, kind="stable").head(k).index.tolist()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_matches_pandas_sort(catalog, engine, seed):
+    rng = np.random.default_rng(seed)
+    weights = dict(zip(["칼로리", "단백질", "지방", "나트륨"], rng.integers(0, 4, 4).astype(float)))
+    k = int(rng.integers(1, 12))
+    rows = np.sort(rng.choice(len(catalog), size=len(catalog) // 2, replace=False))
+
+    top_rows, _ = engine.top_k(weights, k)
+    assert top_rows.tolist() == pandas_top(catalog.frame, weights, k)
+    top_rows, _ = engine.top_k(weights, k, rows=rows)
+    assert top_rows.tolist() == pandas_top(catalog.frame.loc[rows], weights, k)
+
+
+def test_batch_matches_single(engine):
+    weights = [{"칼로리": 1.0, "단백질": 0.0, "지방": 0.0, "나트륨": 0.0},
+               {"칼로리": 0.0, "단백질": 0.0, "지방": 0.0, "나트륨": 0.0}]  # 전부 동점
+    batch_rows, batch_scores = engine.top_k(weights, 5)
+    for w, r, s in zip(weights, batch_rows, batch_scores):
+        single_rows, single_scores = engine.top_k(w, 5)
+        assert r.tolist() == single_rows.tolist()
+        assert np.allclose(s, single_scores)
+    assert batch_rows[1].tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from core.trending import RollingCounter, TrendingVotes
+
+NOON = datetime(2024, 5, 1, 12, 0, 0).timestamp()
+
+
+class FakeClock:
+    def __init__(self, t: float = NOON):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def counter():
+    return RollingCounter(3, lambda ts: int(ts // 10))  # 10초 버킷 × 3 = 30초 구간
+
+
+def test_old_buckets_expire(counter):
+    counter.add("빅맥", 0, now=0)
+    counter.add("빅맥", 12, now=12)
+    counter.add("맥플러리", 25, now=25)
+    assert counter.top(5, now=29) == [("빅맥", 2), ("맥플러리", 1)]
+    assert counter.top(5, now=30) == [("빅맥", 1), ("맥플러리", 1)]
+    assert counter.top(5, now=45) == [("맥플러리", 1)]
+    assert counter.top(5, now=1000) == []
+
+
+def test_vote_older_than_window_is_ignored(counter):
+    counter.add("빅맥", 0, now=100)
+    counter.add("맥플러리", 200, now=100)  # 시계가 앞선 투표는 지금 버킷으로
+    assert counter.top(5, now=100) == [("맥플러리", 1)]
+
+
+def test_trending_windows_with_injected_clock():
+    clock = FakeClock()
+    trending = TrendingVotes(clock=clock)
+    trending.add_rows([["버거 & 세트", "빅맥", datetime.fromtimestamp(NOON - 30).isoformat()],
+                       ["버거 & 세트", "빅맥", datetime.fromtimestamp(NOON - 600).isoformat()],
+                       ["음료", "코카콜라", ""]])
+    assert trending.stats() == {"added": 2, "skipped": 1}
+    assert trending.top("최근 5분").to_dict() == {"빅맥": 1}
+    assert trending.top("최근 1시간").to_dict() == {"빅맥": 2}
+
+    clock.t += 3600
+    assert trending.top("최근 5분").empty
+    assert trending.top("최근 1시간").empty
+    assert trending.top("오늘").to_dict() == {"빅맥": 2}
@@ -0,0 +1,67 @@
+import pytest
+
+from core.vote_admission import ADMITTED, DUPLICATE, OVERLOADED, THROTTLED, VoteAdmission, fingerprint
+
+CHROME  = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/126.0", "Accept-Language": "ko-KR"}
+COOKIES = {"_streamlit_xsrf": "2|abc|def|1700000000"}
+
+
+class FakeClock:
+    def __init__(self, t: float = 1000.0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_new_session_with_same_headers_is_duplicate(clock):
+    admission = VoteAdmission(window=3600, clock=clock)
+    first  = fingerprint(CHROME, COOKIES, remote_ip="203.0.113.7", fallback="session-a")
+    second = fingerprint(CHROME, COOKIES, remote_ip="203.0.113.7", fallback="session-b")
+    assert first == second
+    assert admission.admit(first, "버거 & 세트") == ADMITTED
+    assert admission.admit(second, "버거 & 세트") == DUPLICATE
+
+
+def test_forwarded_for_first_hop_is_the_address():
+    proxied = dict(CHROME, **{"X-Forwarded-For": "198.51.100.4, 10.0.0.1"})
+    assert fingerprint(proxied, remote_ip="10.0.0.1") == fingerprint(CHROME, remote_ip="198.51.100.4")
+    assert fingerprint(CHROME, remote_ip="198.51.100.4") != fingerprint(CHROME, remote_ip="198.51.100.5")
+
+
+def test_client_burst_exhausted_is_throttled(clock):
+    admission = VoteAdmission(window=3600, client_rate=0.01, client_burst=2, clock=clock)
+    assert admission.admit("c1", "버거 & 세트") == ADMITTED
+    assert admission.admit("c1", "음료") == ADMITTED
+    assert admission.admit("c1", "디저트") == THROTTLED
+    clock.t += 100  # 0.01/s × 100s = 토큰 1개
+    assert admission.admit("c1", "디저트") == ADMITTED
+
+
+def test_global_bucket_exhausted_is_overloaded(clock):
+    admission = VoteAdmission(window=3600, global_rate=0.01, global_burst=2, clock=clock)
+    assert admission.admit("c1", "버거 & 세트") == ADMITTED
+    assert admission.admit("c2", "버거 & 세트") == ADMITTED
+    assert admission.admit("c3", "버거 & 세트") == OVERLOADED
+
+
+def test_vote_allowed_again_after_window(clock):
+    admission = VoteAdmission(window=100, clock=clock)
+    assert admission.admit("c1", "버거 & 세트") == ADMITTED
+    clock.t += 50
+    assert admission.admit("c1", "버거 & 세트") == DUPLICATE
+    clock.t += 50
+    assert admission.admit("c1", "버거 & 세트") == ADMITTED
+
+
+def test_client_buckets_capped_at_max_clients(clock):
+    admission = VoteAdmission(window=3600, max_clients=3, clock=clock)
+    for i in range(10):
+        assert admission.admit(f"c{i}", "버거 & 세트") == ADMITTED
+        assert len(admission._clients) <= 3
+    assert admission.stats()["evicted_clients"] == 7
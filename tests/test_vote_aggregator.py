@@ -0,0 +1,63 @@
+import pytest
+
+from core.vote_aggregator import VoteAggregator
+
+
+class FakeStore:
+    def __init__(self):
+        self.rows    = []
+        self.offsets = []
+
+    def read_since(self, offset: int) -> list:
+        self.offsets.append(offset)
+        return self.rows[offset:]
+
+    def version(self) -> int:
+        return len(self.rows)
+
+
+@pytest.fixture
+def store():
+    return FakeStore()
+
+
+def test_refresh_reads_only_new_rows(store):
+    agg = VoteAggregator(store.read_since, ttl=0)
+    store.rows += [["버거 & 세트", "빅맥"], ["버거 & 세트", "빅맥"], ["음료", "코카콜라"]]
+    snap = agg.snapshot()
+    assert snap.version == 3 and agg.stats()["offset"] == 3
+    assert snap.category_counts("버거 & 세트")["빅맥"] == 2
+
+    store.rows += [["음료", "코카콜라"], ["", ""]]  # 빈 행도 offset은 넘김
+    snap = agg.snapshot()
+    assert store.offsets == [0, 3]
+    assert agg.stats()["offset"] == 5 and agg.stats()["rows_fetched"] == 4
+    assert snap.top(5).to_dict() == {"빅맥": 2, "코카콜라": 2}
+    assert snap.category_counts("음료")["코카콜라"] == 2
+
+
+def test_snapshot_cached_within_ttl(store):
+    agg = VoteAggregator(store.read_since, ttl=3600)
+    store.rows.append(["버거 & 세트", "빅맥"])
+    first = agg.snapshot()
+    store.rows.append(["버거 & 세트", "빅맥"])
+    assert agg.snapshot() is first
+    assert store.offsets == [0]
+
+    # 수동 새로고침은 TTL과 관계없이 새 행을 읽음
+    assert agg.refresh().category_counts("버거 & 세트")["빅맥"] == 2
+    assert store.offsets == [0, 1]
+
+
+def test_unchanged_version_skips_fetch(store):
+    agg = VoteAggregator(store.read_since, ttl=0, version=store.version)
+    store.rows.append(["음료", "코카콜라"])
+    first = agg.snapshot()
+    second = agg.snapshot()
+    assert store.offsets == [0]
+    assert agg.stats()["unchanged"] == 1
+    assert second.total is first.total and second.fetched_at >= first.fetched_at
+
+    store.rows.append(["음료", "코카콜라"])
+    assert agg.snapshot().category_counts("음료")["코카콜라"] == 2
+    assert store.offsets == [0, 1]
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from core.vote_queue import VoteWriter
+
+ROWS = [["버거 & 세트", "빅맥", "2024-05-01T12:00:00"],
+        ["음료", "코카콜라", "2024-05-01T12:00:01"],
+        ["디저트", "맥플러리", "2024-05-01T12:00:02"],
+        ["버거 & 세트", "상하이 스파이시 버거", "2024-05-01T12:00:03"]]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "vote_journal.jsonl")
+
+
+def write_journal(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.write('{"op": "add", "row": ["음료"')  # 쓰다 만 마지막 줄
+
+
+def read_journal(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_replay_restores_unacked_adds_after_crash(journal):
+    write_journal(journal, [{"op": "add", "row": ROWS[0]}, {"op": "add", "row": ROWS[1]},
+                            {"op": "ack", "n": 1}, {"op": "add", "row": ROWS[2]}])
+    sunk = []
+    writer = VoteWriter(sunk.extend, journal_path=journal, flush_interval=3600)
+    try:
+        assert writer.pending_rows() == [ROWS[1], ROWS[2]]
+        assert writer.stats()["recovered"] == 2
+        # 재시작 시점에 저널은 남은 add만으로 다시 써짐
+        assert read_journal(journal) == [{"op": "add", "row": ROWS[1]}, {"op": "add", "row": ROWS[2]}]
+        assert writer.flush(timeout=5)
+        assert sunk == [ROWS[1], ROWS[2]]
+    finally:
+        writer.close(timeout=5)
+
+
+def test_acked_journal_is_compacted(journal):
+    sunk = []
+    writer = VoteWriter(sunk.extend, journal_path=journal, flush_interval=3600)
+    for row in ROWS[:3]:
+        writer.submit(row)
+    assert writer.flush(timeout=5)
+    writer.close(timeout=5)
+    assert sunk == ROWS[:3]
+    assert writer.stats()["backlog"] == 0
+    assert read_journal(journal) == []
+
+    restarted = VoteWriter(sunk.extend, journal_path=journal, flush_interval=3600)
+    try:
+        assert restarted.pending_rows() == []
+        assert restarted.stats()["recovered"] == 0
+    finally:
+        restarted.close(timeout=5)
+
+
+def test_failed_sink_keeps_rows_journaled(journal):
+    def broken(rows):
+        raise ConnectionError("quota exceeded")
+
+    writer = VoteWriter(broken, journal_path=journal, flush_interval=3600, max_backoff=0.1)
+    writer.submit(ROWS[0])
+    assert not writer.flush(timeout=0.3)
+    writer.close(timeout=0.3)
+    stats = writer.stats()
+    assert stats["failures"] >= 1 and "quota exceeded" in stats["last_error"]
+    assert stats["backlog"] == 1
+
+    sunk = []
+    restarted = VoteWriter(sunk.extend, journal_path=journal, flush_interval=3600)
+    try:
+        assert restarted.flush(timeout=5)
+        assert sunk == [ROWS[0]]
+    finally:
+        restarted.close(timeout=5)
@@ -0,0 +1,55 @@
+import pytest
+
+from core.vote_queue import VoteWriter
+from core.vote_store import MirroredVoteStore, SQLiteVoteStore, VoteStore
+
+ROWS = [["버거 & 세트", "빅맥", "2024-05-01T12:00:00"],
+        ["음료", "코카콜라", "2024-05-01T12:00:01"]]
+
+
+@pytest.fixture
+def primary(tmp_path):
+    return SQLiteVoteStore(str(tmp_path / "votes.db"))
+
+
+def test_vote_store_is_abstract():
+    with pytest.raises(TypeError):
+        VoteStore()
+
+
+def test_sqlite_read_since_offset(primary):
+    primary.append(ROWS)
+    assert primary.version() == 2
+    assert primary.read_since(0) == ROWS
+    assert primary.read_since(1) == ROWS[1:]
+    assert primary.read_since(2) == []
+
+
+def test_mirrored_store_falls_back_to_primary_when_remote_fails(primary, tmp_path):
+    def broken(rows):
+        raise ConnectionError("sheets unavailable")
+
+    journal = str(tmp_path / "sync_journal.jsonl")
+    writer = VoteWriter(broken, journal_path=journal, flush_interval=3600, max_backoff=0.1)
+    store = MirroredVoteStore(primary, writer)
+    store.append(ROWS)
+
+    # 원격이 죽어도 투표는 primary에 바로 남고 집계도 primary 기준
+    assert store.read_since(0) == ROWS
+    assert store.version() == 2
+    by_category, total = store.counts()
+    assert by_category["음료"]["코카콜라"] == 1 and total["빅맥"] == 1
+
+    assert not writer.flush(timeout=0.3)
+    writer.close(timeout=0.3)
+    assert writer.stats()["failures"] >= 1
+    assert writer.pending_rows() == ROWS
+
+    # 원격이 돌아오면 저널에 남은 행이 그대로 동기화됨
+    synced = []
+    restarted = VoteWriter(synced.extend, journal_path=journal, flush_interval=3600)
+    try:
+        assert restarted.flush(timeout=5)
+        assert synced == ROWS
+    finally:
+        restarted.close(timeout=5)